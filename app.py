@@ -5,21 +5,59 @@ Updated to use the new backend/db/ layer and handle missing config attributes gr
 """
 
 import os
+import logging
+import sqlite3
+from contextlib import closing
 from flask import Flask, render_template
+from werkzeug.middleware.proxy_fix import ProxyFix
 from backend.config import get_config
 
 # NEW: Import from the new db layer instead of old database.py
 from backend.db import connection, sql_manager
+from backend.json_provider import init_json_provider
 
-# Import route blueprints - FIXED: Import register_blueprints function
-from backend.routes import register_blueprints
+try:
+    from flask_compress import Compress
+except ImportError:  # pragma: no cover - optional, responses are just sent uncompressed
+    Compress = None
 
 # Get configuration and logger
 config = get_config()
-logger = config.init_logging()
+logger = logging.getLogger('SlippiServer')
+
+# Stored in PRAGMA user_version; bump whenever anything under sql/schema/ changes
+SCHEMA_VERSION = 12
+
+_API_KEYS_TABLE = getattr(config, 'API_KEYS_TABLE', 'api_keys')
+
+# (schema query, table, column it adds) - applied when an existing table lacks the column
+_SCHEMA_MIGRATIONS = (
+    ('migrate_api_keys_epoch', _API_KEYS_TABLE, 'expires_at_epoch'),
+    ('migrate_games_player_tags', 'games', 'p1_tag'),
+    ('migrate_games_start_time_unix', 'games', 'start_time_unix'),
+    ('migrate_player_games_placement', 'player_games', 'placement'),
+)
+
+def _build_init_sql(migrations=()):
+    """
+    Wrap the schema bootstrap script (plus migrations) in one versioned transaction.
+    
+    IMMEDIATE takes the write lock up front, so workers starting together queue
+    on it instead of deadlocking when each tries to upgrade a read lock.
+    """
+    return "BEGIN IMMEDIATE;\n{}\nPRAGMA user_version = {};\nCOMMIT;".format(
+        sql_manager.get_schema_bootstrap_script(migrations=migrations, api_keys_table=_API_KEYS_TABLE),
+        SCHEMA_VERSION
+    )
+
+# Schema DDL is formatted once at import; init_database just replays it
+_INIT_SQL = _build_init_sql()
 
 def create_app():
     """Create and configure the Flask application."""
+    # Handlers are set up here rather than at import so importing modules stays side-effect free
+    config.init_logging()
+    
     app = Flask(__name__, 
                 static_folder='frontend', 
                 template_folder='frontend')
@@ -31,46 +69,124 @@ def create_app():
     max_request_size = getattr(config, 'MAX_REQUEST_SIZE', 16 * 1024 * 1024)  # Default 16MB
     app.config['MAX_CONTENT_LENGTH'] = max_request_size
     
+    # Production defaults: keep compiled templates, don't re-sort JSON, let browsers cache static files
+    debug = getattr(config, 'DEBUG', False)
+    app.config['TEMPLATES_AUTO_RELOAD'] = debug
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0 if debug else getattr(config, 'STATIC_MAX_AGE', 86400)
+    # Behind a front-end server that honours X-Sendfile, send_from_directory responses
+    # carry only the file path and the server streams the file itself
+    app.config['USE_X_SENDFILE'] = getattr(config, 'USE_X_SENDFILE', False)
+    init_json_provider(app)
+    app.json.sort_keys = False
+    init_compression(app)
+    
+    # Behind a load balancer remote_addr is the balancer's address, which would put
+    # every anonymous caller in one rate-limit bucket. Set PROXY_FIX_HOPS to the number
+    # of trusted proxies in front of the app so X-Forwarded-For is honoured; leave it
+    # at 0 when clients connect directly, or they could spoof the header
+    proxy_hops = getattr(config, 'PROXY_FIX_HOPS', 0)
+    if proxy_hops:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops, x_proto=proxy_hops)
+    
+    # One pooled connection per request instead of one per query
+    connection.init_app(app)
+    
     # NEW: Initialize database using new layer
     init_database()
     
-    # FIXED: Register blueprints properly (this handles error handlers)
+    # Blueprints are imported here, not at module load, so importing this
+    # module (tests, CLI tooling) doesn't pull in every route module up front
+    from backend.routes import register_blueprints
     register_blueprints(app)
     
     logger.info("Slippi Server application initialized successfully")
     return app
 
+def init_compression(app):
+    """
+    Brotli/gzip-compress JSON and page responses when Flask-Compress is installed.
+    
+    gunicorn serves clients directly (behind the load balancer, not nginx), so
+    nothing else compresses the API's JSON. Small bodies aren't worth the CPU.
+    """
+    if Compress is None:
+        return
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = getattr(config, 'COMPRESS_MIN_SIZE', 500)
+    app.config['COMPRESS_MIMETYPES'] = [
+        'application/json', 'text/html', 'text/css', 'application/javascript'
+    ]
+    Compress(app)
+
 def init_database():
-    """Initialize the database using the new db layer."""
+    """
+    Initialize the database schema using the new db layer.
+    
+    Tables and indexes are sent to SQLite as one script wrapped in a single
+    transaction, so a cold start costs one commit instead of one per statement.
+    Databases already at SCHEMA_VERSION skip the DDL entirely.
+    """
     try:
-        # Initialize database connection and run schema if needed
-        with connection.get_connection() as conn:
-            cursor = conn.cursor()
+        # Raw connection (not the context manager) so executescript controls the transaction
+        with closing(connection.get_legacy_connection()) as conn:
+            current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if current_version >= SCHEMA_VERSION:
+                logger.info(f"Database schema up to date (version {current_version})")
+                return
             
-            # Initialize tables if they don't exist
+            migrations = _pending_schema_migrations(conn)
             try:
-                schema_queries = sql_manager.get_queries_in_category('schema')
-                for query_name, query_sql in schema_queries.items():
-                    if 'init_tables' in query_name or 'init_indexes' in query_name:
-                        cursor.executescript(query_sql)
-                logger.info("Database schema initialized")
-            except Exception as e:
-                logger.warning(f"Schema initialization issue (may be normal): {str(e)}")
-            
-            conn.commit()
-            
+                if migrations:
+                    logger.info(f"Applying schema migrations: {', '.join(migrations)}")
+                    conn.executescript(_build_init_sql(migrations))
+                else:
+                    conn.executescript(_INIT_SQL)
+            except sqlite3.Error:
+                # Workers starting together race to upgrade; the loser's script
+                # (e.g. a repeated ALTER TABLE) fails once the winner has committed
+                conn.rollback()
+                if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                    raise
+                logger.info("Database schema was upgraded by another process")
+                return
+        
+        logger.info("Database schema initialized")
         logger.info(f"Database initialized successfully at {config.get_database_path()}")
         
     except Exception as e:
         logger.error(f"Database initialization failed: {str(e)}")
         raise
 
+def _pending_schema_migrations(conn):
+    """Names of migrations whose table exists but predates the column they add."""
+    pending = []
+    for query_name, table, column in _SCHEMA_MIGRATIONS:
+        # table_xinfo (unlike table_info) also lists generated columns
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+        if columns and column not in columns:
+            pending.append(query_name)
+    return tuple(pending)
+
+_app = None
+
+def __getattr__(name):
+    """
+    Build the module-level ``app`` on first access (``gunicorn app:app``).
+    
+    Importing this module (tests, tooling, wsgi.py) then no longer sets up
+    logging or touches the database; only the process that serves does.
+    """
+    global _app
+    if name == 'app':
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == '__main__':
     app = create_app()
     app.run(
         host=config.HOST,
         port=config.PORT,
         debug=config.DEBUG
-    )
-
-app = create_app()
\ No newline at end of file
+    )
\ No newline at end of file
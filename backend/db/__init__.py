@@ -13,6 +13,10 @@ Usage in service layers:
     
     # Or use helper (returns clean dicts)
     results = execute_query('games', 'select_by_player', (player_code,))
+    
+    # Or stream large results one batch at a time
+    for game in iter_query('games', 'select_by_player', (player_code,)):
+        ...
 
 FIXED: Now converts sqlite3.Row objects to dictionaries automatically
 """
@@ -72,27 +76,53 @@ def execute_query(category, query_name, params=None, fetch_one=False):
         else:
             cursor.execute(query)
         
-        # FIXED: Determine if this is a data modification query
-        query_lower = query.strip().lower()
-        is_modification = (
-            query_lower.startswith('insert') or 
-            query_lower.startswith('update') or 
-            query_lower.startswith('delete') or
-            query_lower.startswith('replace')
-        )
+        # Statements that return no result columns (INSERT/UPDATE/DELETE/REPLACE) are
+        # modifications; this also holds when the .sql file starts with a comment
+        is_modification = cursor.description is None
         
         if is_modification:
             # FIXED: Commit the transaction for data modifications
             conn.commit()
             return cursor.rowcount  # Return number of affected rows
         else:
-            # For SELECT queries, fetch and return results
+            # For SELECT queries, fetch and return results. Column names are read
+            # once from the cursor and zipped with each row's values, instead of
+            # calling row.keys() and looking every column up by name per row
+            columns = [column[0] for column in cursor.description]
             if fetch_one:
                 result = cursor.fetchone()
-                return row_to_dict(result)
+                return dict(zip(columns, result)) if result is not None else None
             else:
-                results = cursor.fetchall()
-                return rows_to_dicts(results)
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def iter_query(category, query_name, params=None, batch_size=500):
+    """
+    Stream SELECT results as dicts, fetching batch_size rows at a time.
+    
+    For callers that consume rows once (e.g. parsing each game's player_data),
+    so only one batch of raw rows is held in Python instead of the full result.
+    The connection is held until the generator is exhausted or closed.
+    
+    Yields:
+        dict: One row per iteration
+    """
+    with connection.get_connection() as conn:
+        query = sql_manager.get_query(category, query_name)
+        cursor = conn.cursor()
+        
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+        
+        columns = [column[0] for column in cursor.description]
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            for row in batch:
+                yield dict(zip(columns, row))
 
 
 def execute_query_raw(category, query_name, params=None):
@@ -118,6 +148,7 @@ __all__ = [
     'connection',
     'sql_manager', 
     'execute_query',
+    'iter_query',
     'execute_query_raw',
     'row_to_dict',
     'rows_to_dicts'
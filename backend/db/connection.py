@@ -2,13 +2,17 @@
 Database Connection Management for Slippi Server.
 
 Simple, focused connection management with context manager support.
+Connections are borrowed from a bounded pool rather than opened per query,
+and inside a Flask app context one borrowed connection serves the whole request.
 No business logic - just connection handling.
 """
 
 import sqlite3
 import logging
 from contextlib import contextmanager
+from flask import g, current_app, has_app_context
 from backend.config import get_config
+from .pool import ConnectionPool, DEFAULT_ACQUIRE_TIMEOUT
 
 # Get configuration
 config = get_config()
@@ -20,7 +24,8 @@ class DatabaseConnection:
     Simple database connection manager.
     
     Provides context manager for safe connection handling with proper cleanup.
-    All connections use Row factory for dict-like access to results.
+    All connections use Row factory for dict-like access to results and are
+    reused through a ConnectionPool.
     """
     
     def __init__(self, db_path=None):
@@ -31,15 +36,45 @@ class DatabaseConnection:
             db_path (str, optional): Database path. Defaults to config value.
         """
         self.db_path = db_path or config.get_database_path()
+        self.pool = ConnectionPool(self.db_path, timeout=getattr(config, 'DB_POOL_TIMEOUT', DEFAULT_ACQUIRE_TIMEOUT))
         logger.debug(f"Database connection manager initialized for: {self.db_path}")
     
+    def init_app(self, app):
+        """
+        Scope pooled connections to app contexts for a Flask app.
+        
+        Every query in a request then reuses the same connection (and its warm
+        page cache), which goes back to the pool when the context tears down.
+        """
+        app.extensions['db_connection'] = self
+        app.teardown_appcontext(self.release_context_connection)
+    
+    def release_context_connection(self, exception=None):
+        """Return the app context's connection to the pool, if one was borrowed."""
+        conn = g.pop('_db_conn', None)
+        if conn is not None:
+            self.pool.release(conn)
+    
+    def _uses_context_connection(self):
+        """True inside an app context of an app registered with init_app."""
+        return has_app_context() and current_app.extensions.get('db_connection') is self
+    
+    def _context_connection(self):
+        """Borrow a connection once per app context and keep it on flask.g."""
+        conn = g.get('_db_conn')
+        if conn is None:
+            conn = g._db_conn = self.pool.acquire()
+        return conn
+    
     @contextmanager
     def get_connection(self):
         """
         Context manager for database connections.
         
-        Provides automatic connection cleanup and rollback on errors.
-        Sets Row factory for dict-like access to query results.
+        Borrows a pooled connection and returns it on exit, with rollback
+        on errors. Within an init_app-registered app context the context's
+        connection is reused and only returned on teardown. Connections use
+        Row factory for dict-like access.
         
         Yields:
             sqlite3.Connection: Database connection with Row factory
@@ -51,9 +86,9 @@ class DatabaseConnection:
                 results = cursor.fetchall()
         """
         conn = None
+        context_scoped = self._uses_context_connection()
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable dict-like access
+            conn = self._context_connection() if context_scoped else self.pool.acquire()
             yield conn
             
         except Exception as e:
@@ -64,9 +99,9 @@ class DatabaseConnection:
             raise  # Let calling code handle the exception
             
         finally:
-            # Always close connection
-            if conn:
-                conn.close()
+            # Hand the connection back unless the app context still owns it
+            if conn and not context_scoped:
+                self.pool.release(conn)
     
     def get_legacy_connection(self):
         """
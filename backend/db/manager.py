@@ -41,6 +41,7 @@ class SQLManager:
             self.sql_dir = Path(sql_directory)
         
         self._queries = {}
+        self._schema_scripts = {}
         self._loaded = False
         logger.debug(f"SQL manager initialized for directory: {self.sql_dir}")
     
@@ -181,6 +182,7 @@ class SQLManager:
         logger.info("Reloading SQL queries from files")
         self._loaded = False
         self._queries.clear()
+        self._schema_scripts.clear()
         self.load_queries()
     
     def format_query(self, category, query_name, **template_vars):
@@ -208,6 +210,36 @@ class SQLManager:
             query = query.replace(placeholder, str(value))
         
         return query
+    
+    def get_schema_bootstrap_script(self, migrations=(), **template_vars):
+        """
+        Get every schema init_* query joined into one executescript-ready string.
+        
+        init_tables comes first and init_indexes last, with any requested
+        migrations in between (indexes may cover migrated columns). The result
+        is built once per argument set and cached.
+        
+        Args:
+            migrations (tuple): Schema query names to run after the tables
+            **template_vars: Variables to substitute in {variable} placeholders
+            
+        Returns:
+            str: SQL script (no transaction wrapper)
+        """
+        cache_key = (tuple(migrations), tuple(sorted(template_vars.items())))
+        script = self._schema_scripts.get(cache_key)
+        if script is None:
+            if not self._loaded:
+                self.load_queries()
+            
+            init_names = sorted(name for name in self._queries.get('schema', {}) if name.startswith('init_'))
+            middle = [name for name in init_names if name not in ('init_tables', 'init_indexes')]
+            ordered = ['init_tables', *migrations, *middle, 'init_indexes']
+            
+            script = '\n'.join(self.format_query('schema', name, **template_vars) for name in ordered)
+            self._schema_scripts[cache_key] = script
+        
+        return script
 
 
 # Global SQL manager instance
@@ -0,0 +1,144 @@
+"""
+SQLite Connection Pool for Slippi Server.
+
+Keeps a bounded set of open sqlite3 connections so requests reuse them
+instead of paying the open/pragma/close cost on every query.
+No business logic - just connection reuse.
+"""
+
+import os
+import queue
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger('SlippiServer')
+
+# Pragmas applied once when a pooled connection is opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",          # readers don't block the writer
+    "PRAGMA synchronous=NORMAL",        # safe with WAL, fewer fsyncs
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA mmap_size=268435456",       # 256MB memory-mapped reads
+    "PRAGMA cache_size=-64000",         # ~64MB page cache per connection
+    "PRAGMA temp_store=MEMORY",         # sorts/temp b-trees stay in memory
+)
+
+# Seconds acquire() waits for a free connection; matches sqlite3's own busy timeout
+DEFAULT_ACQUIRE_TIMEOUT = 5.0
+
+# Prepared statements kept per connection; queries come from sql_manager as
+# identical strings, so each one compiles once per pooled connection
+STATEMENT_CACHE_SIZE = 256
+
+
+class PoolExhaustedError(sqlite3.OperationalError):
+    """No pooled connection became free within the acquire timeout."""
+
+
+def default_pool_size():
+    """Pool size heuristic: (cpu_count * 2) + 1."""
+    return (os.cpu_count() or 1) * 2 + 1
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of sqlite3 connections.
+
+    Connections are opened lazily up to ``size`` and handed out LIFO so the
+    most recently used (warmest page cache) connection is reused first.
+    """
+
+    def __init__(self, db_path, size=None, timeout=DEFAULT_ACQUIRE_TIMEOUT):
+        """
+        Initialize connection pool.
+
+        Args:
+            db_path (str): Database path
+            size (int, optional): Maximum open connections. Defaults to default_pool_size().
+            timeout (float, optional): Default seconds acquire() waits when the pool is exhausted
+        """
+        self.db_path = db_path
+        self.size = size or default_pool_size()
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=self.size)
+        self._opened = 0
+        self._lock = threading.Lock()
+        logger.debug(f"Connection pool initialized for {self.db_path} (size={self.size})")
+
+    def _open_connection(self):
+        """Open a new connection with Row factory and pool pragmas applied."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self, timeout=None):
+        """
+        Take a connection from the pool, opening one if below capacity.
+
+        Args:
+            timeout (float, optional): Seconds to wait when the pool is exhausted.
+                Defaults to the pool's timeout.
+
+        Returns:
+            sqlite3.Connection: Pooled connection with Row factory
+
+        Raises:
+            PoolExhaustedError: If no connection becomes available within timeout
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+
+        if can_open:
+            try:
+                return self._open_connection()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        if timeout is None:
+            timeout = self.timeout
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise PoolExhaustedError(
+                f"No database connection available after {timeout}s (pool size {self.size})"
+            ) from None
+
+    def release(self, conn):
+        """
+        Return a connection to the pool.
+
+        Any transaction left open by the caller is rolled back so the next
+        user starts clean (matching the old close-per-use behaviour).
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put_nowait(conn)
+        except Exception as e:
+            logger.warning(f"Discarding pooled connection: {e}")
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    def close_all(self):
+        """Close every idle connection in the pool."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
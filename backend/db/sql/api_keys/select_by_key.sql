@@ -1 +1 @@
-SELECT client_id, expires_at FROM api_keys WHERE api_key = ?
\ No newline at end of file
+SELECT client_id, api_key, expires_at, expires_at_epoch FROM api_keys WHERE api_key = ?
\ No newline at end of file
@@ -0,0 +1,7 @@
+INSERT INTO api_keys (client_id, api_key, created_at, expires_at, expires_at_epoch)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(client_id) DO UPDATE SET
+    api_key = excluded.api_key,
+    created_at = excluded.created_at,
+    expires_at = excluded.expires_at,
+    expires_at_epoch = excluded.expires_at_epoch
\ No newline at end of file
@@ -2,4 +2,4 @@ SELECT file_id, file_hash, client_id, original_filename, file_path, file_size, u
 FROM files 
 WHERE client_id = ?
 ORDER BY upload_date DESC
-{limit_clause}
\ No newline at end of file
+LIMIT ?
\ No newline at end of file
@@ -0,0 +1,3 @@
+SELECT COUNT(*) AS file_count, MAX(upload_date) AS last_upload
+FROM files
+WHERE client_id = ?
\ No newline at end of file
@@ -0,0 +1,3 @@
+-- file_id of each already stored hash in a batch
+-- Parameters: one per file hash; the placeholders marker is filled with one ? per hash
+SELECT file_hash, file_id FROM files WHERE file_hash IN ({placeholders})
\ No newline at end of file
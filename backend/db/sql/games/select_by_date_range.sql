@@ -1,4 +1,4 @@
 SELECT game_id, client_id, start_time, last_frame, stage_id, player_data, upload_date, game_type
 FROM games 
-WHERE datetime(start_time) BETWEEN datetime(?) AND datetime(?)
-ORDER BY datetime(start_time) DESC
\ No newline at end of file
+WHERE start_time_unix BETWEEN CAST(strftime('%s', ?) AS INTEGER) AND CAST(strftime('%s', ?) AS INTEGER)
+ORDER BY start_time_unix DESC
\ No newline at end of file
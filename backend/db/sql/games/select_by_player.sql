@@ -1,7 +1,10 @@
 -- Get all games for a specific player
 -- Parameters: player_tag
+-- Games hold 2-4 players; each pN_tag column has its own index, so this is a
+-- multi-index OR lookup rather than a JSON scan of every game
 
-SELECT DISTINCT g.*
-FROM games g, json_each(g.player_data) p
-WHERE json_extract(p.value, '$.player_tag') = ?
-ORDER BY datetime(g.start_time) DESC
\ No newline at end of file
+SELECT g.game_id, g.client_id, g.start_time, g.last_frame, g.stage_id,
+       g.player_data, g.upload_date, g.game_type
+FROM games g
+WHERE g.p1_tag = ?1 OR g.p2_tag = ?1 OR g.p3_tag = ?1 OR g.p4_tag = ?1
+ORDER BY g.start_time_unix DESC
\ No newline at end of file
@@ -0,0 +1,9 @@
+-- Get the most recent games for a specific player
+-- Parameters: player_tag, limit
+
+SELECT g.game_id, g.client_id, g.start_time, g.last_frame, g.stage_id,
+       g.player_data, g.upload_date, g.game_type
+FROM games g
+WHERE g.p1_tag = ?1 OR g.p2_tag = ?1 OR g.p3_tag = ?1 OR g.p4_tag = ?1
+ORDER BY g.start_time_unix DESC
+LIMIT ?2
\ No newline at end of file
@@ -0,0 +1,3 @@
+-- Which of a batch of game ids are already stored
+-- Parameters: one per game id; the placeholders marker is filled with one ? per id
+SELECT game_id FROM games WHERE game_id IN ({placeholders})
\ No newline at end of file
@@ -1,4 +1,4 @@
 SELECT game_id, client_id, start_time, last_frame, stage_id, player_data, upload_date, game_type 
 FROM games 
-ORDER BY datetime(start_time) DESC 
+ORDER BY start_time_unix DESC 
 LIMIT ?
\ No newline at end of file
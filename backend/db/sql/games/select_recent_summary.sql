@@ -0,0 +1,13 @@
+-- Recent games with only the fields the homepage shows, extracted in SQLite
+-- so no player_data blob is parsed in Python
+-- Parameters: limit
+SELECT game_id,
+       start_time,
+       json_array_length(player_data) AS player_count,
+       COALESCE(json_extract(player_data, '$[0].player_tag'), 'Unknown') AS player1_tag,
+       COALESCE(json_extract(player_data, '$[0].character_name'), 'Unknown') AS player1_character,
+       COALESCE(json_extract(player_data, '$[1].player_tag'), 'Unknown') AS player2_tag,
+       COALESCE(json_extract(player_data, '$[1].character_name'), 'Unknown') AS player2_character
+FROM games
+ORDER BY start_time_unix DESC
+LIMIT ?
\ No newline at end of file
@@ -0,0 +1,10 @@
+-- Games and wins per character for a player
+-- Parameters: player_tag
+
+SELECT COALESCE(character_name, 'Unknown') as character_name,
+       COUNT(*) as games,
+       SUM(CASE WHEN result = 'Win' THEN 1 ELSE 0 END) as wins
+FROM player_games
+WHERE player_tag = ?
+GROUP BY COALESCE(character_name, 'Unknown')
+ORDER BY games DESC
\ No newline at end of file
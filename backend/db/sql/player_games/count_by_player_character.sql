@@ -0,0 +1,6 @@
+-- Count a player's games on a single character
+-- Parameters: player_tag, character_name
+
+SELECT COUNT(*) AS total_games
+FROM player_games
+WHERE player_tag = ? AND character_name = ?
\ No newline at end of file
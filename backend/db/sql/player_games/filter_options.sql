@@ -0,0 +1,9 @@
+-- Distinct values in a player's games for the detailed-view filter dropdowns
+-- Parameters: player_tag
+-- player_filter_options is kept current by a trigger on player_games; its
+-- primary key order is the (option, value) order returned here
+
+SELECT option, value
+FROM player_filter_options
+WHERE player_tag = ?
+ORDER BY option, value
\ No newline at end of file
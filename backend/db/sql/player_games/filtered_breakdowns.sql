@@ -0,0 +1,38 @@
+-- Games and wins per character, opponent, opponent character, stage and date
+-- for a player's games that match the detailed-view filters
+-- Parameters: player_tag, then one per bound filter value
+-- The filters placeholder is built by the service from fixed column expressions and ? placeholders only
+-- Keys within a breakdown are ordered by their most recent game, newest first
+
+WITH filtered AS MATERIALIZED (
+    SELECT COALESCE(character_name, 'Unknown') as character_name,
+           COALESCE(opponent_tag, 'Unknown') as opponent_tag,
+           COALESCE(opponent_char, 'Unknown') as opponent_char,
+           stage_id,
+           -- ISO timestamps carry the date in the first 10 chars; keep other formats whole
+           CASE WHEN length(start_time) >= 10 AND substr(start_time, 5, 1) = '-'
+                THEN substr(start_time, 1, 10) ELSE start_time END as game_date,
+           start_time,
+           CASE WHEN result = 'Win' THEN 1 ELSE 0 END as win
+    FROM player_games
+    WHERE player_tag = ?{filters}
+)
+SELECT breakdown, breakdown_key, games, wins
+FROM (
+    SELECT 'character' as breakdown, character_name as breakdown_key,
+           COUNT(*) as games, SUM(win) as wins, MAX(start_time) as last_played
+    FROM filtered GROUP BY character_name
+    UNION ALL
+    SELECT 'opponent', opponent_tag, COUNT(*), SUM(win), MAX(start_time)
+    FROM filtered GROUP BY opponent_tag
+    UNION ALL
+    SELECT 'opponent_character', opponent_char, COUNT(*), SUM(win), MAX(start_time)
+    FROM filtered GROUP BY opponent_char
+    UNION ALL
+    SELECT 'stage', stage_id, COUNT(*), SUM(win), MAX(start_time)
+    FROM filtered GROUP BY stage_id
+    UNION ALL
+    SELECT 'date', game_date, COUNT(*), SUM(win), MAX(start_time)
+    FROM filtered WHERE game_date != '' GROUP BY game_date
+)
+ORDER BY last_played DESC
\ No newline at end of file
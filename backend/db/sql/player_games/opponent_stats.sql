@@ -0,0 +1,10 @@
+-- Games and wins per opponent for a player
+-- Parameters: player_tag
+
+SELECT opponent_tag,
+       COUNT(*) as games,
+       SUM(CASE WHEN result = 'Win' THEN 1 ELSE 0 END) as wins
+FROM player_games
+WHERE player_tag = ? AND opponent_tag IS NOT NULL AND opponent_tag != ''
+GROUP BY opponent_tag
+ORDER BY games DESC
\ No newline at end of file
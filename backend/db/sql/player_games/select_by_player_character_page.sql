@@ -0,0 +1,9 @@
+-- Get one page of a player's games on a single character, newest first
+-- Parameters: player_tag, character_name, limit, offset
+
+SELECT player_tag, game_id, start_time, stage_id, character_name,
+       opponent_tag, opponent_char, result, last_frame, placement, opponent_placement
+FROM player_games
+WHERE player_tag = ? AND character_name = ?
+ORDER BY start_time DESC
+LIMIT ? OFFSET ?
\ No newline at end of file
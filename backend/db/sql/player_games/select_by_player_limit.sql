@@ -0,0 +1,9 @@
+-- Get the most recent materialized games for a specific player
+-- Parameters: player_tag, limit
+
+SELECT player_tag, game_id, start_time, stage_id, character_name,
+       opponent_tag, opponent_char, result, last_frame, placement, opponent_placement
+FROM player_games
+WHERE player_tag = ?
+ORDER BY start_time DESC
+LIMIT ?
\ No newline at end of file
@@ -0,0 +1,10 @@
+-- Most recent materialized games for a player that match the detailed-view filters, newest first
+-- Parameters: player_tag, then one per bound filter value, then limit
+-- The filters placeholder is built by the service from fixed column expressions and ? placeholders only
+
+SELECT player_tag, game_id, start_time, stage_id, character_name,
+       opponent_tag, opponent_char, result, last_frame, placement, opponent_placement
+FROM player_games
+WHERE player_tag = ?{filters}
+ORDER BY start_time DESC
+LIMIT ?
\ No newline at end of file
@@ -0,0 +1,10 @@
+-- Games and wins per stage for a player
+-- Parameters: player_tag
+
+SELECT stage_id,
+       COUNT(*) as games,
+       SUM(CASE WHEN result = 'Win' THEN 1 ELSE 0 END) as wins
+FROM player_games
+WHERE player_tag = ?
+GROUP BY stage_id
+ORDER BY games DESC
\ No newline at end of file
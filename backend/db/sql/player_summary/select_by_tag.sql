@@ -0,0 +1 @@
+SELECT player_tag, total_games, wins, last_game FROM player_summary WHERE player_tag = ?
\ No newline at end of file
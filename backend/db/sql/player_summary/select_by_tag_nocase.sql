@@ -0,0 +1,9 @@
+-- Case-insensitive exact tag lookup, served by idx_player_summary_tag_nocase
+SELECT 
+    player_tag,
+    total_games,
+    wins,
+    ROUND((CAST(wins AS FLOAT) / total_games) * 100, 2) as win_rate
+FROM player_summary
+WHERE player_tag = ? COLLATE NOCASE
+ORDER BY total_games DESC
\ No newline at end of file
@@ -0,0 +1,4 @@
+-- Drop buckets whose window ended before the given minute
+-- Parameters: window_start (minutes since the epoch)
+
+DELETE FROM rate_limits WHERE window_start < ?
\ No newline at end of file
@@ -0,0 +1,13 @@
+-- Count one request against a bucket, restarting the count when the minute changes
+-- Parameters: bucket, window_start (minutes since the epoch), max requests per minute
+-- Returns the bucket's request count for that minute, including this request;
+-- no row when the bucket is already full, which leaves the count unchanged
+
+INSERT INTO rate_limits (bucket, window_start, request_count)
+VALUES (?1, ?2, 1)
+ON CONFLICT (bucket) DO UPDATE SET
+    request_count = CASE WHEN window_start = excluded.window_start
+                         THEN request_count + 1 ELSE 1 END,
+    window_start = excluded.window_start
+WHERE window_start != excluded.window_start OR request_count < ?3
+RETURNING request_count
\ No newline at end of file
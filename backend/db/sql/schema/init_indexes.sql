@@ -2,15 +2,35 @@
 CREATE INDEX IF NOT EXISTS idx_games_start_time ON games (start_time);
 CREATE INDEX IF NOT EXISTS idx_games_client_id ON games (client_id);
 CREATE INDEX IF NOT EXISTS idx_games_upload_date ON games (upload_date);
+CREATE INDEX IF NOT EXISTS idx_games_p1_tag ON games (p1_tag);
+CREATE INDEX IF NOT EXISTS idx_games_p2_tag ON games (p2_tag);
+CREATE INDEX IF NOT EXISTS idx_games_p3_tag ON games (p3_tag);
+CREATE INDEX IF NOT EXISTS idx_games_p4_tag ON games (p4_tag);
+CREATE INDEX IF NOT EXISTS idx_games_start_time_unix ON games (start_time_unix DESC);
+
+-- Performance indexes for player_games table
+CREATE INDEX IF NOT EXISTS idx_player_games_tag_time ON player_games (player_tag, start_time DESC);
+-- Also serves one character's games newest first (paged per-character listings) without a sort
+DROP INDEX IF EXISTS idx_player_games_tag_character;
+CREATE INDEX IF NOT EXISTS idx_player_games_tag_character_time ON player_games (player_tag, character_name, start_time DESC);
+CREATE INDEX IF NOT EXISTS idx_player_games_tag_stage ON player_games (player_tag, stage_id);
+
+-- Performance indexes for player_summary table
+CREATE INDEX IF NOT EXISTS idx_player_summary_tag_nocase ON player_summary (player_tag COLLATE NOCASE);
 
 -- Performance indexes for API keys table
-CREATE INDEX IF NOT EXISTS idx_api_keys_key ON {api_keys_table} (api_key);
+-- Covering index so key validation is answered from the index alone
+DROP INDEX IF EXISTS idx_api_keys_key;
+DROP INDEX IF EXISTS idx_api_keys_lookup;
+CREATE INDEX IF NOT EXISTS idx_api_keys_auth ON {api_keys_table} (api_key, client_id, expires_at, expires_at_epoch);
 
 -- Performance indexes for clients table
 CREATE INDEX IF NOT EXISTS idx_clients_last_active ON clients (last_active);
 
 -- Performance indexes for files table
 CREATE INDEX IF NOT EXISTS idx_files_hash ON files (file_hash);
-CREATE INDEX IF NOT EXISTS idx_files_client_id ON files (client_id);
+-- Listing a client's files newest first walks this index in order, with no sort step
+DROP INDEX IF EXISTS idx_files_client_id;
+CREATE INDEX IF NOT EXISTS idx_files_client_upload ON files (client_id, upload_date DESC);
 CREATE INDEX IF NOT EXISTS idx_files_upload_date ON files (upload_date);
 CREATE INDEX IF NOT EXISTS idx_files_original_filename ON files (original_filename);
\ No newline at end of file
@@ -0,0 +1,39 @@
+-- Rebuild player_filter_options from player_games, then keep it current on ingest.
+-- Empty and 'Unknown' values (and stage 0) are left out, as in the dropdowns
+INSERT OR IGNORE INTO player_filter_options (player_tag, option, value)
+SELECT player_tag, option, value
+FROM (
+    SELECT player_tag, 'characters' as option, character_name as value
+    FROM player_games
+    UNION ALL
+    SELECT player_tag, 'opponents', opponent_tag
+    FROM player_games
+    UNION ALL
+    SELECT player_tag, 'opponent_characters', opponent_char
+    FROM player_games
+    WHERE opponent_tag IS NOT NULL
+    UNION ALL
+    SELECT player_tag, 'stages', CAST(stage_id AS TEXT)
+    FROM player_games
+    WHERE stage_id != 0
+)
+WHERE value IS NOT NULL AND value NOT IN ('', 'Unknown');
+
+CREATE TRIGGER IF NOT EXISTS trg_player_games_filter_options
+AFTER INSERT ON player_games
+BEGIN
+    INSERT OR IGNORE INTO player_filter_options (player_tag, option, value)
+    SELECT NEW.player_tag, option, value
+    FROM (
+        SELECT 'characters' as option, NEW.character_name as value
+        UNION ALL
+        SELECT 'opponents', NEW.opponent_tag
+        UNION ALL
+        SELECT 'opponent_characters', NEW.opponent_char
+        WHERE NEW.opponent_tag IS NOT NULL
+        UNION ALL
+        SELECT 'stages', CAST(NEW.stage_id AS TEXT)
+        WHERE NEW.stage_id != 0
+    )
+    WHERE value IS NOT NULL AND value NOT IN ('', 'Unknown');
+END;
\ No newline at end of file
@@ -0,0 +1,55 @@
+-- Populate player_games for games ingested before the table existed
+-- INSERT OR IGNORE makes re-running on a schema version bump harmless
+INSERT OR IGNORE INTO player_games (player_tag, game_id, start_time, stage_id, character_name,
+                                     opponent_tag, opponent_char, result, last_frame,
+                                     placement, opponent_placement)
+SELECT json_extract(p.value, '$.player_tag'),
+       g.game_id,
+       g.start_time,
+       g.stage_id,
+       json_extract(p.value, '$.character_name'),
+       json_extract(o.value, '$.player_tag'),
+       json_extract(o.value, '$.character_name'),
+       json_extract(p.value, '$.result'),
+       g.last_frame,
+       json_extract(p.value, '$.placement'),
+       json_extract(o.value, '$.placement')
+FROM games g
+JOIN json_each(g.player_data) p
+-- Opponent is the first other player whose tag differs (case-insensitive),
+-- matching find_player_in_game_data
+LEFT JOIN json_each(g.player_data) o ON o.key = (
+    SELECT MIN(x.key) FROM json_each(g.player_data) x
+    WHERE lower(COALESCE(json_extract(x.value, '$.player_tag'), ''))
+       != lower(COALESCE(json_extract(p.value, '$.player_tag'), ''))
+)
+WHERE COALESCE(json_extract(p.value, '$.player_tag'), '') != '';
+
+-- Expand each newly inserted game into player_games at ingest, whichever
+-- code path inserts it (recreated so schema bumps pick up column changes)
+DROP TRIGGER IF EXISTS trg_games_player_games;
+CREATE TRIGGER trg_games_player_games
+AFTER INSERT ON games
+BEGIN
+    INSERT OR IGNORE INTO player_games (player_tag, game_id, start_time, stage_id, character_name,
+                                         opponent_tag, opponent_char, result, last_frame,
+                                         placement, opponent_placement)
+    SELECT json_extract(p.value, '$.player_tag'),
+           NEW.game_id,
+           NEW.start_time,
+           NEW.stage_id,
+           json_extract(p.value, '$.character_name'),
+           json_extract(o.value, '$.player_tag'),
+           json_extract(o.value, '$.character_name'),
+           json_extract(p.value, '$.result'),
+           NEW.last_frame,
+           json_extract(p.value, '$.placement'),
+           json_extract(o.value, '$.placement')
+    FROM json_each(NEW.player_data) p
+    LEFT JOIN json_each(NEW.player_data) o ON o.key = (
+        SELECT MIN(x.key) FROM json_each(NEW.player_data) x
+        WHERE lower(COALESCE(json_extract(x.value, '$.player_tag'), ''))
+           != lower(COALESCE(json_extract(p.value, '$.player_tag'), ''))
+    )
+    WHERE COALESCE(json_extract(p.value, '$.player_tag'), '') != '';
+END;
\ No newline at end of file
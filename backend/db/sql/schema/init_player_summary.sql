@@ -0,0 +1,22 @@
+-- Rebuild player_summary from player_games, then keep it current on ingest
+INSERT OR REPLACE INTO player_summary (player_tag, total_games, wins, last_game)
+SELECT player_tag,
+       COUNT(*),
+       SUM(CASE WHEN result = 'Win' THEN 1 ELSE 0 END),
+       MAX(start_time)
+FROM player_games
+GROUP BY player_tag;
+
+-- Rows skipped by INSERT OR IGNORE don't fire AFTER INSERT, so re-ingesting
+-- a game never double counts
+CREATE TRIGGER IF NOT EXISTS trg_player_games_summary
+AFTER INSERT ON player_games
+BEGIN
+    INSERT INTO player_summary (player_tag, total_games, wins, last_game)
+    VALUES (NEW.player_tag, 1, CASE WHEN NEW.result = 'Win' THEN 1 ELSE 0 END, NEW.start_time)
+    ON CONFLICT(player_tag) DO UPDATE SET
+        total_games = total_games + 1,
+        wins = wins + excluded.wins,
+        last_game = CASE WHEN last_game IS NULL OR excluded.last_game > last_game
+                         THEN excluded.last_game ELSE last_game END;
+END;
\ No newline at end of file
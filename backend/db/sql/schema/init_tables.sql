@@ -18,6 +18,13 @@ CREATE TABLE IF NOT EXISTS games (
     player_data TEXT,
     upload_date TEXT,
     game_type TEXT,
+    -- Indexed player tags so player lookups don't parse every player_data row
+    p1_tag TEXT GENERATED ALWAYS AS (json_extract(player_data, '$[0].player_tag')) VIRTUAL,
+    p2_tag TEXT GENERATED ALWAYS AS (json_extract(player_data, '$[1].player_tag')) VIRTUAL,
+    p3_tag TEXT GENERATED ALWAYS AS (json_extract(player_data, '$[2].player_tag')) VIRTUAL,
+    p4_tag TEXT GENERATED ALWAYS AS (json_extract(player_data, '$[3].player_tag')) VIRTUAL,
+    -- start_time as unix seconds, so date ordering and ranges can use an index
+    start_time_unix INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', start_time) AS INTEGER)) VIRTUAL,
     FOREIGN KEY (client_id) REFERENCES clients (client_id)
 );
 
@@ -27,6 +34,7 @@ CREATE TABLE IF NOT EXISTS {api_keys_table} (
     api_key TEXT UNIQUE,
     created_at TEXT,
     expires_at TEXT,
+    expires_at_epoch INTEGER,
     FOREIGN KEY (client_id) REFERENCES clients (client_id)
 );
 
@@ -41,4 +49,49 @@ CREATE TABLE IF NOT EXISTS files (
     upload_date TEXT NOT NULL,
     metadata TEXT,
     FOREIGN KEY (client_id) REFERENCES clients (client_id)
-);
\ No newline at end of file
+);
+
+-- Create player_games table: one row per player per game, materialized from
+-- games.player_data at ingest so per-player queries never parse JSON
+CREATE TABLE IF NOT EXISTS player_games (
+    player_tag TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    start_time TEXT,
+    stage_id INTEGER,
+    character_name TEXT,
+    opponent_tag TEXT,
+    opponent_char TEXT,
+    result TEXT,
+    last_frame INTEGER,
+    placement INTEGER,
+    opponent_placement INTEGER,
+    PRIMARY KEY (game_id, player_tag),
+    FOREIGN KEY (game_id) REFERENCES games (game_id)
+);
+
+-- Create player_summary table: per-player totals kept current by a trigger
+-- on player_games, so homepage counts and rankings never re-aggregate games
+CREATE TABLE IF NOT EXISTS player_summary (
+    player_tag TEXT PRIMARY KEY,
+    total_games INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    last_game TEXT
+);
+
+-- Create player_filter_options table: the distinct characters, opponents,
+-- opponent characters and stages in each player's games, kept current by a
+-- trigger on player_games so the filter dropdowns are one index range read
+CREATE TABLE IF NOT EXISTS player_filter_options (
+    player_tag TEXT NOT NULL,
+    option TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (player_tag, option, value)
+) WITHOUT ROWID;
+
+-- Create rate_limits table: per-endpoint, per-client request counts for the
+-- current minute, shared by every worker when RATE_LIMIT_STORAGE = 'database'
+CREATE TABLE IF NOT EXISTS rate_limits (
+    bucket TEXT PRIMARY KEY,
+    window_start INTEGER NOT NULL,
+    request_count INTEGER NOT NULL
+) WITHOUT ROWID;
\ No newline at end of file
@@ -0,0 +1,6 @@
+-- Add integer expiry to API keys created before expires_at_epoch existed
+-- expires_at is naive local time, so convert through the 'utc' modifier
+ALTER TABLE {api_keys_table} ADD COLUMN expires_at_epoch INTEGER;
+UPDATE {api_keys_table}
+SET expires_at_epoch = CAST(strftime('%s', expires_at, 'utc') AS INTEGER)
+WHERE expires_at IS NOT NULL;
\ No newline at end of file
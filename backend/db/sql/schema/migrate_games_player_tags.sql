@@ -0,0 +1,6 @@
+-- Add generated player tag columns to games tables created before they existed
+-- VIRTUAL columns are computed on read, so existing rows need no backfill
+ALTER TABLE games ADD COLUMN p1_tag TEXT GENERATED ALWAYS AS (json_extract(player_data, '$[0].player_tag')) VIRTUAL;
+ALTER TABLE games ADD COLUMN p2_tag TEXT GENERATED ALWAYS AS (json_extract(player_data, '$[1].player_tag')) VIRTUAL;
+ALTER TABLE games ADD COLUMN p3_tag TEXT GENERATED ALWAYS AS (json_extract(player_data, '$[2].player_tag')) VIRTUAL;
+ALTER TABLE games ADD COLUMN p4_tag TEXT GENERATED ALWAYS AS (json_extract(player_data, '$[3].player_tag')) VIRTUAL;
\ No newline at end of file
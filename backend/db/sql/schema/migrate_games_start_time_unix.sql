@@ -0,0 +1,3 @@
+-- Add the generated start_time_unix column to games tables created before it existed
+-- VIRTUAL (ALTER TABLE can't add STORED columns); its index holds the computed values
+ALTER TABLE games ADD COLUMN start_time_unix INTEGER GENERATED ALWAYS AS (CAST(strftime('%s', start_time) AS INTEGER)) VIRTUAL;
\ No newline at end of file
@@ -0,0 +1,20 @@
+-- Add placement columns to player_games tables created before they existed,
+-- filling them from each game's player_data
+ALTER TABLE player_games ADD COLUMN placement INTEGER;
+ALTER TABLE player_games ADD COLUMN opponent_placement INTEGER;
+
+UPDATE player_games
+SET placement = (
+        SELECT json_extract(p.value, '$.placement')
+        FROM games g, json_each(g.player_data) p
+        WHERE g.game_id = player_games.game_id
+          AND json_extract(p.value, '$.player_tag') = player_games.player_tag
+        LIMIT 1
+    ),
+    opponent_placement = (
+        SELECT json_extract(o.value, '$.placement')
+        FROM games g, json_each(g.player_data) o
+        WHERE g.game_id = player_games.game_id
+          AND json_extract(o.value, '$.player_tag') = player_games.opponent_tag
+        LIMIT 1
+    );
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+JSON provider for Slippi Server.
+
+Serializes API responses with orjson when it is installed, falling back to
+Flask's stdlib-based provider otherwise. No business logic - just encoding.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Drop-in JSON provider backed by orjson.
+    
+    Keeps DefaultJSONProvider behaviour for anything orjson can't express
+    (custom ``cls``/``indent`` arguments, pretty-printed debug responses) and
+    uses its ``default`` hook for types orjson doesn't know natively.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize obj to a JSON string."""
+        # response() asks for compact separators, which is all orjson emits anyway
+        if kwargs.get('separators') == (',', ':'):
+            kwargs.pop('separators')
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode()
+    
+    def response(self, *args, **kwargs):
+        """
+        Build a JSON response (what ``jsonify`` calls).
+        
+        Compact responses use orjson's bytes as the body directly rather than
+        decoding them to str for Flask to encode again.
+        """
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self._dumps_bytes(obj, orjson.OPT_APPEND_NEWLINE), mimetype=self.mimetype
+        )
+    
+    def _dumps_bytes(self, obj, option=0):
+        """orjson-encode obj with this provider's options."""
+        # Breakdown dicts are keyed by stage id ints, so non-str keys must be allowed
+        option |= orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+    
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes."""
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def init_json_provider(app):
+    """Install OrjsonProvider on the app if orjson is available."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
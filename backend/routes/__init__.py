@@ -2,10 +2,41 @@
 Routes package for Slippi Server.
 
 Simplified structure with static routes merged into web routes.
+Blueprint modules are imported on registration rather than on package import.
 """
 
-from .web_routes import web_bp
-from .api_routes import api_bp
+import re
+from flask import request
+from werkzeug.routing import BaseConverter
+from backend.utils import encode_player_tag, decode_player_tag
+
+# Flask-Compress appends the coding to a compressed response's ETag
+# ("<hash>:gzip"), and clients send that form back in If-None-Match
+_COMPRESSED_ETAG_SUFFIX = re.compile(r':(?:gzip|br|deflate)"')
+
+
+class PlayerTagConverter(BaseConverter):
+    """``<ptag:player_code>`` - player tags are decoded once at routing time."""
+    
+    def to_python(self, value):
+        return decode_player_tag(value)
+    
+    def to_url(self, value):
+        return encode_player_tag(value)
+
+
+def conditional_request_environ():
+    """
+    The request's WSGI environ with compression suffixes stripped from If-None-Match.
+    
+    Pass it to is_resource_modified / make_conditional so a client echoing a
+    compressed response's ETag still matches the ETag the view computed.
+    """
+    if_none_match = request.environ.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return request.environ
+    return {**request.environ, 'HTTP_IF_NONE_MATCH': _COMPRESSED_ETAG_SUFFIX.sub('"', if_none_match)}
+
 
 def register_blueprints(app):
     """
@@ -14,6 +45,12 @@ def register_blueprints(app):
     Args:
         app (Flask): Flask application instance
     """
+    from .web_routes import web_bp
+    from .api_routes import api_bp
+    
+    # Converters must exist before the blueprints add rules that use them
+    app.url_map.converters['ptag'] = PlayerTagConverter
+    
     # Register route blueprints
     app.register_blueprint(web_bp)
     app.register_blueprint(api_bp, url_prefix='/api')
@@ -6,23 +6,37 @@ Uses ONLY service imports through backend.services - no direct imports.
 """
 
 import time
+import logging
+import threading
+from collections import OrderedDict
 from functools import wraps
-from flask import Blueprint, request, jsonify, abort
-from werkzeug.exceptions import RequestEntityTooLarge
+from flask import Blueprint, request, jsonify, abort, current_app
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
+from werkzeug.http import generate_etag, is_resource_modified
 
 from backend.config import get_config
-from backend.utils import decode_player_tag
 
 # FIXED: Import ALL services through the main services module
 # This avoids circular imports and uses the proper domain exports
 import backend.services as services
+from backend.routes import conditional_request_environ
 
 # Create blueprint for API routes
 api_bp = Blueprint('api', __name__)
 
 # Get configuration and logger
 config = get_config()
-logger = config.init_logging()
+logger = logging.getLogger('SlippiServer')
+
+# Seconds clients may reuse an API read response before revalidating its ETag
+API_CACHE_MAX_AGE = getattr(config, 'API_CACHE_MAX_AGE', 60)
+
+# Most clients each rate_limited endpoint tracks before forgetting the least recent
+RATE_LIMIT_MAX_CLIENTS = getattr(config, 'RATE_LIMIT_MAX_CLIENTS', 10000)
+
+# 'memory' limits each worker process separately; 'database' shares counts across
+# workers (and hosts using the same database) through the rate_limits table
+RATE_LIMIT_STORAGE = getattr(config, 'RATE_LIMIT_STORAGE', 'memory')
 
 # =============================================================================
 # Authentication Decorators
@@ -39,107 +53,199 @@ def require_api_key(f):
         if not client_info:
             abort(401, description="Invalid or missing API key")
         
-        kwargs['client_id'] = client_info.get('client_id')
+        # authenticate_client returns the (cached) ApiKeyData; rate_limited reads client_id
+        # from kwargs, so the key is looked up once per request
+        kwargs['client_id'] = client_info.client_id
         return f(*args, **kwargs)
     return decorated_function
 
 def rate_limited(max_per_minute):
-    """Decorator to implement rate limiting by client."""
-    request_counts = {}
+    """
+    Decorator to implement rate limiting by client.
+    
+    Each client keeps one [minute, count] window that is reset in place when
+    the minute changes, so a request costs one lookup and no sweep. Clients
+    are kept in LRU order and the least recently seen is dropped beyond
+    RATE_LIMIT_MAX_CLIENTS, so memory stays bounded as clients churn.
+    
+    With RATE_LIMIT_STORAGE = 'database' the count is one shared upsert per
+    request instead, falling back to the per-process window if it fails.
+    """
+    request_counts = OrderedDict()
+    lock = threading.Lock()
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            client_id = kwargs.get('client_id')
-            if not client_id:
-                api_key = request.headers.get('X-API-Key')
-                client_info = services.validate_api_key(api_key)
-                client_id = client_info.get('client_id') if client_info else 'anonymous'
+            # require_api_key (stacked above) has already resolved the client; public
+            # endpoints are limited per caller address instead of one shared bucket
+            # (behind a proxy this needs PROXY_FIX_HOPS, see create_app)
+            client_id = kwargs.get('client_id') or f"addr:{request.remote_addr or 'anonymous'}"
             
-            current_minute = int(time.time() / 60)
-            if client_id not in request_counts:
-                request_counts[client_id] = {}
+            limited = None
+            if RATE_LIMIT_STORAGE == 'database':
+                try:
+                    # Workers share wall-clock minutes, so the window must come from time_ns
+                    limited = not services.record_rate_limited_request(
+                        f"{f.__name__}:{client_id}", time.time_ns() // 60_000_000_000, max_per_minute
+                    )
+                except Exception as e:
+                    logger.warning(f"Shared rate limit unavailable, using per-process limit: {str(e)}")
             
-            # Clean up old entries
-            for minute in list(request_counts[client_id].keys()):
-                if minute < current_minute:
-                    del request_counts[client_id][minute]
+            if limited is None:
+                # Integer clock that wall-clock (NTP) adjustments can't move backwards
+                current_minute = time.monotonic_ns() // 60_000_000_000
+                
+                with lock:
+                    window = request_counts.get(client_id)
+                    if window is None or window[0] != current_minute:
+                        window = request_counts[client_id] = [current_minute, 0]
+                    request_counts.move_to_end(client_id)
+                    if len(request_counts) > RATE_LIMIT_MAX_CLIENTS:
+                        request_counts.popitem(last=False)
+                    
+                    if window[1] >= max_per_minute:
+                        limited = True
+                    else:
+                        window[1] += 1
+                        limited = False
             
-            current_count = request_counts[client_id].get(current_minute, 0)
-            if current_count >= max_per_minute:
+            if limited:
                 abort(429, description=f"Rate limit exceeded. Maximum {max_per_minute} requests per minute.")
             
-            request_counts[client_id][current_minute] = current_count + 1
             return f(*args, **kwargs)
         return decorated_function
     return decorator
 
+def api_errors(error_message, invalid_input=None):
+    """
+    Decorator turning exceptions that escape an API view into JSON error responses.
+    
+    HTTP errors raised inside the view (abort, malformed JSON bodies) keep their
+    status with a JSON body. ValueError is the caller's fault only for views
+    that pass invalid_input: a 400 with that message, or the exception text
+    when True.
+    Anything else is logged and answered with a 500 carrying error_message.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            try:
+                return f(*args, **kwargs)
+            except RequestEntityTooLarge:
+                return jsonify({'error': 'Upload too large'}), 413
+            except HTTPException as e:
+                return jsonify({'error': e.description}), e.code
+            except ValueError as e:
+                if invalid_input is None:
+                    logger.error(f"{error_message} ({f.__name__}): {str(e)}")
+                    return jsonify({'error': error_message}), 500
+                return jsonify({'error': str(e) if invalid_input is True else invalid_input}), 400
+            except Exception as e:
+                logger.error(f"{error_message} ({f.__name__}): {str(e)}")
+                return jsonify({'error': error_message}), 500
+        return decorated_function
+    return decorator
+
 # =============================================================================
 # Player Statistics Endpoints
 # =============================================================================
 
-@api_bp.route('/player/<encoded_player_code>/stats', methods=['GET'])
+@api_bp.route('/player/<ptag:player_code>/stats', methods=['GET'])
 @rate_limited(config.RATE_LIMIT_API)
-def player_stats(encoded_player_code):
+@api_errors('Failed to fetch player statistics', invalid_input='Invalid player code format')
+def player_stats(player_code):
     """Get basic player statistics."""
-    try:
-        player_code = decode_player_tag(encoded_player_code)
-        stats = services.process_player_basic_stats(player_code)
-        return jsonify(stats)
-    except ValueError:
-        abort(400, description="Invalid player code format")
-    except Exception as e:
-        logger.error(f"Error fetching player stats: {str(e)}")
-        return jsonify({'error': 'Failed to fetch player statistics'}), 500
+    etag = _player_etag(player_code)
+    if etag and _client_copy_current(etag):
+        return _cacheable(current_app.response_class(status=304), etag)
+    
+    stats = services.process_player_basic_stats(player_code)
+    return _cacheable(jsonify(stats), etag)
 
-@api_bp.route('/player/<encoded_player_code>/detailed', methods=['GET', 'POST'])
+@api_bp.route('/player/<ptag:player_code>/detailed', methods=['GET', 'POST'])
 @rate_limited(config.RATE_LIMIT_API)
-def player_detailed_stats(encoded_player_code):
+@api_errors('Failed to fetch detailed player statistics', invalid_input='Invalid player code format')
+def player_detailed_stats(player_code):
     """
     Get detailed player statistics and analysis.
     
     Supports both GET (query params) and POST (JSON body) for filters.
     The frontend JavaScript uses POST with JSON for complex filter combinations.
     """
-    try:
-        player_code = decode_player_tag(encoded_player_code)
+    # Handle different request methods
+    if request.method == 'POST':
+        # POST: Get filters from JSON body (frontend expects this)
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type must be application/json'}), 400
         
-        # Handle different request methods
-        if request.method == 'POST':
-            # POST: Get filters from JSON body (frontend expects this)
-            if not request.is_json:
-                return jsonify({'error': 'Content-Type must be application/json'}), 400
-            
-            filter_data = request.get_json() or {}
-            character = filter_data.get('character', 'all')
-            opponent = filter_data.get('opponent', 'all')
-            opponent_character = filter_data.get('opponent_character', 'all')
-            stage = filter_data.get('stage', 'all')
-            limit = int(filter_data.get('limit', 100))
-            
-            logger.info(f"POST request with filters: {filter_data}")
-            
-        else:
-            # GET: Get filters from query parameters (for direct URL access)
-            character = request.args.get('character', 'all')
-            opponent = request.args.get('opponent', 'all')
-            opponent_character = request.args.get('opponent_character', 'all')
-            stage = request.args.get('stage', 'all')
-            limit = int(request.args.get('limit', 100))
-            
-            logger.info(f"GET request with query params")
+        filter_data = request.get_json() or {}
+        character = filter_data.get('character', 'all')
+        opponent = filter_data.get('opponent', 'all')
+        opponent_character = filter_data.get('opponent_character', 'all')
+        stage = filter_data.get('stage', 'all')
+        limit = int(filter_data.get('limit', 100))
         
-        # Call the API service with all filter parameters
-        detailed_stats = services.process_detailed_player_data(
-            player_code, character, opponent, stage, limit, opponent_character
-        )
+        logger.info("POST request with filters: %s", filter_data)
         
-        return jsonify(detailed_stats)
+    else:
+        # GET responses are cacheable: skip the analysis if the client's copy is current
+        etag = _player_etag(player_code)
+        if etag and _client_copy_current(etag):
+            return _cacheable(current_app.response_class(status=304), etag)
         
-    except ValueError:
-        return jsonify({'error': 'Invalid player code format'}), 400
-    except Exception as e:
-        logger.error(f"Error fetching detailed player stats: {str(e)}")
-        return jsonify({'error': 'Failed to fetch detailed player statistics'}), 500
+        # GET: Get filters from query parameters (for direct URL access)
+        character = request.args.get('character', 'all')
+        opponent = request.args.get('opponent', 'all')
+        opponent_character = request.args.get('opponent_character', 'all')
+        stage = request.args.get('stage', 'all')
+        limit = int(request.args.get('limit', 100))
+        
+        logger.info("GET request with query params")
+    
+    # Call the API service with all filter parameters
+    detailed_stats = services.process_detailed_player_data(
+        player_code, character, opponent, stage, limit, opponent_character
+    )
+    
+    if request.method == 'POST':
+        return jsonify(detailed_stats)
+    return _cacheable(jsonify(detailed_stats), etag)
+
+@api_bp.route('/player/<ptag:player_code>/bundle', methods=['GET'])
+@rate_limited(config.RATE_LIMIT_API)
+@api_errors('Failed to fetch player bundle', invalid_input='Invalid player code format')
+def player_bundle(player_code):
+    """Basic stats, first page of games and detailed analysis in one request."""
+    etag = _player_etag(player_code)
+    if etag and _client_copy_current(etag):
+        return _cacheable(current_app.response_class(status=304), etag)
+    
+    bundle = services.process_player_bundle(player_code)
+    if bundle is None:
+        abort(404, description=f"Player '{player_code}' not found")
+    return _cacheable(jsonify(bundle), etag)
+
+def _player_etag(player_code):
+    """ETag for a player read request: the player's data version plus the URL, or None without games."""
+    data_version = services.get_player_data_version(player_code)
+    if data_version is None:
+        return None
+    return generate_etag(f"{getattr(config, 'APP_VERSION', '')}|{request.full_path}|{data_version}".encode())
+
+def _client_copy_current(etag, last_modified=None):
+    """True when the request's If-None-Match / If-Modified-Since say the client's copy is current."""
+    return not is_resource_modified(conditional_request_environ(), etag=etag, last_modified=last_modified)
+
+def _cacheable(response, etag, last_modified=None):
+    """Attach the ETag (and Last-Modified) and a short private Cache-Control to a read response."""
+    if etag:
+        response.set_etag(etag)
+        # Assigning None would stamp the current time rather than omit the header
+        if last_modified is not None:
+            response.last_modified = last_modified
+        response.cache_control.private = True
+        response.cache_control.max_age = API_CACHE_MAX_AGE
+    return response
 
 # =============================================================================
 # Client Registration Endpoints  
@@ -179,43 +285,34 @@ def client_registration():
 
 @api_bp.route('/clients/me', methods=['GET'])
 @require_api_key
+@api_errors('Failed to get client information')
 def get_my_client_info(client_id):
     """Get current client information."""
-    try:
-        client_info = services.get_client_details(client_id)
-        
-        if not client_info:
-            return jsonify({'error': 'Client not found'}), 404
-        
-        return jsonify({
-            'success': True,
-            'client': client_info
-        })
-        
-    except Exception as e:
-        logger.error(f"Error getting client info for {client_id}: {str(e)}")
-        return jsonify({'error': 'Failed to get client information'}), 500
+    client_info = services.get_client_details(client_id)
+    
+    if not client_info:
+        return jsonify({'error': 'Client not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'client': client_info
+    })
 
 @api_bp.route('/clients/me/refresh-key', methods=['POST'])
 @require_api_key
+@api_errors('Failed to refresh API key')
 def refresh_my_api_key(client_id):
     """Refresh API key for current client."""
-    try:
-        result = services.refresh_api_key(client_id)
-        
-        if result.get('success'):
-            return jsonify(result), 200
+    result = services.refresh_api_key(client_id)
+    
+    if result.get('success'):
+        return jsonify(result), 200
+    else:
+        error_type = result.get('error_type', 'unknown')
+        if error_type == 'client_not_found':
+            return jsonify(result), 404
         else:
-            error_type = result.get('error_type', 'unknown')
-            if error_type == 'client_not_found':
-                return jsonify(result), 404
-            else:
-                return jsonify(result), 500
-                
-    except Exception as e:
-        logger.error(f"Error refreshing API key for {client_id}: {str(e)}")
-        return jsonify({'error': 'Failed to refresh API key'}), 500
-
+            return jsonify(result), 500
 
 # =============================================================================
 # Data Upload Endpoints
@@ -224,6 +321,7 @@ def refresh_my_api_key(client_id):
 @api_bp.route('/games/upload', methods=['POST'])
 @require_api_key
 @rate_limited(config.RATE_LIMIT_UPLOADS)
+@api_errors('Internal server error', invalid_input=True)
 def games_upload(client_id):
     """
     Combined games and files upload endpoint.
@@ -232,21 +330,15 @@ def games_upload(client_id):
     - Legacy format: {"games": [...]}
     - Combined format: {"games": [...], "files": [...]}
     """
-    try:
-        upload_data = _validate_upload_request()
-        # FIXED: Use services.process_combined_upload
-        result = services.process_combined_upload(client_id, upload_data)
-        return jsonify(result)
-        
-    except (RequestEntityTooLarge, ValueError) as e:
-        return _handle_upload_error(e)
-    except Exception as e:
-        logger.error(f"Unexpected error in games upload: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+    upload_data = _validate_upload_request()
+    # FIXED: Use services.process_combined_upload
+    result = services.process_combined_upload(client_id, upload_data)
+    return jsonify(result)
 
 @api_bp.route('/files/upload', methods=['POST'])
 @require_api_key  
 @rate_limited(config.RATE_LIMIT_UPLOADS)
+@api_errors('Internal server error', invalid_input=True)
 def files_upload(client_id):
     """
     Files upload endpoint - delegates to combined upload.
@@ -254,25 +346,18 @@ def files_upload(client_id):
     This endpoint exists for API consistency but uses the same
     combined upload logic internally.
     """
-    try:
-        upload_data = _validate_upload_request()
-        
-        # Ensure files are present for files-only endpoint
-        if not upload_data.get('files'):
-            return jsonify({'error': 'No files provided'}), 400
-        
-        # Add empty games array if not present
-        upload_data.setdefault('games', [])
-        
-        # FIXED: Use services.process_combined_upload
-        result = services.process_combined_upload(client_id, upload_data)
-        return jsonify(result)
-        
-    except (RequestEntityTooLarge, ValueError) as e:
-        return _handle_upload_error(e)
-    except Exception as e:
-        logger.error(f"Unexpected error in files upload: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+    upload_data = _validate_upload_request()
+    
+    # Ensure files are present for files-only endpoint
+    if not upload_data.get('files'):
+        return jsonify({'error': 'No files provided'}), 400
+    
+    # Add empty games array if not present
+    upload_data.setdefault('games', [])
+    
+    # FIXED: Use services.process_combined_upload
+    result = services.process_combined_upload(client_id, upload_data)
+    return jsonify(result)
 
 # =============================================================================
 # File Management Endpoints
@@ -281,14 +366,26 @@ def files_upload(client_id):
 @api_bp.route('/files', methods=['GET'])
 @require_api_key
 @rate_limited(60)  # 60 requests per minute for file listing
+@api_errors('Failed to list files')
 def files_list(client_id):
-    """List files uploaded by the client."""
-    try:
-        files = services.get_client_files(client_id)
+    """
+    List files uploaded by the client.
+    
+    Polling clients that send If-None-Match / If-Modified-Since get a 304
+    without the list being fetched or serialized while it is unchanged.
+    """
+    etag = last_modified = None
+    files_version = services.get_client_files_version(client_id)
+    if files_version:
+        data_version, last_modified = files_version
+        etag = generate_etag(f"{getattr(config, 'APP_VERSION', '')}|{request.full_path}|{client_id}|{data_version}".encode())
+        if _client_copy_current(etag, last_modified):
+            return _cacheable(current_app.response_class(status=304), etag, last_modified)
+    
+    files = services.get_client_files(client_id)
+    if 'error' in files:
         return jsonify(files)
-    except Exception as e:
-        logger.error(f"Error listing files for client {client_id}: {str(e)}")
-        return jsonify({'error': 'Failed to list files'}), 500
+    return _cacheable(jsonify(files), etag, last_modified)
 
 # =============================================================================
 # Server Information Endpoints
@@ -296,14 +393,11 @@ def files_list(client_id):
 
 @api_bp.route('/server/stats', methods=['GET'])
 @rate_limited(30)  # 30 requests per minute for server stats
+@api_errors('Failed to fetch server statistics')
 def server_statistics():
     """Get server statistics and health information."""
-    try:
-        stats = services.process_server_statistics()
-        return jsonify(stats)
-    except Exception as e:
-        logger.error(f"Error fetching server statistics: {str(e)}")
-        return jsonify({'error': 'Failed to fetch server statistics'}), 500
+    stats = services.process_server_statistics()
+    return jsonify(stats)
 
 # =============================================================================
 # Helper Functions
@@ -314,17 +408,10 @@ def _validate_upload_request():
     if not request.is_json:
         raise ValueError('Content-Type must be application/json')
     
-    data = request.get_json()
+    # cache=False drops the raw body once it is parsed, so a large batch upload
+    # is held once (as parsed games) instead of as bytes plus parsed objects
+    data = request.get_json(cache=False)
     if not isinstance(data, dict):
         raise ValueError('Request data must be a JSON object')
     
-    return data
-
-def _handle_upload_error(error):
-    """Handle upload-specific errors."""
-    if isinstance(error, RequestEntityTooLarge):
-        return jsonify({'error': 'Upload too large'}), 413
-    elif isinstance(error, ValueError):
-        return jsonify({'error': str(error)}), 400
-    else:
-        return jsonify({'error': 'Upload error'}), 500
\ No newline at end of file
+    return data
\ No newline at end of file
@@ -6,10 +6,10 @@ Merged from web_routes.py and static_routes.py for simplicity.
 """
 
 import logging
-from flask import Blueprint, render_template, send_from_directory, abort, request
+from flask import Blueprint, render_template, send_from_directory, abort, request, current_app, make_response
 from backend.config import get_config
-from backend.utils import decode_player_tag
 import backend.services.web_service as web_service
+from backend.routes import conditional_request_environ
 
 # Create blueprint for web routes
 web_bp = Blueprint('web', __name__)
@@ -18,6 +18,31 @@ web_bp = Blueprint('web', __name__)
 config = get_config()
 logger = logging.getLogger('SlippiServer')
 
+ERROR_TEMPLATE = 'pages/error_status/error_status.html'
+
+# Browser/CDN cache lifetimes (seconds) for pages that don't depend on the visitor
+HOMEPAGE_MAX_AGE = getattr(config, 'HOMEPAGE_MAX_AGE', 60)
+STATIC_PAGE_MAX_AGE = getattr(config, 'STATIC_PAGE_MAX_AGE', 3600)
+
+@web_bp.record_once
+def _preload_error_template(state):
+    """Compile the error page at registration so error responses skip the template loader."""
+    if not state.app.config.get('TEMPLATES_AUTO_RELOAD'):
+        state.app.extensions['error_template'] = state.app.jinja_env.get_template(ERROR_TEMPLATE)
+
+def _public_page(html, max_age):
+    """Wrap rendered HTML in a publicly cacheable response that answers If-None-Match with 304."""
+    response = make_response(html)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    response.add_etag()
+    return response.make_conditional(conditional_request_environ())
+
+def _render_error_page(status_code, **context):
+    """Render the shared error page and return a (body, status) response tuple."""
+    template = current_app.extensions.get('error_template', ERROR_TEMPLATE)
+    return render_template(template, status_code=status_code, **context), status_code
+
 # =============================================================================
 # HTML Page Routes
 # =============================================================================
@@ -27,13 +52,12 @@ def homepage():
     """Homepage with server statistics and recent activity."""
     try:
         context_data = web_service.prepare_homepage_data()
-        return render_template('pages/index/index.html', **context_data)
+        return _public_page(render_template('pages/index/index.html', **context_data), HOMEPAGE_MAX_AGE)
     except Exception as e:
         logger.error(f"Error loading homepage: {str(e)}")
-        return render_template('pages/error_status/error_status.html',
-                              status_code=500,
-                              error_title="Server Error",
-                              error_description="Error loading homepage"), 500
+        return _render_error_page(500,
+                                  error_title="Server Error",
+                                  error_description="Error loading homepage")
 
 @web_bp.route('/players')
 def players_list():
@@ -43,57 +67,48 @@ def players_list():
         return render_template('pages/players/players.html', **context_data)
     except Exception as e:
         logger.error(f"Error loading players list: {str(e)}")
-        return render_template('pages/error_status/error_status.html',
-                              status_code=500,
-                              error_title="Server Error",
-                              error_description="Error loading players list"), 500
+        return _render_error_page(500,
+                                  error_title="Server Error",
+                                  error_description="Error loading players list")
 
-@web_bp.route('/player/<encoded_player_code>')
-def player_profile(encoded_player_code):
+@web_bp.route('/player/<ptag:player_code>')
+def player_profile(player_code):
     """Player profile page."""
     try:
-        player_code = decode_player_tag(encoded_player_code)
         context_data = web_service.process_player_profile_request(player_code)
         return render_template('pages/player_basic/player_basic.html', **context_data)
-    except ValueError:
-        return render_template('pages/error_status/error_status.html',
-                              status_code=400,
-                              error_title="Invalid Player Code",
-                              error_description="The player code format is invalid"), 400
     except Exception as e:
         logger.error(f"Error loading player profile: {str(e)}")
-        return render_template('pages/error_status/error_status.html',
-                              status_code=500,
-                              error_title="Server Error", 
-                              error_description="Error loading player profile"), 500
+        return _render_error_page(500,
+                                  error_title="Server Error",
+                                  error_description="Error loading player profile")
 
-@web_bp.route('/player/<encoded_player_code>/detailed')
-def player_detailed(encoded_player_code):
+@web_bp.route('/player/<ptag:player_code>/detailed')
+def player_detailed(player_code):
     """Detailed player analysis page."""
     try:
-        player_code = decode_player_tag(encoded_player_code)
-        
+        limit = int(request.args.get('limit', '100'))
+    except ValueError:
+        return _render_error_page(400,
+                                  error_title="Invalid Limit",
+                                  error_description="The limit parameter must be a whole number",
+                                  error_type="bad_request")
+    
+    try:
         # Get optional query parameters for filtering
         character = request.args.get('character', 'all')
         opponent = request.args.get('opponent', 'all')
         stage = request.args.get('stage', 'all')
-        limit = int(request.args.get('limit', '100'))
         
         context_data = web_service.process_player_detailed_request(
             player_code
         )
         return render_template('pages/player_detailed/player_detailed.html', **context_data)
-    except ValueError:
-        return render_template('pages/error_status/error_status.html',
-                              status_code=400,
-                              error_title="Invalid Player Code",
-                              error_description="The player code format is invalid"), 400
     except Exception as e:
         logger.error(f"Error loading detailed player analysis: {str(e)}")
-        return render_template('pages/error_status/error_status.html',
-                              status_code=500,
-                              error_title="Server Error",
-                              error_description="Error loading detailed analysis"), 500
+        return _render_error_page(500,
+                                  error_title="Server Error",
+                                  error_description="Error loading detailed analysis")
 
 @web_bp.route('/server/stats')
 def server_stats():
@@ -103,10 +118,9 @@ def server_stats():
         return render_template('pages/server_stats/server_stats.html', **context_data)
     except Exception as e:
         logger.error(f"Error loading server stats: {str(e)}")
-        return render_template('pages/error_status/error_status.html',
-                              status_code=500,
-                              error_title="Server Error",
-                              error_description="Error loading server statistics"), 500
+        return _render_error_page(500,
+                                  error_title="Server Error",
+                                  error_description="Error loading server statistics")
 
 @web_bp.route('/about')
 def about():
@@ -117,13 +131,12 @@ def about():
             'client_version': config.CLIENT_VERSION,
             'client_release_date': config.CLIENT_RELEASE_DATE
         }
-        return render_template('pages/about/about.html', **context_data)
+        return _public_page(render_template('pages/about/about.html', **context_data), STATIC_PAGE_MAX_AGE)
     except Exception as e:
         logger.error(f"Error loading about page: {str(e)}")
-        return render_template('pages/error_status/error_status.html',
-                              status_code=500,
-                              error_title="Server Error",
-                              error_description="Error loading about page"), 500
+        return _render_error_page(500,
+                                  error_title="Server Error",
+                                  error_description="Error loading about page")
 
 # =============================================================================
 # Client Download Routes (merged from static_routes.py)
@@ -139,13 +152,12 @@ def download_page():
             'download_url': '/download/SlippiMonitor.msi',
             'app_version': config.APP_VERSION
         }
-        return render_template('pages/download/download.html', **context_data)
+        return _public_page(render_template('pages/download/download.html', **context_data), STATIC_PAGE_MAX_AGE)
     except Exception as e:
         logger.error(f"Error loading download page: {str(e)}")
-        return render_template('pages/error_status/error_status.html',
-                              status_code=500,
-                              error_title="Server Error",
-                              error_description="Error loading download page"), 500
+        return _render_error_page(500,
+                                  error_title="Server Error",
+                                  error_description="Error loading download page")
 
 @web_bp.route('/download/<filename>')
 def download_file(filename):
@@ -165,16 +177,14 @@ def download_file(filename):
             as_attachment=True
         )
     except FileNotFoundError:
-        return render_template('pages/error_status/error_status.html',
-                              status_code=404,
-                              error_title="File Not Found",
-                              error_description=f"The file {filename} was not found"), 404
+        return _render_error_page(404,
+                                  error_title="File Not Found",
+                                  error_description=f"The file {filename} was not found")
     except Exception as e:
         logger.error(f"Error serving download file {filename}: {str(e)}")
-        return render_template('pages/error_status/error_status.html',
-                              status_code=500,
-                              error_title="Server Error",
-                              error_description="Error serving file"), 500
+        return _render_error_page(500,
+                                  error_title="Server Error",
+                                  error_description="Error serving file")
 
 # =============================================================================
 # File Serving Routes (for uploaded .slp files)
@@ -192,10 +202,9 @@ def serve_file(file_id):
         file_info = get_file_details(file_id, client_id=None)  # No auth for now
         
         if not file_info:
-            return render_template('pages/error_status/error_status.html',
-                                  status_code=404,
-                                  error_title="File Not Found",
-                                  error_description="The requested file was not found"), 404
+            return _render_error_page(404,
+                                      error_title="File Not Found",
+                                      error_description="The requested file was not found")
         
         # Serve file from uploads directory
         uploads_dir = config.get_uploads_dir()
@@ -210,10 +219,9 @@ def serve_file(file_id):
         
     except Exception as e:
         logger.error(f"Error serving file {file_id}: {str(e)}")
-        return render_template('pages/error_status/error_status.html',
-                              status_code=500,
-                              error_title="Server Error",
-                              error_description="Error serving file"), 500
+        return _render_error_page(500,
+                                  error_title="Server Error",
+                                  error_description="Error serving file")
 
 # =============================================================================
 # Error Handlers (moved from error_handlers.py for simplicity)
@@ -222,26 +230,23 @@ def serve_file(file_id):
 @web_bp.app_errorhandler(404)
 def page_not_found(error):
     """Handle 404 errors with custom page."""
-    return render_template('pages/error_status/error_status.html',
-                          status_code=404,
-                          error_title="Page Not Found",
-                          error_description="The page you're looking for doesn't exist.",
-                          error_type="not_found"), 404
+    return _render_error_page(404,
+                              error_title="Page Not Found",
+                              error_description="The page you're looking for doesn't exist.",
+                              error_type="not_found")
 
 @web_bp.app_errorhandler(403)
 def forbidden(error):
     """Handle 403 errors."""
-    return render_template('pages/error_status/error_status.html',
-                          status_code=403,
-                          error_title="Access Forbidden",
-                          error_description="You don't have permission to access this resource.",
-                          error_type="forbidden"), 403
+    return _render_error_page(403,
+                              error_title="Access Forbidden",
+                              error_description="You don't have permission to access this resource.",
+                              error_type="forbidden")
 
 @web_bp.app_errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
-    return render_template('pages/error_status/error_status.html',
-                          status_code=500,
-                          error_title="Internal Server Error",
-                          error_description="Something went wrong on our end.",
-                          error_type="server_error"), 500
\ No newline at end of file
+    return _render_error_page(500,
+                              error_title="Internal Server Error",
+                              error_description="Something went wrong on our end.",
+                              error_type="server_error")
\ No newline at end of file
@@ -36,6 +36,10 @@ __all__ = [
     # Existing API Service functions (keeping current exports)
     'process_detailed_player_data', 
     'process_player_basic_stats',
+    'process_player_bundle',
+    'get_player_data_version',
+    'get_client_files_version',
+    'record_rate_limited_request',
     
     # Existing Web Service functions  
     'prepare_homepage_data',
@@ -6,20 +6,37 @@ Updated to use the new backend/db/ layer instead of backend.database
 """
 
 import logging
-import json
+import threading
+import time
 import uuid
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timezone
+from flask import request, has_request_context
 
 # NEW: Use the simplified db layer
-from backend.db import execute_query, connection, sql_manager
+from backend.db import execute_query, iter_query, connection, sql_manager
 from backend.utils import (
-    process_raw_games_for_player
+    process_player_game_rows, json_loads
 )
 from backend.config import get_config
 
 config = get_config()
 logger = logging.getLogger('SlippiServer')
 
+# Games returned as recent_games by the detailed analysis
+ANALYSIS_RECENT_GAMES = 20
+
+# In-process cache of detailed analyses:
+# (player_code, filter values) -> (summary_version, (analysis, filter_options), cached_at)
+DETAILED_STATS_CACHE_TTL = getattr(config, 'DETAILED_STATS_CACHE_TTL', 300)  # seconds
+DETAILED_STATS_CACHE_MAXSIZE = getattr(config, 'DETAILED_STATS_CACHE_MAXSIZE', 1000)
+_detailed_stats_cache = OrderedDict()
+_detailed_stats_cache_lock = threading.RLock()
+
+# Minute whose stale rate_limits rows this process last purged
+_rate_limits_purged_window = None
+_rate_limits_purge_lock = threading.Lock()
+
 
 def process_server_statistics():
     """Get server statistics for API response."""
@@ -57,59 +74,133 @@ def process_player_basic_stats(player_code):
         return None
     
     try:
-        # Get games with correct SQL parameters
-        games = execute_query('games', 'select_by_player', (player_code,))
+        # One primary-key probe on player_summary answers both "does this
+        # player exist" and the totals - no game rows loaded or parsed
+        summary = _player_summary(player_code)
         
-        if not games:
+        if not summary or not summary['total_games']:
             return None
         
-        processed_games = process_raw_games_for_player(games, player_code)
-        
-        if not processed_games:
-            return None
-        
-        # Calculate basic statistics
-        total_games = len(processed_games)
-        wins = len([g for g in processed_games if g.get('result') == 'Win'])
-        win_rate_decimal = wins / total_games if total_games > 0 else 0
-        
-        return {
-            'player_code': player_code,
-            'total_games': total_games,
-            'wins': wins,
-            'losses': total_games - wins,
-            'win_rate': win_rate_decimal * 100,  # As percentage for display
-            'overall_winrate': win_rate_decimal  # As decimal for calculations
-        }
+        return _basic_stats_from_summary(player_code, summary)
         
     except Exception as e:
         logger.error(f"Error getting basic stats for {player_code}: {str(e)}")
         return None
 
 
+def _basic_stats_from_summary(player_code, summary):
+    """Shape a player_summary row as the basic stats API response."""
+    total_games = summary['total_games']
+    wins = summary['wins']
+    win_rate_decimal = wins / total_games if total_games > 0 else 0
+    
+    return {
+        'player_code': player_code,
+        'total_games': total_games,
+        'wins': wins,
+        'losses': total_games - wins,
+        'win_rate': win_rate_decimal * 100,  # As percentage for display
+        'overall_winrate': win_rate_decimal  # As decimal for calculations
+    }
+
+
+def process_player_bundle(player_code, per_page=20):
+    """
+    Basic stats, the first page of games and the unfiltered detailed analysis in one response.
+    
+    Saves clients that open a player the three round trips to /stats, the games
+    list and /detailed. The player_summary row is read once and shared by the
+    stats and the pagination totals; the detailed analysis comes from its cache
+    when the player's data hasn't changed.
+    
+    Returns:
+        dict: {'stats', 'games_page1', 'detailed'}, or None for unknown players
+    """
+    if not player_code:
+        return None
+    
+    summary = _player_summary(player_code)
+    if not summary or not summary['total_games']:
+        return None
+    
+    total = summary['total_games']
+    games = execute_query('player_games', 'select_by_player_page', (player_code, per_page, 0))
+    
+    return {
+        'stats': _basic_stats_from_summary(player_code, summary),
+        'games_page1': {
+            'games': process_player_game_rows(games),
+            'page': 1,
+            'per_page': per_page,
+            'total': total,
+            'total_pages': (total + per_page - 1) // per_page
+        },
+        'detailed': process_detailed_player_data(player_code)
+    }
+
+
 def validate_api_key(api_key):
-    """Validate API key and return client info."""
+    """Validate API key and return client info (uses the client domain's key cache)."""
     if not api_key:
         return None
     
     try:
-        result = execute_query('api_keys', 'select_by_key', (api_key,), fetch_one=True)
+        from backend.services.client.processors import validate_existing_api_key
         
-        if not result:
+        api_key_data = validate_existing_api_key(api_key)
+        if not api_key_data:
             return None
         
-        # Check if key is expired
-        if result.get('expires_at'):
-            expires_at = datetime.fromisoformat(result['expires_at'])
-            if datetime.now() > expires_at:
-                return None
-        
-        return result
+        return {
+            'client_id': api_key_data.client_id,
+            'expires_at': api_key_data.expires_at
+        }
     except Exception as e:
         logger.error(f"Error validating API key: {str(e)}")
         return None
 
 
+def record_rate_limited_request(bucket, window_start, max_requests):
+    """
+    Count one request against a shared rate-limit bucket.
+    
+    The count lives in the rate_limits table so every worker process sees the
+    same total. Like the per-process window, a full bucket rejects the request
+    without counting it. Each process also drops finished windows once per minute.
+    
+    Args:
+        bucket (str): Endpoint and client the limit applies to
+        window_start (int): Current minute since the epoch
+        max_requests (int): Requests allowed in the bucket per minute
+    
+    Returns:
+        bool: True if the request was counted, False if the bucket is full
+    """
+    global _rate_limits_purged_window
+    with _rate_limits_purge_lock:
+        purge = _rate_limits_purged_window != window_start
+        _rate_limits_purged_window = window_start
+    
+    # Runs on the request's own connection, so the limiter never competes for a
+    # second pool slot. The check happens before the view body, so releasing the
+    # outermost savepoint commits only the count
+    with connection.get_connection() as conn:
+        conn.execute("SAVEPOINT rate_limit")
+        try:
+            if purge:
+                conn.execute(sql_manager.get_query('rate_limits', 'delete_stale'), (window_start,))
+            # RETURNING yields no row when the bucket was already full; fetchall
+            # finishes the statement before the savepoint is released
+            query = sql_manager.get_query('rate_limits', 'record_request')
+            admitted = bool(conn.execute(query, (bucket, window_start, max_requests)).fetchall())
+        except Exception:
+            conn.execute("ROLLBACK TO SAVEPOINT rate_limit")
+            conn.execute("RELEASE SAVEPOINT rate_limit")
+            raise
+        conn.execute("RELEASE SAVEPOINT rate_limit")
+        return admitted
+
+
 def process_client_registration(client_data, registration_key):
     """Process client registration request."""
     try:
@@ -139,7 +230,8 @@ def register_or_update_client(client_data):
         # Check if client exists
         existing = execute_query('clients', 'select_by_id', (client_id,), fetch_one=True)
         
-        with connection.get_connection() as conn:
+        # The inner "with conn" commits the write, or rolls it back on error
+        with connection.get_connection() as conn, conn:
             cursor = conn.cursor()
             
             if existing:
@@ -151,8 +243,6 @@ def register_or_update_client(client_data):
                 query = sql_manager.get_query('clients', 'insert_client')
                 cursor.execute(query, (client_id, hostname, platform, version, 
                                      datetime.now().isoformat(), datetime.now().isoformat()))
-            
-            conn.commit()
         
         return {
             'client_id': client_id,
@@ -169,125 +259,35 @@ def get_player_detailed_stats(player_code, filters=None):
         return None
     
     try:
-        # Get games with correct SQL parameters
-        games = execute_query('games', 'select_by_player', (player_code,))
-        
-        if not games:
-            return None
-        
-        processed_games = process_raw_games_for_player(games, player_code)
-        
-        # Apply filters if provided
-        if filters:
-            processed_games = apply_game_filters(processed_games, filters)
-        
-        if not processed_games:
-            return None
-        
-        # Calculate detailed statistics
-        total_games = len(processed_games)
-        wins = len([g for g in processed_games if g.get('result') == 'Win'])
-        win_rate_decimal = wins / total_games if total_games > 0 else 0
-        
-        # Character breakdown
-        character_stats = {}
-        opponent_stats = {}
-        stage_stats = {}
-        date_stats = {}
-        opponent_character_stats = {}  # FIXED: Added this missing variable
-        
-        for game in processed_games:
-            # FIXED: Character stats - access nested player data
-            char = game.get('player', {}).get('character_name', 'Unknown')
-            if char not in character_stats:
-                character_stats[char] = {'games': 0, 'wins': 0}
-            character_stats[char]['games'] += 1
-            if game.get('result') == 'Win':
-                character_stats[char]['wins'] += 1
+        if filters and _needs_game_level_filters(filters):
+            # Result/date filters are applied to the built games by apply_game_filters
+            games = iter_query('player_games', 'select_by_player', (player_code,))
+            processed_games = apply_game_filters(process_player_game_rows(games), filters)
             
-            # FIXED: Opponent stats - access nested opponent data
-            opp = game.get('opponent', {}).get('player_tag', 'Unknown')
-            if opp not in opponent_stats:
-                opponent_stats[opp] = {'games': 0, 'wins': 0}
-            opponent_stats[opp]['games'] += 1
-            if game.get('result') == 'Win':
-                opponent_stats[opp]['wins'] += 1
+            if not processed_games:
+                return None
             
-            # Stage stats
-            stage = game.get('stage_id', 'Unknown')
-            if stage not in stage_stats:
-                stage_stats[stage] = {'games': 0, 'wins': 0}
-            stage_stats[stage]['games'] += 1
-            if game.get('result') == 'Win':
-                stage_stats[stage]['wins'] += 1
+            # Calculate detailed statistics in a single pass
+            total_games = len(processed_games)
+            wins, breakdowns = _aggregate_game_breakdowns(processed_games)
+            recent_games = processed_games[:ANALYSIS_RECENT_GAMES]
+        else:
+            # Column filters and the breakdowns run in SQLite over player_games
+            sql_filters = {**(filters or {}), 'player_code': player_code}
+            total_games, wins, breakdowns = _grouped_player_breakdowns(sql_filters)
             
-            # FIXED: Opponent character stats - access nested opponent data
-            opp_char = game.get('opponent', {}).get('character_name', 'Unknown')
-            if opp_char not in opponent_character_stats:
-                opponent_character_stats[opp_char] = {'games': 0, 'wins': 0}
-            opponent_character_stats[opp_char]['games'] += 1
-            if game.get('result') == 'Win':
-                opponent_character_stats[opp_char]['wins'] += 1
+            if not total_games:
+                return None
             
-            # Date stats for win rate over time
-            try:
-                game_date = game.get('start_time', '')[:10]  # Get YYYY-MM-DD
-                if game_date:
-                    if game_date not in date_stats:
-                        date_stats[game_date] = {'games': 0, 'wins': 0}
-                    date_stats[game_date]['games'] += 1
-                    if game.get('result') == 'Win':
-                        date_stats[game_date]['wins'] += 1
-            except:
-                pass  # Skip invalid dates
-        
-        # Calculate win rates and convert to frontend format
-        character_breakdown_frontend = {}
-        for char, stats in character_stats.items():
-            win_rate = (stats['wins'] / stats['games']) if stats['games'] > 0 else 0
-            character_breakdown_frontend[char] = {
-                'games': stats['games'],
-                'wins': stats['wins'],
-                'win_rate': win_rate  # As decimal for frontend
-            }
-        
-        opponent_breakdown_frontend = {}
-        for opp, stats in opponent_stats.items():
-            win_rate = (stats['wins'] / stats['games']) if stats['games'] > 0 else 0
-            opponent_breakdown_frontend[opp] = {
-                'games': stats['games'],
-                'wins': stats['wins'],
-                'win_rate': win_rate  # As decimal for frontend
-            }
-        
-        stage_breakdown_frontend = {}
-        for stage, stats in stage_stats.items():
-            win_rate = (stats['wins'] / stats['games']) if stats['games'] > 0 else 0
-            stage_breakdown_frontend[stage] = {
-                'games': stats['games'],
-                'wins': stats['wins'],
-                'win_rate': win_rate  # As decimal for frontend
-            }
+            recent_games = _recent_filtered_games(sql_filters)
         
-        # FIXED: Process opponent character stats for frontend (this was missing!)
-        opponent_character_breakdown_frontend = {}
-        for opp_char, stats in opponent_character_stats.items():
-            win_rate = (stats['wins'] / stats['games']) if stats['games'] > 0 else 0
-            opponent_character_breakdown_frontend[opp_char] = {
-                'games': stats['games'],
-                'wins': stats['wins'],
-                'win_rate': win_rate  # As decimal for frontend
-            }
+        win_rate_decimal = wins / total_games if total_games > 0 else 0
         
-        # Process date stats for time chart
-        date_breakdown_frontend = {}
-        for date, stats in date_stats.items():
-            win_rate = (stats['wins'] / stats['games']) if stats['games'] > 0 else 0
-            date_breakdown_frontend[date] = {
-                'games': stats['games'],
-                'wins': stats['wins'],
-                'win_rate': win_rate  # As decimal for frontend
-            }
+        character_breakdown_frontend = breakdowns['character_stats']
+        opponent_breakdown_frontend = breakdowns['opponent_stats']
+        stage_breakdown_frontend = breakdowns['stage_stats']
+        opponent_character_breakdown_frontend = breakdowns['opponent_character_stats']
+        date_breakdown_frontend = breakdowns['date_stats']
         
         # FIXED: Return data in format that frontend expects
         return {
@@ -312,7 +312,7 @@ def get_player_detailed_stats(player_code, filters=None):
             'opponent_breakdown': opponent_breakdown_frontend,
             'stage_breakdown': stage_breakdown_frontend,
             
-            'recent_games': processed_games[:20],  # Latest 20 games
+            'recent_games': recent_games,  # Latest 20 games
             'filters_applied': filters or {}
         }
         
@@ -349,29 +349,31 @@ def process_detailed_player_data(player_code, character='all', opponent='all', s
         }
     """
     try:
-        logger.info(f"🔍 Processing detailed player data for: {player_code}")
-        logger.info(f"   📊 Filters - Character: {character}, Opponent: {opponent}, OpponentChar: {opponent_character}, Stage: {stage}, Limit: {limit}")
+        logger.info("🔍 Processing detailed player data for: %s", player_code)
+        logger.info("   📊 Filters - Character: %s, Opponent: %s, OpponentChar: %s, Stage: %s, Limit: %s", character, opponent, opponent_character, stage, limit)
         
         # Validate input parameters
         validated_data = _validate_detailed_player_inputs(player_code, character, opponent, stage, limit, opponent_character)
         
-        # Get base player data
-        player_games = _get_player_games_for_analysis(validated_data['player_code'])
+        # player_summary changes whenever one of the player's games is ingested
+        # (in any worker), so a cached analysis is only reused while it matches
+        cache_key = _detailed_stats_cache_key(validated_data)
+        summary_version = _player_summary_version(validated_data['player_code'])
+        cached = _get_cached_detailed_analysis(cache_key, summary_version)
         
-        # Apply all filters including opponent_character
-        filtered_games = _apply_comprehensive_filters(
-            player_games, 
-            validated_data['character'], 
-            validated_data['opponent'], 
-            validated_data['stage'],
-            validated_data['opponent_character']  # NEW: Include opponent character filter
-        )
+        if cached is None:
+            # Filters (including opponent_character) and breakdowns run in SQLite,
+            # so only the recent games shown are built in Python
+            cached = (
+                _calculate_comprehensive_analysis(validated_data),
+                _generate_filter_options(validated_data['player_code'])
+            )
+            _cache_detailed_analysis(cache_key, summary_version, cached)
         
-        # Limit results
-        limited_games = filtered_games[:validated_data['limit']]
+        cached_analysis, filter_options = cached
         
-        # Calculate comprehensive statistics
-        analysis_result = _calculate_comprehensive_analysis(filtered_games, player_code)
+        # Shallow copy so the per-request metadata never lands in the cached dict
+        analysis_result = dict(cached_analysis)
         
         # Add filter metadata for frontend
         analysis_result['applied_filters'] = {
@@ -383,7 +385,7 @@ def process_detailed_player_data(player_code, character='all', opponent='all', s
         }
         
         # Add filter options for frontend dropdowns/checkboxes
-        analysis_result['filter_options'] = _generate_filter_options(player_games)
+        analysis_result['filter_options'] = filter_options
         
         return analysis_result
         
@@ -411,109 +413,142 @@ def _validate_detailed_player_inputs(player_code, character, opponent, stage, li
         'opponent_character': opponent_character or 'all'  # NEW: Include opponent character
     }
 
-def _apply_comprehensive_filters(games, character_filter, opponent_filter, stage_filter, opponent_character_filter):
+# Detailed-view filter -> player_games expression it matches. NULLs read as 'Unknown'
+# and stage ids as text, the same values the processed game records expose
+_DETAILED_FILTER_COLUMNS = (
+    ('character', "COALESCE(character_name, 'Unknown')"),
+    ('opponent', "COALESCE(opponent_tag, 'Unknown')"),
+    ('opponent_character', "COALESCE(opponent_char, 'Unknown')"),
+    ('stage', "CAST(stage_id AS TEXT)"),
+)
+
+def _build_detailed_filter_clause(filters):
     """
-    Apply all filters to the game list.
+    Turn detailed-view filters into a SQL fragment and its parameters.
     
-    FIXED: Use correct data structure for character access.
+    'all' (or empty) adds no predicate, a list becomes IN (...) and any other
+    value an equality. Only ? placeholders are generated, never filter values.
+    """
+    clauses = []
+    params = []
+    for filter_name, expression in _DETAILED_FILTER_COLUMNS:
+        filter_value = filters.get(filter_name)
+        if not filter_value or filter_value == 'all':
+            continue
+        if isinstance(filter_value, list):
+            clauses.append(f"{expression} IN ({', '.join('?' * len(filter_value))})")
+            params.extend(filter_value)
+        else:
+            clauses.append(f"{expression} = ?")
+            params.append(filter_value)
+    
+    return ''.join(f"\n  AND {clause}" for clause in clauses), params
+
+def _detailed_stats_cache_key(filters):
+    """Hashable cache key for validated detailed-view filters (lists become tuples)."""
+    return (filters['player_code'],) + tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (filters.get(filter_name) for filter_name, _ in _DETAILED_FILTER_COLUMNS)
+    )
+
+def _player_summary(player_code):
     """
-    filtered_games = games
-    initial_count = len(filtered_games)
-    
-    logger.info(f"   📊 Starting with {initial_count} games, applying filters...")
-    
-    # FILTER 1: Player Character - FIXED data access
-    if character_filter and character_filter != 'all':
-        before_count = len(filtered_games)
-        filtered_games = [
-            g for g in filtered_games 
-            if filter_matches(character_filter, g.get('player', {}).get('character_name', 'Unknown'), 'character')
-        ]
-        after_count = len(filtered_games)
-        logger.info(f"   📊 Character filter: {before_count} → {after_count} games ({character_filter})")
-    
-    # FILTER 2: Opponent Tag  
-    if opponent_filter and opponent_filter != 'all':
-        before_count = len(filtered_games)
-        filtered_games = [
-            g for g in filtered_games 
-            if filter_matches(opponent_filter, g.get('opponent', {}).get('player_tag', 'Unknown'), 'opponent_tag')
-        ]
-        after_count = len(filtered_games)
-        logger.info(f"   📊 Opponent filter: {before_count} → {after_count} games ({opponent_filter})")
-    
-    # FILTER 3: Opponent Character
-    if opponent_character_filter and opponent_character_filter != 'all':
-        before_count = len(filtered_games)
-        filtered_games = [
-            g for g in filtered_games 
-            if filter_matches(opponent_character_filter, g.get('opponent', {}).get('character_name', 'Unknown'), 'opponent_char')
-        ]
-        after_count = len(filtered_games)
-        logger.info(f"   📊 Opponent character filter: {before_count} → {after_count} games ({opponent_character_filter})")
-    
-    # FILTER 4: Stage
-    if stage_filter and stage_filter != 'all':
-        before_count = len(filtered_games)
-        filtered_games = [
-            g for g in filtered_games 
-            if filter_matches(stage_filter, str(g.get('stage_id', 'Unknown')), 'stage')
-        ]
-        after_count = len(filtered_games)
-        logger.info(f"   📊 Stage filter: {before_count} → {after_count} games ({stage_filter})")
+    The player's player_summary row, read at most once per request.
     
-    final_count = len(filtered_games)
-    logger.info(f"   ✅ Final result: {initial_count} → {final_count} games after all filters")
+    A read endpoint computes its ETag from this row and then the handler
+    reads it again (three times for the bundle); within a request those
+    reads now share one query. Outside a request it is simply queried.
     
-    return filtered_games
-
-def _generate_filter_options(all_games):
+    The memo lives in the request's WSGI environ rather than on flask.g: an app
+    context (and so g) can outlive a request, e.g. when tests or scripts push
+    one around several requests, and must not serve a stale row to the next.
     """
-    Generate filter options for frontend dropdowns/checkboxes.
+    if not has_request_context():
+        return execute_query('player_summary', 'select_by_tag', (player_code,), fetch_one=True)
     
-    FIXED: Use correct data structure for character access.
+    summaries = request.environ.setdefault('slippi.player_summaries', {})
+    if player_code not in summaries:
+        summaries[player_code] = execute_query('player_summary', 'select_by_tag', (player_code,), fetch_one=True)
+    return summaries[player_code]
+
+def _player_summary_version(player_code):
+    """The player's (total_games, last_game) from player_summary, or None without games."""
+    summary = _player_summary(player_code)
+    return (summary['total_games'], summary['last_game']) if summary else None
+
+def get_player_data_version(player_code):
     """
-    characters = set()
-    opponents = set()
-    opponent_characters = set()
-    stages = set()
+    Token that changes whenever one of the player's games is ingested.
     
-    for game in all_games:
-        # FIXED: Player characters - use correct nested structure
-        char = game.get('player', {}).get('character_name')
-        if char and char != 'Unknown':
-            characters.add(char)
-        
-        # Opponent info
-        opponent = game.get('opponent', {})
-        opp_tag = opponent.get('player_tag')
-        if opp_tag and opp_tag != 'Unknown':
-            opponents.add(opp_tag)
+    Read endpoints use it to answer conditional requests (ETag) without
+    recomputing anything. Returns None for players without games.
+    """
+    summary_version = _player_summary_version(player_code)
+    return '{}-{}'.format(*summary_version) if summary_version else None
+
+def _get_cached_detailed_analysis(cache_key, summary_version):
+    """Return cached (analysis, filter_options) if fresh and at summary_version, evicting it otherwise."""
+    with _detailed_stats_cache_lock:
+        entry = _detailed_stats_cache.get(cache_key)
+        if entry is None:
+            return None
         
-        # FIXED: Opponent characters - use correct nested structure
-        opp_char = opponent.get('character_name')
-        if opp_char and opp_char != 'Unknown':
-            opponent_characters.add(opp_char)
+        cached_version, analysis, cached_at = entry
+        if cached_version != summary_version or time.monotonic() - cached_at > DETAILED_STATS_CACHE_TTL:
+            del _detailed_stats_cache[cache_key]
+            return None
         
-        # Stages
-        stage = game.get('stage_name', game.get('stage_id'))
-        if stage and stage != 'Unknown':
-            stages.add(str(stage))
+        _detailed_stats_cache.move_to_end(cache_key)
+        return analysis
+
+def _cache_detailed_analysis(cache_key, summary_version, analysis):
+    """Store (analysis, filter_options), evicting the least recently used entry when full."""
+    with _detailed_stats_cache_lock:
+        _detailed_stats_cache[cache_key] = (summary_version, analysis, time.monotonic())
+        _detailed_stats_cache.move_to_end(cache_key)
+        if len(_detailed_stats_cache) > DETAILED_STATS_CACHE_MAXSIZE:
+            _detailed_stats_cache.popitem(last=False)
+
+def _query_filtered_player_games(query_name, filters, extra_params=()):
+    """Run a player_games query whose {filters} placeholder takes the detailed-view filters."""
+    filter_clause, filter_params = _build_detailed_filter_clause(filters)
+    query = sql_manager.format_query('player_games', query_name, filters=filter_clause)
     
-    return {
-        'characters': sorted(list(characters)),
-        'opponents': sorted(list(opponents)),
-        'opponent_characters': sorted(list(opponent_characters)),
-        'stages': sorted(list(stages))
+    with connection.get_connection() as conn:
+        return conn.execute(query, (filters['player_code'], *filter_params, *extra_params)).fetchall()
+
+def _generate_filter_options(player_code):
+    """
+    Generate filter options for frontend dropdowns/checkboxes.
+    
+    The distinct values are projected straight from player_games columns,
+    so no game records are built just to collect them.
+    """
+    filter_options = {
+        'characters': [],
+        'opponents': [],
+        'opponent_characters': [],
+        'stages': []
     }
+    
+    # Rows arrive sorted by option, then value
+    for row in execute_query('player_games', 'filter_options', (player_code,)):
+        filter_options[row['option']].append(row['value'])
+    
+    return filter_options
 
 
-def process_paginated_player_games(player_code, page=1, per_page=20):
-    """Get paginated games for a player."""
+def process_paginated_player_games(player_code, page=1, per_page=20, character=None):
+    """Get paginated games for a player, optionally only those played as one character."""
     try:
-        games = execute_query('games', 'select_by_player', (player_code,))
-        
-        if not games:
+        # Totals come from player_summary (or an indexed count for one character),
+        # so only the requested page is loaded
+        if character:
+            summary = execute_query('player_games', 'count_by_player_character', (player_code, character), fetch_one=True)
+        else:
+            summary = _player_summary(player_code)
+        
+        if not summary or not summary['total_games']:
             return {
                 'games': [],
                 'page': page,
@@ -522,16 +557,17 @@ def process_paginated_player_games(player_code, page=1, per_page=20):
                 'total_pages': 0
             }
         
-        # Process games
-        processed_games = process_raw_games_for_player(games, player_code)
-        
         # Calculate pagination
-        total = len(processed_games)
+        total = summary['total_games']
         total_pages = (total + per_page - 1) // per_page  # Ceiling division
         start = (page - 1) * per_page
-        end = start + per_page
         
-        paginated_games = processed_games[start:end]
+        if character:
+            games = execute_query('player_games', 'select_by_player_character_page',
+                                  (player_code, character, per_page, max(start, 0)))
+        else:
+            games = execute_query('player_games', 'select_by_player_page', (player_code, per_page, max(start, 0)))
+        paginated_games = process_player_game_rows(games)
         
         return {
             'games': paginated_games,
@@ -567,7 +603,7 @@ def get_client_files(client_id, limit=50):
                 'original_filename': file_record['original_filename'],
                 'file_size': file_record['file_size'],
                 'upload_date': file_record['upload_date'],
-                'metadata': json.loads(file_record['metadata']) if file_record.get('metadata') else {}
+                'metadata': json_loads(file_record['metadata']) if file_record.get('metadata') else {}
             })
         
         return {
@@ -579,6 +615,27 @@ def get_client_files(client_id, limit=50):
         return {'error': str(e)}
 
 
+def get_client_files_version(client_id):
+    """
+    (version token, last upload time) for a client's file list, or None without files.
+    
+    The token covers the file count as well as the newest upload, so deletions
+    change it too. Both come from one lookup on idx_files_client_upload. The
+    upload time is None when upload_date isn't a parseable isoformat string
+    (legacy or imported rows); the token still works on its own.
+    """
+    row = execute_query('files', 'select_client_version', (client_id,), fetch_one=True)
+    if not row or not row['file_count']:
+        return None
+    
+    # upload_date is a naive local-time isoformat string
+    try:
+        last_modified = datetime.fromisoformat(row['last_upload']).astimezone(timezone.utc)
+    except (ValueError, TypeError):
+        last_modified = None
+    return f"{row['file_count']}-{row['last_upload']}", last_modified
+
+
 def get_file_details(file_id, client_id):
     """Get details about a specific file."""
     try:
@@ -597,7 +654,7 @@ def get_file_details(file_id, client_id):
             'original_filename': file_record['original_filename'],
             'file_size': file_record['file_size'],
             'upload_date': file_record['upload_date'],
-            'metadata': json.loads(file_record['metadata']) if file_record.get('metadata') else {}
+            'metadata': json_loads(file_record['metadata']) if file_record.get('metadata') else {}
         }
     except Exception as e:
         logger.error(f"Error getting file details for {file_id}: {str(e)}")
@@ -633,7 +690,7 @@ def apply_game_filters(games, filters):
     Apply filters to a list of processed games using AND logic.
     
     FIXED: Use correct data structure for character access.
-    The games come from process_raw_games_for_player which creates nested structure.
+    The games come from process_player_game_rows which creates nested structure.
     
     Args:
         games (list): List of processed game dictionaries
@@ -646,92 +703,26 @@ def apply_game_filters(games, filters):
         logger.info("No games or no filters provided")
         return games
     
-    logger.info(f"🔍 Starting filter process with {len(games)} games")
-    logger.info(f"🔍 Filters received: {filters}")
+    logger.info("🔍 Starting filter process with %s games", len(games))
+    logger.info("🔍 Filters received: %s", filters)
     
     # Debug: Log the structure of the first game to understand data format
     if games:
-        logger.info(f"🔍 Sample game structure: {games[0]}")
+        logger.debug("🔍 Sample game structure: %s", games[0])
     
-    filtered_games = games
-    original_count = len(filtered_games)
+    original_count = len(games)
     
-    # Helper function to check if filter matches
-    def filter_matches(filter_value, actual_value, filter_name="unknown"):
-        if filter_value == 'all':
-            return True
-        if isinstance(filter_value, list):
-            matches = actual_value in filter_value
-            if not matches:
-                logger.debug(f"   ❌ {filter_name}: '{actual_value}' not in {filter_value[:3]}...")
-            return matches
-        matches = actual_value == filter_value
-        if not matches:
-            logger.debug(f"   ❌ {filter_name}: '{actual_value}' != '{filter_value}'")
-        return matches
+    # Each filter becomes a set of accepted values (None when inactive), so the
+    # games are scanned once with O(1) membership tests instead of once per filter
+    character_set = _filter_value_set(filters.get('character'))
+    opponent_set = _filter_value_set(filters.get('opponent'))
+    opponent_char_set = _filter_value_set(filters.get('opponent_character'))
+    stage_set = _filter_value_set(filters.get('stage'))
+    result_set = _filter_value_set(filters.get('result'))
     
-    # FILTER 1: Player Character - FIXED to use correct nested structure
-    character_filter = filters.get('character')
-    if character_filter and character_filter != 'all':
-        before_count = len(filtered_games)
-        filtered_games = [
-            g for g in filtered_games 
-            if filter_matches(character_filter, g.get('player', {}).get('character_name', 'Unknown'), 'player_char')
-        ]
-        after_count = len(filtered_games)
-        logger.info(f"   📊 Character filter: {before_count} → {after_count} games ({character_filter})")
-    
-    # FILTER 2: Opponent Tag  
-    opponent_filter = filters.get('opponent')
-    if opponent_filter and opponent_filter != 'all':
-        before_count = len(filtered_games)
-        filtered_games = [
-            g for g in filtered_games 
-            if filter_matches(opponent_filter, g.get('opponent', {}).get('player_tag', 'Unknown'), 'opponent_tag')
-        ]
-        after_count = len(filtered_games)
-        logger.info(f"   📊 Opponent filter: {before_count} → {after_count} games ({len(opponent_filter) if isinstance(opponent_filter, list) else opponent_filter} opponents)")
-    
-    # FILTER 3: Opponent Character
-    opponent_char_filter = filters.get('opponent_character')
-    if opponent_char_filter and opponent_char_filter != 'all':
-        before_count = len(filtered_games)
-        filtered_games = [
-            g for g in filtered_games 
-            if filter_matches(opponent_char_filter, g.get('opponent', {}).get('character_name', 'Unknown'), 'opponent_char')
-        ]
-        after_count = len(filtered_games)
-        logger.info(f"   📊 Opponent character filter: {before_count} → {after_count} games ({opponent_char_filter})")
-    
-    # FILTER 4: Stage (if implemented)
-    stage_filter = filters.get('stage')
-    if stage_filter and stage_filter != 'all':
-        before_count = len(filtered_games)
-        filtered_games = [
-            g for g in filtered_games 
-            if filter_matches(stage_filter, str(g.get('stage_id', 'Unknown')), 'stage')
-        ]
-        after_count = len(filtered_games)
-        logger.info(f"   📊 Stage filter: {before_count} → {after_count} games ({stage_filter})")
-    
-    # FILTER 5: Result (Win/Loss)
-    result_filter = filters.get('result')
-    if result_filter and result_filter != 'all':
-        before_count = len(filtered_games)
-        filtered_games = [
-            g for g in filtered_games 
-            if filter_matches(result_filter, g.get('result', 'Unknown'), 'result')
-        ]
-        after_count = len(filtered_games)
-        logger.info(f"   📊 Result filter: {before_count} → {after_count} games ({result_filter})")
-    
-    # FILTER 6: Date range (unchanged)
+    date_from = None
+    date_to = None
     if filters.get('date_from') or filters.get('date_to'):
-        from datetime import datetime
-        
-        date_from = None
-        date_to = None
-        
         try:
             if filters.get('date_from'):
                 date_from = datetime.fromisoformat(filters['date_from'])
@@ -739,140 +730,103 @@ def apply_game_filters(games, filters):
                 date_to = datetime.fromisoformat(filters['date_to'])
         except ValueError:
             logger.warning(f"Invalid date format in filters: {filters}")
-        
-        if date_from or date_to:
-            before_count = len(filtered_games)
-            date_filtered = []
-            for game in filtered_games:
-                try:
-                    game_date = datetime.fromisoformat(game.get('start_time', '').replace('Z', '+00:00'))
-                    
-                    if date_from and game_date < date_from:
-                        continue
-                    if date_to and game_date > date_to:
-                        continue
-                    
-                    date_filtered.append(game)
-                except ValueError:
-                    # Skip games with invalid dates
-                    continue
-            
-            filtered_games = date_filtered
-            after_count = len(filtered_games)
-            logger.info(f"   📊 Date filter: {before_count} → {after_count} games")
+    filter_dates = bool(date_from or date_to)
+    
+    filtered_games = []
+    for game in games:
+        player = game.get('player', {})
+        opponent = game.get('opponent', {})
+        if character_set is not None and player.get('character_name', 'Unknown') not in character_set:
+            continue
+        if opponent_set is not None and opponent.get('player_tag', 'Unknown') not in opponent_set:
+            continue
+        if opponent_char_set is not None and opponent.get('character_name', 'Unknown') not in opponent_char_set:
+            continue
+        if stage_set is not None and str(game.get('stage_id', 'Unknown')) not in stage_set:
+            continue
+        if result_set is not None and game.get('result', 'Unknown') not in result_set:
+            continue
+        if filter_dates:
+            try:
+                game_date = datetime.fromisoformat(game.get('start_time', '').replace('Z', '+00:00'))
+            except ValueError:
+                # Skip games with invalid dates
+                continue
+            if date_from and game_date < date_from:
+                continue
+            if date_to and game_date > date_to:
+                continue
+        filtered_games.append(game)
     
     final_count = len(filtered_games)
-    logger.info(f"✅ Final result: {original_count} → {final_count} games after filtering")
+    logger.info("✅ Final result: %s → %s games after filtering", original_count, final_count)
     
     return filtered_games
 
-def _get_player_games_for_analysis(player_code):
-    """Get and process player games for analysis."""
-    try:
-        # Get raw games from database
-        games = execute_query('games', 'select_by_player', (player_code,))
-        
-        if not games:
-            logger.info(f"No games found for player: {player_code}")
-            return []
-        
-        # Process games using utils
-        processed_games = process_raw_games_for_player(games, player_code)
-        
-        if not processed_games:
-            logger.info(f"No processed games for player: {player_code}")
-            return []
-        
-        logger.info(f"Retrieved {len(processed_games)} games for analysis")
-        return processed_games
-        
-    except Exception as e:
-        logger.error(f"Error getting player games for analysis: {str(e)}")
-        return []
+def _filter_value_set(filter_value):
+    """Accepted values for one filter: None when unset or 'all', else a set (lists) or one-value set."""
+    if not filter_value or filter_value == 'all':
+        return None
+    if isinstance(filter_value, list):
+        return set(filter_value)
+    return {filter_value}
+
+# Breakdown names in filtered_breakdowns rows -> response keys
+_DETAILED_BREAKDOWN_KEYS = {
+    'character': 'character_stats',
+    'opponent': 'opponent_stats',
+    'opponent_character': 'opponent_character_stats',
+    'stage': 'stage_stats',
+    'date': 'date_stats',
+}
+
+def _needs_game_level_filters(filters):
+    """True when filters set criteria (result, date range) that aren't player_games column filters."""
+    column_filters = {filter_name for filter_name, _ in _DETAILED_FILTER_COLUMNS}
+    return any(
+        value and value != 'all'
+        for filter_name, value in filters.items()
+        if filter_name not in column_filters
+    )
+
+def _grouped_player_breakdowns(filters):
+    """
+    Games, wins and per-category breakdowns for the games matching filters,
+    grouped in SQLite (one GROUP BY per breakdown over the filtered rows).
+    
+    Returns:
+        tuple: (total_games, total_wins, dict of character/opponent/opponent_character/stage/date stats)
+    """
+    breakdowns = {stats_key: {} for stats_key in _DETAILED_BREAKDOWN_KEYS.values()}
+    for row in _query_filtered_player_games('filtered_breakdowns', filters):
+        breakdowns[_DETAILED_BREAKDOWN_KEYS[row['breakdown']]][row['breakdown_key']] = {
+            'games': row['games'],
+            'wins': row['wins'],
+            'win_rate': row['wins'] / row['games']
+        }
+    
+    # Every filtered game has exactly one character key
+    character_stats = breakdowns['character_stats'].values()
+    total_games = sum(stats['games'] for stats in character_stats)
+    total_wins = sum(stats['wins'] for stats in character_stats)
+    return total_games, total_wins, breakdowns
 
+def _recent_filtered_games(filters):
+    """The ANALYSIS_RECENT_GAMES newest games matching filters, as processed records."""
+    return process_player_game_rows(
+        _query_filtered_player_games('select_filtered', filters, (ANALYSIS_RECENT_GAMES,))
+    )
 
-def _calculate_comprehensive_analysis(filtered_games, player_code):
-    """Calculate comprehensive analysis from filtered games."""
-    if not filtered_games:
-        return {
-            'player_code': player_code,
-            'total_games': 0,
-            'wins': 0,
-            'losses': 0,
-            'win_rate': 0,
-            'overall_winrate': 0,
-            'character_stats': {},
-            'opponent_stats': {},
-            'opponent_character_stats': {},
-            'stage_stats': {},
-            'date_stats': {},
-            'recent_games': []
-        }
+def _calculate_comprehensive_analysis(filters):
+    """Calculate comprehensive analysis for the games matching the validated filters."""
+    player_code = filters['player_code']
     
     try:
-        # Basic statistics
-        total_games = len(filtered_games)
-        wins = len([g for g in filtered_games if g.get('result') == 'Win'])
+        total_games, wins, breakdowns = _grouped_player_breakdowns(filters)
         win_rate_decimal = wins / total_games if total_games > 0 else 0
         
-        # Initialize stat containers
-        character_stats = {}
-        opponent_stats = {}
-        opponent_character_stats = {}
-        stage_stats = {}
-        date_stats = {}
-        
-        # Process each game for detailed statistics
-        for game in filtered_games:
-            # FIXED: Player character stats - use correct nested structure
-            char = game.get('player', {}).get('character_name', 'Unknown')
-            if char not in character_stats:
-                character_stats[char] = {'games': 0, 'wins': 0}
-            character_stats[char]['games'] += 1
-            if game.get('result') == 'Win':
-                character_stats[char]['wins'] += 1
-            
-            # FIXED: Opponent stats - use correct nested structure
-            opponent = game.get('opponent', {})
-            opp_tag = opponent.get('player_tag', 'Unknown')
-            if opp_tag not in opponent_stats:
-                opponent_stats[opp_tag] = {'games': 0, 'wins': 0}
-            opponent_stats[opp_tag]['games'] += 1
-            if game.get('result') == 'Win':
-                opponent_stats[opp_tag]['wins'] += 1
-            
-            # FIXED: Opponent character stats - use correct nested structure
-            opp_char = opponent.get('character_name', 'Unknown')
-            if opp_char not in opponent_character_stats:
-                opponent_character_stats[opp_char] = {'games': 0, 'wins': 0}
-            opponent_character_stats[opp_char]['games'] += 1
-            if game.get('result') == 'Win':
-                opponent_character_stats[opp_char]['wins'] += 1
-            
-            # Stage stats - this may need fixing too depending on your data
-            stage = game.get('stage_name', game.get('stage_id', 'Unknown'))
-            if stage not in stage_stats:
-                stage_stats[stage] = {'games': 0, 'wins': 0}
-            stage_stats[stage]['games'] += 1
-            if game.get('result') == 'Win':
-                stage_stats[stage]['wins'] += 1
-            
-            # Date stats
-            try:
-                game_date = game.get('start_time', '')[:10]  # Get YYYY-MM-DD
-                if game_date:
-                    if game_date not in date_stats:
-                        date_stats[game_date] = {'games': 0, 'wins': 0}
-                    date_stats[game_date]['games'] += 1
-                    if game.get('result') == 'Win':
-                        date_stats[game_date]['wins'] += 1
-            except:
-                pass  # Skip invalid dates
-        
-        # Calculate win rates for all stat categories
-        for stats_dict in [character_stats, opponent_stats, opponent_character_stats, stage_stats, date_stats]:
-            for key, data in stats_dict.items():
-                data['win_rate'] = data['wins'] / data['games'] if data['games'] > 0 else 0
+        recent_games = _recent_filtered_games(filters) if total_games else []
+        logger.info("   ✅ %s games match filters", total_games)
         
         return {
             'player_code': player_code,
@@ -881,18 +835,76 @@ def _calculate_comprehensive_analysis(filtered_games, player_code):
             'losses': total_games - wins,
             'win_rate': win_rate_decimal * 100,  # As percentage for display
             'overall_winrate': win_rate_decimal,  # As decimal for calculations
-            'character_stats': character_stats,
-            'opponent_stats': opponent_stats,
-            'opponent_character_stats': opponent_character_stats,
-            'stage_stats': stage_stats,
-            'date_stats': date_stats,
-            'recent_games': filtered_games[:20]  # Latest 20 games
+            **breakdowns,
+            'recent_games': recent_games
         }
         
     except Exception as e:
         logger.error(f"Error calculating comprehensive analysis: {str(e)}")
         raise
 
+def _aggregate_game_breakdowns(games):
+    """
+    Tally wins and per-category breakdowns for processed games in one pass.
+    
+    Counters are kept as [games, wins] pairs while scanning; the frontend
+    {'games', 'wins', 'win_rate'} dicts are only built once at the end.
+    
+    Args:
+        games (list): Processed games from process_player_game_rows
+        
+    Returns:
+        tuple: (total_wins, dict of character/opponent/opponent_character/stage/date stats)
+    """
+    character_counts = {}
+    opponent_counts = {}
+    opponent_character_counts = {}
+    stage_counts = {}
+    date_counts = {}
+    total_wins = 0
+    
+    for game in games:
+        win = 1 if game.get('result') == 'Win' else 0
+        total_wins += win
+        
+        player = game.get('player', {})
+        opponent = game.get('opponent', {})
+        # ISO timestamps carry the date in the first 10 chars; keep other formats whole
+        start_time = game.get('start_time') or ''
+        game_date = start_time[:10] if len(start_time) >= 10 and start_time[4] == '-' else start_time
+        
+        keyed_counts = (
+            (character_counts, player.get('character_name', 'Unknown')),
+            (opponent_counts, opponent.get('player_tag', 'Unknown')),
+            (opponent_character_counts, opponent.get('character_name', 'Unknown')),
+            (stage_counts, game.get('stage_name', game.get('stage_id', 'Unknown'))),
+        )
+        if game_date:
+            keyed_counts += ((date_counts, game_date),)
+        
+        for counts, key in keyed_counts:
+            entry = counts.get(key)
+            if entry is None:
+                entry = counts[key] = [0, 0]
+            entry[0] += 1
+            entry[1] += win
+    
+    breakdowns = {
+        'character_stats': _finalize_breakdown(character_counts),
+        'opponent_stats': _finalize_breakdown(opponent_counts),
+        'opponent_character_stats': _finalize_breakdown(opponent_character_counts),
+        'stage_stats': _finalize_breakdown(stage_counts),
+        'date_stats': _finalize_breakdown(date_counts),
+    }
+    return total_wins, breakdowns
+
+def _finalize_breakdown(counts):
+    """Convert [games, wins] counters into frontend breakdown dicts with decimal win rates."""
+    return {
+        key: {'games': games, 'wins': wins, 'win_rate': wins / games}
+        for key, (games, wins) in counts.items()
+    }
+
 def filter_matches(filter_value, actual_value, filter_name="unknown"):
     """Helper function to check if filter matches actual value."""
     if filter_value == 'all':
@@ -900,11 +912,11 @@ def filter_matches(filter_value, actual_value, filter_name="unknown"):
     if isinstance(filter_value, list):
         matches = actual_value in filter_value
         if not matches:
-            logger.debug(f"   ❌ {filter_name}: '{actual_value}' not in {filter_value[:3]}...")
+            logger.debug("   ❌ %s: '%s' not in %s...", filter_name, actual_value, filter_value[:3])
         return matches
     matches = actual_value == filter_value
     if not matches:
-        logger.debug(f"   ❌ {filter_name}: '{actual_value}' != '{filter_value}'")
+        logger.debug("   ❌ %s: '%s' != '%s'", filter_name, actual_value, filter_value)
     return matches
 
 def extract_filter_options(games):
@@ -941,10 +953,10 @@ def extract_filter_options(games):
             stages.add(str(stage))
     
     return {
-        'characters': sorted(list(characters)),
-        'opponents': sorted(list(opponents)),
-        'opponent_characters': sorted(list(opponent_characters)),
-        'stages': sorted(list(stages))
+        'characters': sorted(characters),
+        'opponents': sorted(opponents),
+        'opponent_characters': sorted(opponent_characters),
+        'stages': sorted(stages)
     }
 
 def calculate_filtered_stats(games, filter_options):
@@ -964,46 +976,34 @@ def calculate_filtered_stats(games, filter_options):
             'opponent_character_breakdown': {}
         }
     
-    # Basic stats
     total_games = len(games)
-    wins = len([g for g in games if g.get('result') == 'Win'])
-    win_rate = wins / total_games if total_games > 0 else 0
-    
-    # Character breakdown
-    character_breakdown = {}
-    opponent_breakdown = {}
-    opponent_character_breakdown = {}
+    wins = 0
+    character_counts = {}
+    opponent_counts = {}
+    opponent_character_counts = {}
     
+    # One pass over the games: each counter is a [games, wins] pair
     for game in games:
-        # FIXED: Character stats - use correct nested structure
-        char = game.get('player', {}).get('character_name', 'Unknown')
-        if char not in character_breakdown:
-            character_breakdown[char] = {'games': 0, 'wins': 0}
-        character_breakdown[char]['games'] += 1
-        if game.get('result') == 'Win':
-            character_breakdown[char]['wins'] += 1
-        
-        # FIXED: Opponent stats - use correct nested structure
+        win = 1 if game.get('result') == 'Win' else 0
+        wins += win
+        
         opponent = game.get('opponent', {})
-        opp_tag = opponent.get('player_tag', 'Unknown')
-        if opp_tag not in opponent_breakdown:
-            opponent_breakdown[opp_tag] = {'games': 0, 'wins': 0}
-        opponent_breakdown[opp_tag]['games'] += 1
-        if game.get('result') == 'Win':
-            opponent_breakdown[opp_tag]['wins'] += 1
-        
-        # FIXED: Opponent character stats - use correct nested structure
-        opp_char = opponent.get('character_name', 'Unknown')
-        if opp_char not in opponent_character_breakdown:
-            opponent_character_breakdown[opp_char] = {'games': 0, 'wins': 0}
-        opponent_character_breakdown[opp_char]['games'] += 1
-        if game.get('result') == 'Win':
-            opponent_character_breakdown[opp_char]['wins'] += 1
-    
-    # Calculate win rates
-    for breakdown in [character_breakdown, opponent_breakdown, opponent_character_breakdown]:
-        for key, data in breakdown.items():
-            data['win_rate'] = data['wins'] / data['games'] if data['games'] > 0 else 0
+        keyed_counts = (
+            (character_counts, game.get('player', {}).get('character_name', 'Unknown')),
+            (opponent_counts, opponent.get('player_tag', 'Unknown')),
+            (opponent_character_counts, opponent.get('character_name', 'Unknown')),
+        )
+        for counts, key in keyed_counts:
+            entry = counts.get(key)
+            if entry is None:
+                entry = counts[key] = [0, 0]
+            entry[0] += 1
+            entry[1] += win
+    
+    win_rate = wins / total_games
+    character_breakdown = _finalize_breakdown(character_counts)
+    opponent_breakdown = _finalize_breakdown(opponent_counts)
+    opponent_character_breakdown = _finalize_breakdown(opponent_character_counts)
     
     return {
         'total_games': total_games,
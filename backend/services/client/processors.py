@@ -6,6 +6,9 @@ All database-related construction logic now properly placed in processors.
 """
 
 import logging
+import time
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import secrets
@@ -16,7 +19,13 @@ from .schemas import ClientRegistrationData, ApiKeyData, ClientInfo, ClientStatu
 
 # Configuration
 config = get_config()
-logger = config.init_logging()
+logger = logging.getLogger('SlippiServer')
+
+# In-process cache of validated API keys: api_key -> (ApiKeyData, cached_at)
+API_KEY_CACHE_TTL = getattr(config, 'API_KEY_CACHE_TTL', 60)  # seconds
+API_KEY_CACHE_MAXSIZE = getattr(config, 'API_KEY_CACHE_MAXSIZE', 10000)
+_api_key_cache = OrderedDict()
+_api_key_cache_lock = threading.RLock()
 
 # ============================================================================
 # Schema Construction Helpers (Database-Related Logic)
@@ -62,6 +71,7 @@ def create_api_key_from_database_record(record: Dict[str, Any]) -> ApiKeyData:
         api_key=record['api_key'],
         created_at=record.get('created_at', datetime.now().isoformat()),
         expires_at=record.get('expires_at'),
+        expires_at_epoch=record.get('expires_at_epoch'),
         is_active=record.get('is_active', True),
         last_used_at=record.get('last_used_at'),
         usage_count=record.get('usage_count', 0)
@@ -73,19 +83,23 @@ def create_new_api_key(client_id: str, expiry_days: int = 365) -> ApiKeyData:
     
     FIXED: This creation logic belongs in processors, not schemas.
     """
+    # Read the clock once for both timestamps
+    now = datetime.now()
+    current_time = now.isoformat()
+    
     # Generate secure API key
-    current_time = datetime.now().isoformat()
     random_bytes = secrets.token_bytes(32)
     api_key = hashlib.sha256(f"{client_id}:{current_time}:{random_bytes.hex()}".encode()).hexdigest()
     
-    # Calculate expiration
-    expires_at = (datetime.now() + timedelta(days=expiry_days)).isoformat()
+    # Calculate expiration (ISO string for display, epoch for cheap validity checks)
+    expires_dt = now + timedelta(days=expiry_days)
     
     return ApiKeyData(
         client_id=client_id,
         api_key=api_key,
         created_at=current_time,
-        expires_at=expires_at,
+        expires_at=expires_dt.isoformat(),
+        expires_at_epoch=int(expires_dt.timestamp()),
         is_active=True
     )
 
@@ -144,12 +158,12 @@ def process_client_registration_data(registration_data: ClientRegistrationData)
             # Update existing client
             result = _update_existing_client(registration_data, existing_client)
             result['is_new_client'] = False
-            logger.info(f"Updated existing client: {client_id}")
+            logger.info("Updated existing client: %s", client_id)
         else:
             # Create new client
             result = _create_new_client(registration_data)
             result['is_new_client'] = True
-            logger.info(f"Created new client: {client_id}")
+            logger.info("Created new client: %s", client_id)
         
         return result
         
@@ -226,7 +240,7 @@ def process_api_key_generation(client_id: str, force_new: bool = False) -> Dict[
                 # FIXED: Use processor helper instead of schema method
                 api_key_data = create_api_key_from_database_record(existing_api_key)
                 if api_key_data.is_valid():
-                    logger.info(f"Using existing valid API key for client {client_id}")
+                    logger.info("Using existing valid API key for client %s", client_id)
                     return {
                         'api_key': api_key_data.api_key,
                         'expires_at': api_key_data.expires_at,
@@ -238,15 +252,19 @@ def process_api_key_generation(client_id: str, force_new: bool = False) -> Dict[
         # FIXED: Use processor helper instead of schema method
         new_api_key_data = create_new_api_key(client_id, config.TOKEN_EXPIRY_DAYS)
         
-        # Store API key in database
-        execute_query('api_keys', 'insert_key', (
+        # Store API key in database (single UPSERT replaces any existing key for this client)
+        execute_query('api_keys', 'upsert_key', (
             new_api_key_data.client_id,
             new_api_key_data.api_key,
             new_api_key_data.created_at,
-            new_api_key_data.expires_at
+            new_api_key_data.expires_at,
+            new_api_key_data.expires_at_epoch
         ))
         
-        logger.info(f"Generated new API key for client {client_id}")
+        # Old key must stop authenticating immediately, not after the cache TTL
+        invalidate_cached_api_keys(client_id)
+        
+        logger.info("Generated new API key for client %s", client_id)
         
         return {
             'api_key': new_api_key_data.api_key,
@@ -263,6 +281,9 @@ def validate_existing_api_key(api_key: str) -> Optional[ApiKeyData]:
     """
     Validate an existing API key.
     
+    Valid keys are cached in-process for API_KEY_CACHE_TTL seconds so the
+    authenticated hot path skips the database; expiry is re-checked on every hit.
+    
     Args:
         api_key: API key to validate
     
@@ -270,6 +291,10 @@ def validate_existing_api_key(api_key: str) -> Optional[ApiKeyData]:
         ApiKeyData if valid, None otherwise
     """
     try:
+        api_key_data = _get_cached_api_key(api_key)
+        if api_key_data:
+            return api_key_data
+        
         api_key_record = execute_query('api_keys', 'select_by_key', (api_key,), fetch_one=True)
         
         if not api_key_record:
@@ -284,16 +309,47 @@ def validate_existing_api_key(api_key: str) -> Optional[ApiKeyData]:
         
         # Update usage tracking (non-critical)
         try:
-            logger.debug(f"API key usage tracking skipped for {api_key_data.client_id} (no SQL file)")
+            logger.debug("API key usage tracking skipped for %s (no SQL file)", api_key_data.client_id)
         except Exception as e:
             logger.warning(f"Failed to update API key usage for {api_key_data.client_id}: {str(e)}")
         
+        _cache_api_key(api_key, api_key_data)
         return api_key_data
         
     except Exception as e:
         logger.error(f"Error validating API key: {str(e)}")
         return None
 
+def invalidate_cached_api_keys(client_id: str) -> None:
+    """Drop every cached API key belonging to a client (e.g. after key rotation)."""
+    with _api_key_cache_lock:
+        stale_keys = [key for key, (data, _) in _api_key_cache.items() if data.client_id == client_id]
+        for key in stale_keys:
+            del _api_key_cache[key]
+
+def _get_cached_api_key(api_key: str) -> Optional[ApiKeyData]:
+    """Return cached ApiKeyData if fresh and still valid, evicting it otherwise."""
+    with _api_key_cache_lock:
+        entry = _api_key_cache.get(api_key)
+        if entry is None:
+            return None
+        
+        api_key_data, cached_at = entry
+        if time.monotonic() - cached_at > API_KEY_CACHE_TTL or not api_key_data.is_valid():
+            del _api_key_cache[api_key]
+            return None
+        
+        _api_key_cache.move_to_end(api_key)
+        return api_key_data
+
+def _cache_api_key(api_key: str, api_key_data: ApiKeyData) -> None:
+    """Store a validated key, evicting the least recently used entry when full."""
+    with _api_key_cache_lock:
+        _api_key_cache[api_key] = (api_key_data, time.monotonic())
+        _api_key_cache.move_to_end(api_key)
+        if len(_api_key_cache) > API_KEY_CACHE_MAXSIZE:
+            _api_key_cache.popitem(last=False)
+
 def get_client_information(client_id: str) -> Optional[Dict[str, Any]]:
     """
     Get complete client information.
@@ -377,7 +433,7 @@ def process_client_update(client_id: str, update_data: Dict[str, Any]) -> Dict[s
             client_id  # WHERE clause
         ))
         
-        logger.info(f"Updated client {client_id}, fields: {updated_fields}")
+        logger.info("Updated client %s, fields: %s", client_id, updated_fields)
         
         return {
             'updated_fields': updated_fields,
@@ -400,7 +456,7 @@ def update_client_activity(client_id: str, activity_type: str = 'general') -> No
             client_id
         ))
         
-        logger.debug(f"Updated activity for client {client_id}: {activity_type}")
+        logger.debug("Updated activity for client %s: %s", client_id, activity_type)
         
     except Exception as e:
         logger.warning(f"Failed to update activity for client {client_id}: {str(e)}")
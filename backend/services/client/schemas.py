@@ -5,6 +5,7 @@ Pure data structures only - no business logic or validation.
 FIXED: Removed all @classmethod violations per architecture.
 """
 
+import time
 import uuid
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
@@ -81,6 +82,7 @@ class ApiKeyData:
     api_key: str
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     expires_at: Optional[str] = None
+    expires_at_epoch: Optional[int] = None
     is_active: bool = True
     
     # Usage tracking
@@ -89,6 +91,8 @@ class ApiKeyData:
     
     def is_expired(self) -> bool:
         """Check if the API key is expired."""
+        if self.expires_at_epoch is not None:
+            return time.time() > self.expires_at_epoch
         if not self.expires_at:
             return False
         try:
@@ -108,6 +112,7 @@ class ApiKeyData:
             'api_key': self.api_key,
             'created_at': self.created_at,
             'expires_at': self.expires_at,
+            'expires_at_epoch': self.expires_at_epoch,
             'is_active': self.is_active,
             'last_used_at': self.last_used_at,
             'usage_count': self.usage_count
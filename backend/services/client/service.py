@@ -19,7 +19,7 @@ from .processors import (
 
 # Configuration
 config = get_config()
-logger = config.init_logging()
+logger = logging.getLogger('SlippiServer')
 
 # ============================================================================
 # Main Orchestrator Functions
@@ -207,7 +207,7 @@ def validate_client_security_constraints(registration_data: ClientRegistrationDa
     # Example: Validate version is reasonable
     version = registration_data.version
     if version and version.startswith('0.'):
-        logger.info(f"Development version registered: {version}")
+        logger.info("Development version registered: %s", version)
 
 def validate_client_permissions(client_id: str, requested_action: str) -> None:
     """Validate client permissions for specific actions."""
@@ -7,12 +7,13 @@ Handles games, files, client info, and side effects.
 """
 
 import logging
-import json
+import sqlite3
 import uuid
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from backend.config import get_config
-from backend.db import execute_query
+from backend.db import execute_query, connection, sql_manager
+from backend.utils import json_dumps
 from .schemas import (
     CombinedUploadData, UploadGameData, PlayerUploadData, 
     GameResult, UploadValidationError
@@ -20,7 +21,10 @@ from .schemas import (
 
 # Configuration  
 config = get_config()
-logger = config.init_logging()
+logger = logging.getLogger('SlippiServer')
+
+# Game ids / file hashes per duplicate probe; SQLite builds before 3.32 bind at most 999 parameters
+DUPLICATE_PROBE_BATCH_SIZE = 999
 
 # ============================================================================
 # Schema Construction Helpers (Database-Related Logic)
@@ -171,41 +175,26 @@ def process_games_upload(client_id: str, games_data: List[Dict[str, Any]]) -> Di
         return {'error': 'Invalid client_id or games_data'}
     
     try:
-        uploaded_count = 0
         duplicate_count = 0
         error_count = 0
         processed_games = []
         
+        # Build every row first so duplicates are found with one IN (...) probe
+        pending_games = []
         for game_data in games_data:
             try:
                 # Generate game ID if not provided
                 game_id = game_data.get('game_id', str(uuid.uuid4()))
-                
-                # Check if game exists
-                existing_game = execute_query('games', 'check_exists', (game_id,), fetch_one=True)
-                
-                if existing_game:
-                    logger.info(f"Game {game_id} already exists, skipping")
-                    duplicate_count += 1
-                    continue
-                
-                # Insert new game using execute_query
-                execute_query('games', 'insert_game', (
+                pending_games.append((game_id, (
                     game_id,
                     client_id,
                     game_data.get('start_time', datetime.now().isoformat()),
                     game_data.get('last_frame', 0),
                     game_data.get('stage_id', 0),
-                    json.dumps(game_data.get('player_data', [])),
+                    json_dumps(game_data.get('player_data', [])),
                     datetime.now().isoformat(),  # upload_date
                     game_data.get('game_type', 'unknown')
-                ))
-                
-                uploaded_count += 1
-                processed_games.append({
-                    'game_id': game_id,
-                    'status': 'uploaded'
-                })
+                )))
                 
             except Exception as e:
                 logger.error(f"Error processing game {game_data.get('game_id', 'unknown')}: {str(e)}")
@@ -216,6 +205,30 @@ def process_games_upload(client_id: str, games_data: List[Dict[str, Any]]) -> Di
                     'error': str(e)
                 })
         
+        seen_ids = _find_existing_game_ids([game_id for game_id, _ in pending_games])
+        new_rows = []
+        uploaded_games = {}
+        for game_id, row in pending_games:
+            if game_id in seen_ids:
+                logger.debug("Game %s already exists, skipping", game_id)
+                duplicate_count += 1
+                continue
+            
+            seen_ids.add(game_id)
+            new_rows.append(row)
+            uploaded_games[game_id] = {
+                'game_id': game_id,
+                'status': 'uploaded'
+            }
+            processed_games.append(uploaded_games[game_id])
+        
+        failed_inserts = _insert_rows('games', 'insert_game', new_rows)
+        for game_id, error in failed_inserts.items():
+            logger.error(f"Error processing game {game_id}: {error}")
+            uploaded_games[game_id].update({'status': 'error', 'error': error})
+        error_count += len(failed_inserts)
+        uploaded_count = len(new_rows) - len(failed_inserts)
+        
         return {
             'uploaded': uploaded_count,
             'duplicates': duplicate_count,
@@ -265,7 +278,7 @@ def process_file_upload_logic(client_id: str, file_info: Dict[str, Any], file_co
             f"/uploads/{client_id}/{file_id}",  # file_path
             len(file_content),  # file_size
             datetime.now().isoformat(),  # upload_date
-            json.dumps(file_info)  # metadata
+            json_dumps(file_info)  # metadata
         ))
         
         return {
@@ -317,17 +330,18 @@ def _process_standardized_games(client_id: str, games: List[UploadGameData]) ->
         dict: Processing results
     """
     try:
-        uploaded_count = 0
         duplicate_count = 0
         error_count = 0
         processed_games = []
         
+        # One IN (...) probe for the whole batch instead of a lookup per game
+        seen_ids = _find_existing_game_ids([game.game_id for game in games])
+        new_rows = []
+        uploaded_games = {}
+        
         for game in games:
             try:
-                # Check if game exists
-                existing_game = execute_query('games', 'check_exists', (game.game_id,), fetch_one=True)
-                
-                if existing_game:
+                if game.game_id in seen_ids:
                     duplicate_count += 1
                     processed_games.append({
                         'game_id': game.game_id,
@@ -335,25 +349,26 @@ def _process_standardized_games(client_id: str, games: List[UploadGameData]) ->
                     })
                     continue
                 
-                # Insert new game
-                execute_query('games', 'insert_game', (
+                # Queue new game for the batch insert
+                new_rows.append((
                     game.game_id,
                     game.client_id,
                     game.start_time,
                     game.game_length_frames,
                     game.stage_id,
-                    json.dumps([player.to_dict() for player in game.player_data]),
+                    json_dumps([player.to_dict() for player in game.player_data]),
                     datetime.now().isoformat(),  # upload_date
                     'standard'  # game_type
                 ))
+                seen_ids.add(game.game_id)
                 
-                uploaded_count += 1
-                processed_games.append({
+                uploaded_games[game.game_id] = {
                     'game_id': game.game_id,
                     'status': 'uploaded',
                     'stage_name': game.stage_name,
                     'player_count': len(game.player_data)
-                })
+                }
+                processed_games.append(uploaded_games[game.game_id])
                 
             except Exception as e:
                 logger.error(f"Error processing standardized game {game.game_id}: {str(e)}")
@@ -364,6 +379,13 @@ def _process_standardized_games(client_id: str, games: List[UploadGameData]) ->
                     'error': str(e)
                 })
         
+        failed_inserts = _insert_rows('games', 'insert_game', new_rows)
+        for game_id, error in failed_inserts.items():
+            logger.error(f"Error processing standardized game {game_id}: {error}")
+            uploaded_games[game_id].update({'status': 'error', 'error': error})
+        error_count += len(failed_inserts)
+        uploaded_count = len(new_rows) - len(failed_inserts)
+        
         return {
             'uploaded_count': uploaded_count,
             'duplicate_count': duplicate_count,
@@ -377,6 +399,66 @@ def _process_standardized_games(client_id: str, games: List[UploadGameData]) ->
         logger.error(f"Error processing standardized games for {client_id}: {str(e)}")
         return {'error': str(e), 'status': 'error'}
 
+def _find_existing_game_ids(game_ids: List[str]) -> set:
+    """Return the subset of game_ids already stored, probed DUPLICATE_PROBE_BATCH_SIZE ids at a time."""
+    existing_ids = set()
+    if not game_ids:
+        return existing_ids
+    
+    with connection.get_connection() as conn:
+        for start in range(0, len(game_ids), DUPLICATE_PROBE_BATCH_SIZE):
+            batch = game_ids[start:start + DUPLICATE_PROBE_BATCH_SIZE]
+            query = sql_manager.format_query('games', 'select_existing_ids', placeholders=', '.join('?' * len(batch)))
+            existing_ids.update(row['game_id'] for row in conn.execute(query, batch))
+    
+    return existing_ids
+
+def _find_existing_files(file_hashes: List[str]) -> Dict[str, str]:
+    """Map each already stored hash in file_hashes to its file_id, DUPLICATE_PROBE_BATCH_SIZE hashes at a time."""
+    existing_files = {}
+    if not file_hashes:
+        return existing_files
+    
+    with connection.get_connection() as conn:
+        for start in range(0, len(file_hashes), DUPLICATE_PROBE_BATCH_SIZE):
+            batch = file_hashes[start:start + DUPLICATE_PROBE_BATCH_SIZE]
+            query = sql_manager.format_query('files', 'select_existing_hashes', placeholders=', '.join('?' * len(batch)))
+            existing_files.update((row['file_hash'], row['file_id']) for row in conn.execute(query, batch))
+    
+    return existing_files
+
+def _insert_rows(category: str, query_name: str, rows: List[tuple]) -> Dict[str, str]:
+    """
+    Insert rows (games or files) with one executemany and a single commit.
+    
+    If the batch fails it is rolled back and retried row by row (still one
+    commit), so one bad row is reported on its own instead of failing the rest.
+    
+    Returns:
+        dict: row id (first column) -> error message for rows that could not be inserted
+    """
+    if not rows:
+        return {}
+    
+    query = sql_manager.get_query(category, query_name)
+    with connection.get_connection() as conn:
+        # "with conn" commits the batch on success and rolls it back on error
+        try:
+            with conn:
+                conn.executemany(query, rows)
+            return {}
+        except sqlite3.Error:
+            pass
+        
+        failed_inserts = {}
+        with conn:
+            for row in rows:
+                try:
+                    conn.execute(query, row)
+                except sqlite3.Error as e:
+                    failed_inserts[row[0]] = str(e)
+        return failed_inserts
+
 def _process_client_info(client_info: Dict[str, Any]) -> dict:
     """
     FIXED: Process client information during upload - verify client exists only.
@@ -426,6 +508,10 @@ def _process_files_data(client_id: str, files_data: List[Dict[str, Any]]) -> Dic
     """
     Process files data.
     
+    Duplicate hashes are probed for the whole batch at once and the new
+    metadata rows are written with one executemany and a single commit,
+    rather than a lookup and a committed insert per file.
+    
     Args:
         client_id: Client identifier
         files_data: List of file data to process
@@ -434,10 +520,8 @@ def _process_files_data(client_id: str, files_data: List[Dict[str, Any]]) -> Dic
         dict: Processing results
     """
     try:
-        uploaded_count = 0
-        duplicate_count = 0
-        error_count = 0
         file_results = []
+        pending = []  # (index into file_results, file_info, file_content)
         
         for file_data in files_data:
             try:
@@ -453,22 +537,58 @@ def _process_files_data(client_id: str, files_data: List[Dict[str, Any]]) -> Dic
                     'hash': file_data.get('hash', 'unknown'),
                     'metadata': file_data.get('metadata', {})
                 }
-                
-                result = process_file_upload_logic(client_id, file_info, file_content)
-                file_results.append(result)
-                
-                if result.get('status') == 'uploaded':
-                    uploaded_count += 1
-                elif result.get('status') == 'duplicate':
-                    duplicate_count += 1
-                elif result.get('status') == 'error':
-                    error_count += 1
+                pending.append((len(file_results), file_info, file_content))
+                file_results.append(None)
                     
             except Exception as e:
                 logger.warning(f"Error processing file: {str(e)}")
-                error_count += 1
                 file_results.append({'error': str(e), 'status': 'error'})
         
+        # A hash repeated within the batch is a duplicate of its first occurrence
+        known_files = _find_existing_files(list(dict.fromkeys(info['hash'] for _, info, _ in pending)))
+        upload_date = datetime.now().isoformat()
+        new_rows = []
+        
+        for index, file_info, file_content in pending:
+            file_hash = file_info['hash']
+            if file_hash in known_files:
+                file_results[index] = {
+                    'file_id': known_files[file_hash],
+                    'status': 'duplicate',
+                    'message': 'File already exists'
+                }
+                continue
+            
+            file_id = str(uuid.uuid4())
+            known_files[file_hash] = file_id
+            new_rows.append((
+                file_id,
+                file_hash,
+                client_id,
+                file_info['filename'],
+                f"/uploads/{client_id}/{file_id}",  # file_path
+                len(file_content),  # file_size
+                upload_date,
+                json_dumps(file_info)  # metadata
+            ))
+            file_results[index] = {
+                'file_id': file_id,
+                'status': 'uploaded',
+                'size': len(file_content),
+                'filename': file_info['filename']
+            }
+        
+        failed_inserts = _insert_rows('files', 'insert_file', new_rows)
+        for index, result in enumerate(file_results):
+            if result.get('file_id') in failed_inserts and result['status'] == 'uploaded':
+                logger.error(f"Error processing file upload: {failed_inserts[result['file_id']]}")
+                file_results[index] = {'error': failed_inserts[result['file_id']], 'status': 'error'}
+        
+        statuses = [result['status'] for result in file_results]
+        uploaded_count = statuses.count('uploaded')
+        duplicate_count = statuses.count('duplicate')
+        error_count = statuses.count('error')
+        
         return {
             'uploaded_count': uploaded_count,
             'duplicate_count': duplicate_count,
@@ -489,7 +609,7 @@ def _update_client_activity(client_id: str) -> None:
             datetime.now().isoformat(),
             client_id
         ))
-        logger.debug(f"Updated activity for client {client_id}")
+        logger.debug("Updated activity for client %s", client_id)
         
     except Exception as e:
         logger.warning(f"Failed to update activity for client {client_id}: {str(e)}")
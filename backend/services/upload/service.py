@@ -7,6 +7,7 @@ Main entry points for upload business logic following the orchestrator pattern.
 import logging
 from datetime import datetime
 from backend.config import get_config
+from backend.db import execute_query
 from .validation import validate_combined_upload_data, UploadValidationError
 from .processors import (
     process_upload_components, 
@@ -16,7 +17,7 @@ from .processors import (
 
 # Configuration
 config = get_config()
-logger = config.init_logging()
+logger = logging.getLogger('SlippiServer')
 
 def process_combined_upload(client_id, upload_data):
     """
@@ -127,18 +128,11 @@ def _create_error_response(error_type, error_message):
 def _handle_upload_side_effects(client_id, upload_results):
     """Handle side effects after successful upload processing."""
     try:
-        # Update client last active time
-        from backend.db import connection, manager
+        # Update client last active time through the shared, already-loaded
+        # sql_manager rather than a fresh SQLManager re-reading every .sql file
+        execute_query('clients', 'update_last_active', (datetime.now().isoformat(), client_id))
         
-        mgr = manager.SQLManager()
-        
-        with connection.get_connection() as conn:
-            cursor = conn.cursor()
-            update_query = mgr.get_query('clients', 'update_last_active')
-            cursor.execute(update_query, (datetime.now().isoformat(), client_id))
-            conn.commit()
-        
-        logger.info(f"Updated last active time for client {client_id}")
+        logger.info("Updated last active time for client %s", client_id)
         
     except Exception as e:
         # Log the error but don't fail the upload
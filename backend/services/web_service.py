@@ -4,141 +4,42 @@ Web Service - Business Logic for Web Page Rendering
 FINAL VERSION: Now properly handles character data and names
 """
 
+# Fixed backend/services/web_service.py - Homepage Functions
+# These functions now return data in the exact format the frontend components expect
+
+import heapq
 import logging
+import threading
+import time
+from collections import OrderedDict
 from flask import abort
 
 # NEW: Use the simplified db layer
 from backend.db import execute_query
 from backend.utils import (
-    encode_player_tag, decode_player_tag, safe_get_player_field, process_raw_games_for_player
+    encode_player_tag, decode_player_tag, safe_get_player_field, process_player_game_rows
 )
 from backend.config import get_config
 
 config = get_config()
 logger = logging.getLogger('SlippiServer')
 
+# Games listed on the player profile page
+PROFILE_RECENT_GAMES = 20
 
-def prepare_homepage_data():
-    """
-    Prepare data for the homepage template.
-    
-    FIXED: Returns data in exact format that frontend components expect:
-    - recent_games_card() expects: player1, player2, character1, character2, result, time, etc.
-    - top_players_card() expects: name, code_encoded, win_rate, games, wins
-    """
-    try:
-        # Get basic counts
-        total_games = execute_query('games', 'count_all', fetch_one=True)
-        
-        # Try the new count_unique_players
-        total_players = execute_query('stats', 'count_unique_players', fetch_one=True)
-        
-        # Get raw recent games
-        recent_games_raw = execute_query('games', 'select_recent', (10,))
-        
-        # Get top players
-        try:
-            top_players_raw = execute_query('stats', 'top_players_by_winrate', (5, 10))
-        except:
-            # Fallback: use all players and filter
-            all_players = execute_query('stats', 'all_players_with_stats')
-            top_players_raw = sorted(all_players, key=lambda x: x.get('win_rate', 0), reverse=True)[:10]
-        
-        # FIXED: Process recent games to match frontend expectations
-        processed_recent = []
-        for game in recent_games_raw:
-            try:
-                # Parse player data from JSON
-                player_data_str = game.get('player_data', '[]')
-                if isinstance(player_data_str, str):
-                    player_data = json.loads(player_data_str)
-                else:
-                    player_data = player_data_str
-                
-                if len(player_data) >= 2:
-                    player1 = player_data[0]
-                    player2 = player_data[1]
-                    
-                    # Extract data for frontend template
-                    player1_tag = safe_get_player_field(player1, 'player_tag', 'Unknown')
-                    player2_tag = safe_get_player_field(player2, 'player_tag', 'Unknown')
-                    
-                    # CRITICAL: Frontend expects these exact field names
-                    processed_recent.append({
-                        'player1': player1_tag,
-                        'player2': player2_tag,
-                        'player1_tag_encoded': encode_player_tag(player1_tag),
-                        'player2_tag_encoded': encode_player_tag(player2_tag),
-                        'character1': safe_get_player_field(player1, 'character_name', 'Unknown'),
-                        'character2': safe_get_player_field(player2, 'character_name', 'Unknown'),
-                        'result': f"{player1_tag} vs {player2_tag}",  # Simple result for now
-                        'time': game.get('start_time', 'Unknown'),
-                        'game_id': game.get('game_id')
-                    })
-                
-            except Exception as e:
-                logger.warning(f"Error processing recent game {game.get('game_id')}: {str(e)}")
-                continue
-        
-        # FIXED: Process top players to match frontend expectations
-        processed_top_players = []
-        for player in top_players_raw:
-            try:
-                player_tag = player.get('player_tag', '')
-                win_rate = player.get('win_rate', 0)
-                
-                # Convert win_rate to decimal if it's a percentage
-                if win_rate > 1:
-                    win_rate = win_rate / 100.0
-                
-                # CRITICAL: Frontend expects these exact field names
-                processed_top_players.append({
-                    'name': player_tag,  # Frontend uses 'name' for display
-                    'code_encoded': encode_player_tag(player_tag),  # For links
-                    'win_rate': win_rate,  # As decimal (0.0 - 1.0)
-                    'games': player.get('total_games', 0),
-                    'wins': player.get('wins', 0)
-                })
-                
-            except Exception as e:
-                logger.warning(f"Error processing top player: {str(e)}")
-                continue
-        
-        # FIXED: Return data with correct field names and types
-        return {
-            'total_games': total_games['count'] if total_games else 0,
-            'total_players': total_players['count'] if total_players else 0,
-            'recent_games': processed_recent,  # List of dicts with specific fields
-            'top_players': processed_top_players  # List of dicts with specific fields
-        }
-        
-    except Exception as e:
-        logger.error(f"Error preparing homepage data: {str(e)}")
-        # Return safe defaults that won't break the template
-        return {
-            'total_games': 0,
-            'total_players': 0,
-            'recent_games': [],
-            'top_players': []
-        }
-
-
-# Fixed backend/services/web_service.py - Homepage Functions
-# These functions now return data in the exact format the frontend components expect
+# Games listed on the detailed page and scanned for recent opponents
+DETAILED_RECENT_GAMES = 10
 
-import logging
-import json
-from flask import abort
+# Seconds homepage data is reused before it is rebuilt from the database
+HOMEPAGE_CACHE_TTL = getattr(config, 'HOMEPAGE_CACHE_TTL', 60)
 
-# NEW: Use the simplified db layer
-from backend.db import execute_query
-from backend.utils import (
-    encode_player_tag, decode_player_tag, safe_get_player_field, process_raw_games_for_player
-)
-from backend.config import get_config
+# (homepage data, built_at); replaced wholesale, so readers never see a partial entry
+_homepage_cache = None
 
-config = get_config()
-logger = logging.getLogger('SlippiServer')
+# Player breakdown query results kept, least recently used evicted first
+PLAYER_BREAKDOWN_CACHE_MAXSIZE = getattr(config, 'PLAYER_BREAKDOWN_CACHE_MAXSIZE', 1000)
+_player_breakdown_cache = OrderedDict()  # (query_name, player_tag) -> (summary version, rows)
+_player_breakdown_cache_lock = threading.Lock()
 
 
 def prepare_homepage_data():
@@ -148,7 +49,15 @@ def prepare_homepage_data():
     FIXED: Returns data in exact format that frontend components expect:
     - recent_games_card() expects: player1, player2, character1, character2, result, time, etc.
     - top_players_card() expects: name, code_encoded, win_rate, games, wins
+    
+    Successful results are shared for HOMEPAGE_CACHE_TTL seconds, so busy
+    homepages cost a handful of queries per interval instead of per request.
     """
+    global _homepage_cache
+    cached = _homepage_cache
+    if cached is not None and time.monotonic() - cached[1] <= HOMEPAGE_CACHE_TTL:
+        return cached[0]
+    
     try:
         # Get basic counts
         total_games = execute_query('games', 'count_all', fetch_one=True)
@@ -157,7 +66,7 @@ def prepare_homepage_data():
         total_players = execute_query('stats', 'count_unique_players', fetch_one=True)
         
         # Get raw recent games
-        recent_games_raw = execute_query('games', 'select_recent', (10,))
+        recent_games_raw = execute_query('games', 'select_recent_summary', (10,))
         
         # Get top players
         try:
@@ -165,26 +74,16 @@ def prepare_homepage_data():
         except:
             # Fallback: use all players and filter
             all_players = execute_query('stats', 'all_players_with_stats')
-            top_players_raw = sorted(all_players, key=lambda x: x.get('win_rate', 0), reverse=True)[:10]
+            top_players_raw = heapq.nlargest(10, all_players, key=lambda x: x.get('win_rate', 0))
         
         # FIXED: Process recent games to match frontend expectations
         processed_recent = []
         for game in recent_games_raw:
             try:
-                # Parse player data from JSON
-                player_data_str = game.get('player_data', '[]')
-                if isinstance(player_data_str, str):
-                    player_data = json.loads(player_data_str)
-                else:
-                    player_data = player_data_str
-                
-                if len(player_data) >= 2:
-                    player1 = player_data[0]
-                    player2 = player_data[1]
-                    
-                    # Extract data for frontend template
-                    player1_tag = safe_get_player_field(player1, 'player_tag', 'Unknown')
-                    player2_tag = safe_get_player_field(player2, 'player_tag', 'Unknown')
+                # Player fields are extracted by select_recent_summary, no JSON parsing here
+                if (game.get('player_count') or 0) >= 2:
+                    player1_tag = game['player1_tag']
+                    player2_tag = game['player2_tag']
                     
                     # CRITICAL: Frontend expects these exact field names
                     processed_recent.append({
@@ -192,8 +91,8 @@ def prepare_homepage_data():
                         'player2': player2_tag,
                         'player1_tag_encoded': encode_player_tag(player1_tag),
                         'player2_tag_encoded': encode_player_tag(player2_tag),
-                        'character1': safe_get_player_field(player1, 'character_name', 'Unknown'),
-                        'character2': safe_get_player_field(player2, 'character_name', 'Unknown'),
+                        'character1': game['player1_character'],
+                        'character2': game['player2_character'],
                         'result': f"{player1_tag} vs {player2_tag}",  # Simple result for now
                         'time': game.get('start_time', 'Unknown'),
                         'game_id': game.get('game_id')
@@ -228,12 +127,14 @@ def prepare_homepage_data():
                 continue
         
         # FIXED: Return data with correct field names and types
-        return {
+        homepage_data = {
             'total_games': total_games['count'] if total_games else 0,
             'total_players': total_players['count'] if total_players else 0,
             'recent_games': processed_recent,  # List of dicts with specific fields
             'top_players': processed_top_players  # List of dicts with specific fields
         }
+        _homepage_cache = (homepage_data, time.monotonic())
+        return homepage_data
         
     except Exception as e:
         logger.error(f"Error preparing homepage data: {str(e)}")
@@ -323,43 +224,35 @@ def prepare_all_players_data():
         }
 
 
-def process_player_profile_request(encoded_player_code):
+def process_player_profile_request(player_code):
     """
     Process a player profile page request with proper error handling.
     
     FIXED: Now uses abort() instead of redirect pattern - routes expect this behavior
     """
     try:
-        # Decode the player code
-        player_code = decode_player_tag(encoded_player_code)
-        logger.info(f"Processing player profile request for: {player_code}")
+        # The route's ptag converter has already decoded the player code
+        encoded_player_code = encode_player_tag(player_code)
+        logger.info("Processing player profile request for: %s", player_code)
         
-        # Get player games using new db layer
-        games = execute_query('games', 'select_by_player', (player_code,))
+        # Totals come from player_summary; only the games actually shown are loaded
+        summary = execute_query('player_summary', 'select_by_tag', (player_code,), fetch_one=True)
         
-        if not games:
-            logger.info(f"No games found for player: {player_code}")
+        if not summary or not summary['total_games']:
+            logger.info("No games found for player: %s", player_code)
             abort(404, description=f"Player '{player_code}' not found")
         
-        # Process games using utils
-        processed_games = process_raw_games_for_player(games, player_code)
-        
-        if not processed_games:
-            logger.info(f"No processed games for player: {player_code}")
-            abort(404, description=f"No game data available for player '{player_code}'")
+        recent_games = process_player_game_rows(
+            execute_query('player_games', 'select_by_player_limit', (player_code, PROFILE_RECENT_GAMES))
+        )
         
         # Calculate basic stats
-        total_games = len(processed_games)
-        wins = len([g for g in processed_games if g.get('result') == 'Win'])
+        total_games = summary['total_games']
+        wins = summary['wins']
         win_rate = wins / total_games if total_games > 0 else 0
         
         # Find most played character
-        character_usage = {}
-        for game in processed_games:
-            char = game.get('character_name', 'Unknown')
-            character_usage[char] = character_usage.get(char, 0) + 1
-        
-        most_played_character = max(character_usage.items(), key=lambda x: x[1])[0] if character_usage else 'Unknown'
+        most_played_character, _ = _most_played_character(player_code, summary)
         
         # FIXED: Return data directly (no redirect pattern)
         # The route will handle this data properly
@@ -373,88 +266,45 @@ def process_player_profile_request(encoded_player_code):
                 'win_rate': win_rate,
                 'most_played_character': most_played_character
             },
-            'recent_games': processed_games[:20]  # Show last 20 games
+            'recent_games': recent_games
         }
         
     except Exception as e:
-        logger.error(f"Error processing player profile request for {encoded_player_code}: {str(e)}")
+        logger.error(f"Error processing player profile request for {player_code}: {str(e)}")
         abort(500, description="Internal server error while loading player profile")
 
 
-def process_player_detailed_request(encoded_player_code):
+def process_player_detailed_request(player_code):
     """
     Process a detailed player page request with advanced stats.
     
     FIXED: Now uses abort() instead of redirect pattern
     """
     try:
-        # Decode the player code
-        player_code = decode_player_tag(encoded_player_code)
-        logger.info(f"Processing detailed player request for: {player_code}")
+        # The route's ptag converter has already decoded the player code
+        encoded_player_code = encode_player_tag(player_code)
+        logger.info("Processing detailed player request for: %s", player_code)
         
-        # Get player games
-        games = execute_query('games', 'select_by_player', (player_code,))
+        # Totals come from player_summary; only the games actually shown are loaded
+        summary = execute_query('player_summary', 'select_by_tag', (player_code,), fetch_one=True)
         
-        if not games:
-            logger.info(f"No games found for detailed view: {player_code}")
+        if not summary or not summary['total_games']:
+            logger.info("No games found for detailed view: %s", player_code)
             abort(404, description=f"Player '{player_code}' not found")
         
-        # Process games using utils
-        processed_games = process_raw_games_for_player(games, player_code)
-        
-        if not processed_games:
-            logger.info(f"No processed games for detailed view: {player_code}")
-            abort(404, description=f"No game data available for player '{player_code}'")
+        recent_games = process_player_game_rows(
+            execute_query('player_games', 'select_by_player_limit', (player_code, DETAILED_RECENT_GAMES))
+        )
         
         # Calculate detailed statistics
-        total_games = len(processed_games)
-        wins = len([g for g in processed_games if g.get('result') == 'Win'])
+        total_games = summary['total_games']
+        wins = summary['wins']
         win_rate = wins / total_games if total_games > 0 else 0
         
-        # Character breakdown
-        character_stats = {}
-        opponent_stats = {}
-        stage_stats = {}
-        
-        for game in processed_games:
-            # Character stats
-            char = game.get('character_name', 'Unknown')
-            if char not in character_stats:
-                character_stats[char] = {'games': 0, 'wins': 0}
-            character_stats[char]['games'] += 1
-            if game.get('result') == 'Win':
-                character_stats[char]['wins'] += 1
-            
-            # Opponent stats  
-            opp = game.get('opponent_tag', 'Unknown')
-            if opp not in opponent_stats:
-                opponent_stats[opp] = {'games': 0, 'wins': 0}
-            opponent_stats[opp]['games'] += 1
-            if game.get('result') == 'Win':
-                opponent_stats[opp]['wins'] += 1
-            
-            # Stage stats
-            stage = game.get('stage_id', 'Unknown')
-            if stage not in stage_stats:
-                stage_stats[stage] = {'games': 0, 'wins': 0}
-            stage_stats[stage]['games'] += 1
-            if game.get('result') == 'Win':
-                stage_stats[stage]['wins'] += 1
-        
-        # Calculate win rates for each breakdown
-        for stats in character_stats.values():
-            stats['win_rate'] = (stats['wins'] / stats['games']) * 100 if stats['games'] > 0 else 0
-        
-        for stats in opponent_stats.values():
-            stats['win_rate'] = (stats['wins'] / stats['games']) * 100 if stats['games'] > 0 else 0
-        
-        for stats in stage_stats.values():
-            stats['win_rate'] = (stats['wins'] / stats['games']) * 100 if stats['games'] > 0 else 0
-        
-        # Sort by games played
-        sorted_characters = sorted(character_stats.items(), key=lambda x: x[1]['games'], reverse=True)
-        sorted_opponents = sorted(opponent_stats.items(), key=lambda x: x[1]['games'], reverse=True)
-        sorted_stages = sorted(stage_stats.items(), key=lambda x: x[1]['games'], reverse=True)
+        # Breakdowns are grouped in SQLite over player_games, already sorted by games played
+        sorted_characters = _player_breakdown('character_stats', 'character_name', player_code, summary)
+        sorted_opponents = _player_breakdown('opponent_stats', 'opponent_tag', player_code, summary)
+        sorted_stages = _player_breakdown('stage_stats', 'stage_id', player_code, summary)
         
         # FIXED: Return data directly (no redirect pattern)
         return {
@@ -470,42 +320,97 @@ def process_player_detailed_request(encoded_player_code):
             'character_breakdown': sorted_characters,
             'opponent_breakdown': sorted_opponents[:10],  # Top 10 opponents
             'stage_breakdown': sorted_stages,
-            'recent_games': processed_games[:10]
+            'recent_games': recent_games
         }
         
     except Exception as e:
-        logger.error(f"Error processing detailed request for {encoded_player_code}: {str(e)}")
+        logger.error(f"Error processing detailed request for {player_code}: {str(e)}")
         abort(500, description="Internal server error while loading detailed player data")
 
 
+def _player_breakdown_rows(query_name, player_code, summary):
+    """
+    Rows of a player_games GROUP BY query, reused while the player's data is unchanged.
+    
+    Entries are keyed on the (total_games, last_game) of the player_summary row
+    the caller already read. Ingesting one of the player's games (in any worker)
+    changes it, so a stale entry is never served and needs no invalidation.
+    """
+    cache_key = (query_name, player_code)
+    summary_version = (summary['total_games'], summary['last_game'])
+    
+    with _player_breakdown_cache_lock:
+        entry = _player_breakdown_cache.get(cache_key)
+        if entry is not None and entry[0] == summary_version:
+            _player_breakdown_cache.move_to_end(cache_key)
+            return entry[1]
+    
+    rows = execute_query('player_games', query_name, (player_code,))
+    
+    with _player_breakdown_cache_lock:
+        _player_breakdown_cache[cache_key] = (summary_version, rows)
+        _player_breakdown_cache.move_to_end(cache_key)
+        if len(_player_breakdown_cache) > PLAYER_BREAKDOWN_CACHE_MAXSIZE:
+            _player_breakdown_cache.popitem(last=False)
+    return rows
+
+
+def _player_breakdown(query_name, key_field, player_code, summary):
+    """
+    Run a player_games GROUP BY query and shape it for the detailed page.
+    
+    Returns:
+        list: (key, {'games', 'wins', 'win_rate'}) tuples, most played first,
+              with win_rate as a percentage
+    """
+    rows = _player_breakdown_rows(query_name, player_code, summary)
+    return [
+        (row[key_field], {
+            'games': row['games'],
+            'wins': row['wins'],
+            'win_rate': (row['wins'] / row['games']) * 100 if row['games'] > 0 else 0
+        })
+        for row in rows
+    ]
+
+
+def _most_played_character(player_code, summary):
+    """
+    Most played character and its game count, from the player_games GROUP BY.
+    
+    Returns:
+        tuple: (character_name, games) or ('Unknown', 0) with no games
+    """
+    rows = _player_breakdown_rows('character_stats', player_code, summary)
+    if not rows:
+        return 'Unknown', 0
+    return rows[0]['character_name'], rows[0]['games']
+
+
 def prepare_standard_player_template_data(player_tag, encoded_player_code):
     """Prepare standard template data for player pages."""
     try:
-        # Get player games
-        games = execute_query('games', 'select_by_player', (player_tag,))
+        # Totals come from player_summary; only the games actually shown are loaded
+        summary = execute_query('player_summary', 'select_by_tag', (player_tag,), fetch_one=True)
         
-        if not games:
+        if not summary or not summary['total_games']:
             return {'error': 'Player not found'}
         
-        # Process games using utils
-        processed_games = process_raw_games_for_player(games, player_tag)
+        recent_games = process_player_game_rows(
+            execute_query('player_games', 'select_by_player_limit', (player_tag, DETAILED_RECENT_GAMES))
+        )
         
         # Calculate basic stats
-        total_games = len(processed_games)
-        wins = len([g for g in processed_games if g.get('result') == 'Win'])
+        total_games = summary['total_games']
+        wins = summary['wins']
         win_rate = (wins / total_games) * 100 if total_games > 0 else 0
         
         # Get most used character
-        character_usage = {}
-        for game in processed_games:
-            char = game.get('character_name', 'Unknown')
-            character_usage[char] = character_usage.get(char, 0) + 1
-        
-        most_used_character = max(character_usage.items(), key=lambda x: x[1])[0] if character_usage else 'Unknown'
+        most_used_character, most_used_character_games = _most_played_character(player_tag, summary)
         
         # Get recent opponents
         recent_opponents = []
-        for game in processed_games[:10]:
+        for game in recent_games:
             opp = game.get('opponent_tag')
             if opp and opp not in recent_opponents:
                 recent_opponents.append(opp)
@@ -518,9 +423,9 @@ def prepare_standard_player_template_data(player_tag, encoded_player_code):
             'losses': total_games - wins,
             'win_rate': round(win_rate, 1),
             'most_used_character': most_used_character,
-            'character_usage_count': character_usage.get(most_used_character, 0),
+            'character_usage_count': most_used_character_games,
             'recent_opponents': recent_opponents[:5],
-            'last_game_date': processed_games[0].get('start_time') if processed_games else None
+            'last_game_date': recent_games[0].get('start_time') if recent_games else None
         }
     except Exception as e:
         logger.error(f"Error preparing template data for {player_tag}: {str(e)}")
@@ -594,12 +499,17 @@ def _get_database_size_mb():
 
 # Helper functions that call the database layer
 def get_player_games(player_code, limit=None):
-    """Get games for a specific player (web service helper)."""
+    """
+    Get games for a specific player (web service helper).
+    
+    Reads the materialized player_games table: one flat row per game with the
+    player's character, opponent and result already extracted, newest first.
+    """
     try:
         if limit:
-            games = execute_query('games', 'select_by_player_limit', (player_code, limit))
+            games = execute_query('player_games', 'select_by_player_limit', (player_code, limit))
         else:
-            games = execute_query('games', 'select_by_player', (player_code,))
+            games = execute_query('player_games', 'select_by_player', (player_code,))
         
         return games
     except Exception as e:
@@ -634,42 +544,47 @@ def get_all_players():
         return []
 
 
-def find_player_matches(search_term):
-    """Find players matching a search term."""
+def find_player_matches(search_term, limit=50):
+    """
+    Find players matching a search term.
+    
+    A case-insensitive exact match is an index lookup and usually all a
+    search needs; only when it finds nothing do we fall back to a bounded
+    partial (LIKE) match.
+    """
     try:
-        return execute_query('stats', 'search_players', (f'%{search_term}%',))
+        exact = execute_query('player_summary', 'select_by_tag_nocase', (search_term,))
+        if exact:
+            return exact
+        return execute_query('stats', 'search_players', (f'%{search_term}%', limit))
     except Exception as e:
         logger.error(f"Error searching for players with term '{search_term}': {str(e)}")
         return []
 
 
 def calculate_player_stats(games, player_code):
-    """Calculate comprehensive player statistics from games list."""
+    """
+    Calculate comprehensive player statistics.
+    
+    Aggregates come from GROUP BY queries over player_games rather than
+    parsing and looping over the games list; games is only checked for
+    emptiness so callers keep the existing contract.
+    """
     if not games:
         return None
     
     try:
-        # Use utils for processing
-        processed_games = process_raw_games_for_player(games, player_code)
-        
-        total_games = len(processed_games)
-        wins = len([g for g in processed_games if g.get('result') == 'Win'])
+        character_rows = execute_query('player_games', 'character_stats', (player_code,))
+        opponent_rows = execute_query('player_games', 'opponent_stats', (player_code,))
+        stage_rows = execute_query('player_games', 'stage_stats', (player_code,))
+        
+        # Rows are ordered by games DESC, so the first row is the most used
+        character_usage = {row['character_name']: row['games'] for row in character_rows}
+        total_games = sum(character_usage.values())
+        wins = sum(row['wins'] for row in character_rows)
         win_rate = (wins / total_games) * 100 if total_games > 0 else 0
         
-        # Character usage
-        character_usage = {}
-        for game in processed_games:
-            char = game.get('character_name', 'Unknown')
-            character_usage[char] = character_usage.get(char, 0) + 1
-        
-        # Most common opponent
-        opponent_usage = {}
-        for game in processed_games:
-            opp = game.get('opponent_tag')
-            if opp:
-                opponent_usage[opp] = opponent_usage.get(opp, 0) + 1
-        
-        most_common_opponent = max(opponent_usage.items(), key=lambda x: x[1])[0] if opponent_usage else None
+        most_common = opponent_rows[0] if opponent_rows else None
         
         return {
             'total_games': total_games,
@@ -677,9 +592,10 @@ def calculate_player_stats(games, player_code):
             'losses': total_games - wins,
             'win_rate': round(win_rate, 1),
             'character_usage': character_usage,
-            'most_used_character': max(character_usage.items(), key=lambda x: x[1])[0] if character_usage else 'Unknown',
-            'most_common_opponent': most_common_opponent,
-            'games_vs_common_opponent': opponent_usage.get(most_common_opponent, 0) if most_common_opponent else 0
+            'stage_usage': {row['stage_id']: row['games'] for row in stage_rows},
+            'most_used_character': character_rows[0]['character_name'] if character_rows else 'Unknown',
+            'most_common_opponent': most_common['opponent_tag'] if most_common else None,
+            'games_vs_common_opponent': most_common['games'] if most_common else 0
         }
     except Exception as e:
         logger.error(f"Error calculating player stats: {str(e)}")
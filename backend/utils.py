@@ -6,14 +6,33 @@ Only includes functions that are actually being used in the codebase.
 import urllib.parse
 import json
 import logging
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 # Get logger
 logger = logging.getLogger('SlippiServer')
 
+# orjson parses the per-row player_data blobs several times faster than the
+# stdlib; its JSONDecodeError subclasses json.JSONDecodeError, so callers
+# catch the same exception either way
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def json_dumps(obj):
+    """Serialize obj to a compact JSON str, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
 # =============================================================================
 # URL Encoding Utilities
 # =============================================================================
 
+@lru_cache(maxsize=4096)
 def encode_player_tag(tag):
     """
     URL-encode a player tag for safe use in URLs.
@@ -23,11 +42,14 @@ def encode_player_tag(tag):
         
     Returns:
         str: URL-encoded player tag
+    
+    Memoized: the same handful of tags is encoded for every link on a page.
     """
     if not tag:
         return ""
     return urllib.parse.quote(tag)
 
+@lru_cache(maxsize=4096)
 def decode_player_tag(encoded_tag):
     """
     Decode a URL-encoded player tag back to original form.
@@ -78,8 +100,8 @@ def parse_player_data_from_game(player_json_data):
     try:
         if player_json_data is None:
             return []  # Return empty list instead of None
-        if isinstance(player_json_data, str):
-            return json.loads(player_json_data)
+        if isinstance(player_json_data, (str, bytes)):
+            return json_loads(player_json_data)
         return player_json_data
     except (json.JSONDecodeError, TypeError) as e:
         logger.warning(f"Could not parse player data: {e}")
@@ -95,18 +117,38 @@ def find_player_in_game_data(parsed_players, target_player_tag):
         
     Returns:
         tuple: (player_data, opponent_data) or (None, None) if not found
+    
+    Single pass: each tag is lowercased once, and the opponent is the first
+    player whose tag differs from the target (stops as soon as both are found).
+    1v1 games, nearly all of them, compare the two tags without the loop.
     """
     target_lower = target_player_tag.lower()
     
-    for player in parsed_players:
-        if player.get('player_tag', '').lower() == target_lower:
-            # Find opponent (the other player)
-            for opponent in parsed_players:
-                if opponent.get('player_tag', '').lower() != target_lower:
-                    return player, opponent
-            return player, None
+    if len(parsed_players) == 2:
+        first, second = parsed_players
+        first_is_target = first.get('player_tag', '').lower() == target_lower
+        second_is_target = second.get('player_tag', '').lower() == target_lower
+        if first_is_target:
+            return first, (None if second_is_target else second)
+        if second_is_target:
+            return second, first
+        return None, None
+    
+    player = opponent = None
     
-    return None, None
+    for candidate in parsed_players:
+        if candidate.get('player_tag', '').lower() == target_lower:
+            if player is None:
+                player = candidate
+        elif opponent is None:
+            opponent = candidate
+        
+        if player is not None and opponent is not None:
+            break
+    
+    if player is None:
+        return None, None
+    return player, opponent
 
 def safe_get_player_field(player_data, field_name, default_value='Unknown'):
     """
@@ -157,8 +199,8 @@ def process_raw_games_for_player(raw_games, target_player_tag):
     
     for game in raw_games:
         try:
-            # Convert sqlite3.Row to dict for easier access
-            game_dict = dict(game) if hasattr(game, 'keys') else game
+            # Convert sqlite3.Row to dict for easier access (execute_query rows already are)
+            game_dict = game if isinstance(game, dict) else dict(game)
             
             parsed_players = parse_player_data_from_game(game_dict['player_data'])
             if not parsed_players:
@@ -170,6 +212,7 @@ def process_raw_games_for_player(raw_games, target_player_tag):
                 
             # Use the result field instead of placement
             result = safe_get_player_field(player_data, 'result', 'Loss')
+            opponent_tag = safe_get_player_field(opponent_data, 'player_tag')
             
             # Build processed game record
             processed_game = {
@@ -182,12 +225,15 @@ def process_raw_games_for_player(raw_games, target_player_tag):
                     'character_name': safe_get_player_field(player_data, 'character_name'),
                     'placement': safe_get_player_field(player_data, 'placement', 999)
                 },
+                # encoded_tag is precomputed (memoized) so game tables don't urlencode per row
                 'opponent': {
-                    'player_tag': safe_get_player_field(opponent_data, 'player_tag'),
+                    'player_tag': opponent_tag,
+                    'encoded_tag': encode_player_tag(opponent_tag),
                     'character_name': safe_get_player_field(opponent_data, 'character_name'),
                     'placement': safe_get_player_field(opponent_data, 'placement', 999)
                 } if opponent_data else {
                     'player_tag': 'Unknown',
+                    'encoded_tag': 'Unknown',
                     'character_name': 'Unknown',
                     'placement': 999
                 }
@@ -204,6 +250,52 @@ def process_raw_games_for_player(raw_games, target_player_tag):
     processed_games.sort(key=lambda x: x['start_time'], reverse=True)
     return processed_games
 
+def process_player_game_rows(player_game_rows):
+    """
+    Build processed game records from materialized player_games rows.
+    
+    Same record shape as process_raw_games_for_player, but the player's and
+    opponent's fields are already columns, so no player_data JSON is parsed.
+    
+    Args:
+        player_game_rows (iterable): player_games rows, newest first
+        
+    Returns:
+        list: Processed game data for the player, in row order
+    """
+    processed_games = []
+    
+    for row in player_game_rows:
+        opponent_tag = row['opponent_tag']
+        processed_games.append({
+            'game_id': row['game_id'],
+            'start_time': row['start_time'],
+            'stage_id': row['stage_id'],
+            'result': _value_or_default(row['result'], 'Loss'),
+            'player': {
+                'player_tag': row['player_tag'],
+                'character_name': _value_or_default(row['character_name'], 'Unknown'),
+                'placement': _value_or_default(row['placement'], 999)
+            },
+            'opponent': {
+                'player_tag': opponent_tag,
+                'encoded_tag': encode_player_tag(opponent_tag),
+                'character_name': _value_or_default(row['opponent_char'], 'Unknown'),
+                'placement': _value_or_default(row['opponent_placement'], 999)
+            } if opponent_tag is not None else {
+                'player_tag': 'Unknown',
+                'encoded_tag': 'Unknown',
+                'character_name': 'Unknown',
+                'placement': 999
+            }
+        })
+    
+    return processed_games
+
+def _value_or_default(value, default_value):
+    """Column value, or default_value when it is NULL."""
+    return default_value if value is None else value
+
 def find_flexible_player_matches(raw_games, target_player_tag):
     """
     Find potential player matches with flexible matching (case-insensitive, partial).
@@ -260,74 +352,28 @@ def extract_player_stats_from_games(raw_games):
     Returns:
         tuple: (top_players, all_players) - both are lists of player stats
     """
+    # tag -> [games, wins, {character: games}], filled in one pass over the games
     player_stats = {}
     
-    # Keep the existing game processing logic exactly as it was
-    for game in raw_games[:5]:  # Debug first 5 games
-        try:
-            # Convert sqlite3.Row to dict for easier access
-            game_dict = dict(game) if hasattr(game, 'keys') else game
-            
-            parsed_players = parse_player_data_from_game(game_dict['player_data'])
-            logger.debug(f"Game {game_dict.get('game_id', 'unknown')}: Found {len(parsed_players)} players")
-            
-            for i, player in enumerate(parsed_players):
-                logger.debug(f"  Player {i}: {player}")
-                
-                tag = player.get('player_tag', '')
-                if not tag:
-                    continue
-                    
-                if tag not in player_stats:
-                    player_stats[tag] = {'games': 0, 'wins': 0, 'characters': {}}
-                
-                player_stats[tag]['games'] += 1
-                
-                # Track character usage - ADD THIS PART
-                character = player.get('character_name', 'Unknown')
-                if character not in player_stats[tag]['characters']:
-                    player_stats[tag]['characters'][character] = 0
-                player_stats[tag]['characters'][character] += 1
-                
-                # Check result field instead of placement
-                result = player.get('result', '')
-                logger.debug(f"  Player {tag} result: {result} (type: {type(result)})")
-                
-                if result == 'Win':
-                    player_stats[tag]['wins'] += 1
-                    logger.debug(f"  -> Counted as WIN for {tag}")
-                else:
-                    logger.debug(f"  -> Counted as LOSS for {tag}")
-                    
-        except Exception as e:
-            logger.warning(f"Error extracting stats from game {game.get('game_id', 'unknown')}: {e}")
-            continue
-    
-    # Process remaining games without debug spam
-    for game in raw_games[5:]:
+    for game in raw_games:
         try:
             # Convert sqlite3.Row to dict for easier access
             game_dict = dict(game) if hasattr(game, 'keys') else game
             
-            parsed_players = parse_player_data_from_game(game_dict['player_data'])
-            for player in parsed_players:
+            for player in parse_player_data_from_game(game_dict['player_data']):
                 tag = player.get('player_tag', '')
                 if not tag:
                     continue
-                    
-                if tag not in player_stats:
-                    player_stats[tag] = {'games': 0, 'wins': 0, 'characters': {}}
                 
-                player_stats[tag]['games'] += 1
+                counts = player_stats.get(tag)
+                if counts is None:
+                    counts = player_stats[tag] = [0, 0, {}]
+                counts[0] += 1
+                counts[1] += player.get('result') == 'Win'
                 
-                # Track character usage
+                characters = counts[2]
                 character = player.get('character_name', 'Unknown')
-                if character not in player_stats[tag]['characters']:
-                    player_stats[tag]['characters'][character] = 0
-                player_stats[tag]['characters'][character] += 1
-                
-                if player.get('result') == 'Win':
-                    player_stats[tag]['wins'] += 1
+                characters[character] = characters.get(character, 0) + 1
                     
         except Exception as e:
             logger.warning(f"Error extracting stats from game {game.get('game_id', 'unknown')}: {e}")
@@ -335,21 +381,21 @@ def extract_player_stats_from_games(raw_games):
     
     # Calculate win rates and build player list
     all_players = []
-    for tag, stats in player_stats.items():
-        win_rate = calculate_win_rate(stats['wins'], stats['games'])
+    for tag, (games, wins, characters) in player_stats.items():
+        win_rate = calculate_win_rate(wins, games)
         
         # NEW: Calculate most played character
         most_played_character = None
-        if stats['characters']:
-            most_played_character = max(stats['characters'].items(), key=lambda x: x[1])[0]
+        if characters:
+            most_played_character = max(characters, key=characters.get)
         
         all_players.append({
             # Frontend expects these field names
             'name': tag,  # Frontend expects 'name' field
             'code': tag,  # Frontend expects 'code' field  
             'code_encoded': encode_player_tag(tag),  # Frontend expects 'code_encoded'
-            'games': stats['games'],
-            'wins': stats['wins'],
+            'games': games,
+            'wins': wins,
             'win_rate': win_rate,
             'most_played_character': most_played_character,  # NEW FIELD
             
@@ -366,7 +412,7 @@ def extract_player_stats_from_games(raw_games):
     top_players = [p for p in all_players if p['games'] >= min_games]
     top_players.sort(key=lambda x: x['win_rate'], reverse=True)
     
-    logger.debug(f"Returning {len(top_players)} top players and {len(all_players)} total players")
+    logger.debug("Returning %s top players and %s total players", len(top_players), len(all_players))
     
     return top_players, all_players
 
@@ -395,26 +441,29 @@ def process_recent_games_data(raw_games, limit=10):
             # Get both players
             player1, player2 = parsed_players[0], parsed_players[1]
             
-            # Determine winner based on result field
+            # Determine winner based on result field; if there is no clear winner
+            # (shouldn't happen), use first player as "winner"
             p1_result = player1.get('result', '')
             p2_result = player2.get('result', '')
+            p1_wins = p1_result == 'Win' or p2_result != 'Win'
             
-            if p1_result == 'Win':
-                winner, loser = player1, player2
-            elif p2_result == 'Win':
-                winner, loser = player2, player1
-            else:
-                # If no clear winner (shouldn't happen), use first player as "winner"
-                winner, loser = player1, player2
-            
-            # Get player data
+            # Get player data (each field and encoding computed once, reused below)
             player1_tag = safe_get_player_field(player1, 'player_tag')
             player2_tag = safe_get_player_field(player2, 'player_tag')
             player1_char = safe_get_player_field(player1, 'character_name')
             player2_char = safe_get_player_field(player2, 'character_name')
+            player1_encoded = encode_player_tag(player1_tag)
+            player2_encoded = encode_player_tag(player2_tag)
+            
+            if p1_wins:
+                winner_fields = (player1_tag, player1_char, player1_encoded)
+                loser_fields = (player2_tag, player2_char, player2_encoded)
+            else:
+                winner_fields = (player2_tag, player2_char, player2_encoded)
+                loser_fields = (player1_tag, player1_char, player1_encoded)
             
             # Determine the result string for the winner
-            result_text = f"Win - {safe_get_player_field(winner, 'player_tag')} vs {safe_get_player_field(loser, 'player_tag')}"
+            result_text = f"Win - {winner_fields[0]} vs {loser_fields[0]}"
             
             # Build recent game record matching frontend template expectations
             recent_game = {
@@ -426,24 +475,24 @@ def process_recent_games_data(raw_games, limit=10):
                 
                 # Player 1 data
                 'player1': player1_tag,
-                'player1_tag_encoded': encode_player_tag(player1_tag),
+                'player1_tag_encoded': player1_encoded,
                 'character1': player1_char,
                 
                 # Player 2 data
                 'player2': player2_tag,
-                'player2_tag_encoded': encode_player_tag(player2_tag),
+                'player2_tag_encoded': player2_encoded,
                 'character2': player2_char,
                 
                 # Legacy format for backward compatibility
                 'winner': {
-                    'player_tag': safe_get_player_field(winner, 'player_tag'),
-                    'character_name': safe_get_player_field(winner, 'character_name'),
-                    'encoded_tag': encode_player_tag(safe_get_player_field(winner, 'player_tag'))
+                    'player_tag': winner_fields[0],
+                    'character_name': winner_fields[1],
+                    'encoded_tag': winner_fields[2]
                 },
                 'loser': {
-                    'player_tag': safe_get_player_field(loser, 'player_tag'),
-                    'character_name': safe_get_player_field(loser, 'character_name'),
-                    'encoded_tag': encode_player_tag(safe_get_player_field(loser, 'player_tag'))
+                    'player_tag': loser_fields[0],
+                    'character_name': loser_fields[1],
+                    'encoded_tag': loser_fields[2]
                 }
             }
             
@@ -4,6 +4,9 @@ Test your actual API endpoints - simplified version that works.
 """
 import pytest
 import json
+import uuid
+from datetime import datetime
+from urllib.parse import quote
 
 class TestServerEndpoints:
     """Test basic server endpoints that don't require complex setup"""
@@ -43,4 +46,228 @@ class TestUploadEndpoints:
         
         response = client.post('/api/games/upload', 
                              json=upload_data)
-        assert response.status_code == 401
\ No newline at end of file
+        assert response.status_code == 401
+
+
+def _seed_player(app, games=3):
+    """Upload games for a fresh player (unique per test) and return the URL-encoded tag."""
+    from backend.db import execute_query
+    from backend.services.upload.processors import process_games_upload
+    
+    player_tag = f"T{uuid.uuid4().hex[:8]}#1"
+    client_id = f"client_{uuid.uuid4().hex[:8]}"
+    now = datetime.now().isoformat()
+    with app.app_context():
+        execute_query('clients', 'insert_client', (client_id, 'test-host', 'Linux', '1.0', now, now))
+        result = process_games_upload(client_id, [_game_for(player_tag) for _ in range(games)])
+    assert result['uploaded'] == games
+    return player_tag, client_id
+
+
+def _game_for(player_tag, character='Fox'):
+    """One two-player game won by player_tag."""
+    return {
+        'game_id': f"game_{uuid.uuid4().hex}",
+        'start_time': datetime.now().isoformat(),
+        'stage_id': 31,
+        'player_data': [
+            {'player_tag': player_tag, 'character_name': character, 'placement': 0, 'result': 'Win'},
+            {'player_tag': 'OPPONENT#999', 'character_name': 'Falco', 'placement': 1, 'result': 'Loss'},
+        ]
+    }
+
+class TestCompressedConditionalRequests:
+    """ETags echoed back from compressed responses must still produce 304s"""
+    
+    @pytest.mark.parametrize('path', ['/api/player/{}/detailed', '/api/player/{}/bundle', '/'])
+    def test_compressed_etag_revalidates(self, app, client, path):
+        """Flask-Compress rewrites ETags to "<hash>:gzip"; sending that back should get a 304"""
+        pytest.importorskip('flask_compress')
+        player_tag, _ = _seed_player(app)
+        url = path.format(quote(player_tag))
+        headers = {'Accept-Encoding': 'gzip'}
+        
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        etag = response.headers['ETag']
+        assert etag.endswith(':gzip"')
+        
+        revalidated = client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert revalidated.status_code == 304
+        assert revalidated.data == b''
+
+class TestPlayerConditionalRequests:
+    """ETag / Cache-Control handling on the player read endpoints"""
+    
+    @pytest.mark.parametrize('path', ['/api/player/{}/stats', '/api/player/{}/detailed'])
+    def test_conditional_get_returns_304(self, app, client, path):
+        """A GET carrying the ETag it was given should get an empty 304"""
+        player_tag, _ = _seed_player(app)
+        url = path.format(quote(player_tag))
+        
+        response = client.get(url)
+        assert response.status_code == 200
+        etag = response.headers.get('ETag')
+        assert etag
+        assert response.cache_control.private
+        assert response.cache_control.max_age is not None
+        
+        revalidated = client.get(url, headers={'If-None-Match': etag})
+        assert revalidated.status_code == 304
+        assert revalidated.data == b''
+        assert revalidated.headers.get('ETag') == etag
+    
+    def test_post_detailed_never_returns_304(self, app, client):
+        """POST filters are not cacheable, even with a matching If-None-Match"""
+        player_tag, _ = _seed_player(app)
+        url = f"/api/player/{quote(player_tag)}/detailed"
+        etag = client.get(url).headers['ETag']
+        
+        response = client.post(url, json={'character': 'Fox'}, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert 'ETag' not in response.headers
+    
+    def test_player_without_games_gets_no_etag(self, client):
+        """Nothing to version for unknown players, so no ETag is sent"""
+        response = client.get(f"/api/player/{quote(f'NOGAMES{uuid.uuid4().hex[:6]}#1')}/stats")
+        assert response.status_code == 200
+        assert 'ETag' not in response.headers
+
+class TestPlayerBundleEndpoint:
+    """/api/player/<tag>/bundle combines stats, first games page and detailed analysis"""
+    
+    def test_bundle_shape(self, app, client):
+        """Known players get all three sections, consistent with the single endpoints"""
+        player_tag, _ = _seed_player(app, games=3)
+        response = client.get(f"/api/player/{quote(player_tag)}/bundle")
+        assert response.status_code == 200
+        
+        data = response.get_json()
+        assert set(data) == {'stats', 'games_page1', 'detailed'}
+        assert data['stats']['player_code'] == player_tag
+        assert data['stats']['total_games'] == 3
+        assert data['stats']['wins'] == 3
+        assert data['games_page1']['page'] == 1
+        assert data['games_page1']['total'] == 3
+        assert len(data['games_page1']['games']) == 3
+        assert data['detailed'] == client.get(f"/api/player/{quote(player_tag)}/detailed").get_json()
+    
+    def test_bundle_404_for_unknown_player(self, client):
+        """Unknown players get a JSON 404"""
+        response = client.get(f"/api/player/{quote(f'UNKNOWN{uuid.uuid4().hex[:6]}#1')}/bundle")
+        assert response.status_code == 404
+        assert 'not found' in response.get_json()['error'].lower()
+    
+    def test_bundle_304_on_matching_etag(self, app, client):
+        """Revalidating with the bundle's ETag returns an empty 304"""
+        player_tag, _ = _seed_player(app)
+        url = f"/api/player/{quote(player_tag)}/bundle"
+        etag = client.get(url).headers['ETag']
+        
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+    
+    def test_bundle_etag_changes_after_new_game(self, app, client):
+        """Ingesting another game for the player invalidates the ETag"""
+        from backend.services.upload.processors import process_games_upload
+        
+        player_tag, client_id = _seed_player(app)
+        url = f"/api/player/{quote(player_tag)}/bundle"
+        etag = client.get(url).headers['ETag']
+        
+        with app.app_context():
+            assert process_games_upload(client_id, [_game_for(player_tag)])['uploaded'] == 1
+        
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert response.get_json()['stats']['total_games'] == 4
+
+
+class TestSharedRateLimit:
+    """RATE_LIMIT_STORAGE = 'database' buckets in the rate_limits table"""
+    
+    def test_full_bucket_rejects_without_counting(self, app):
+        from backend.services.api_service import record_rate_limited_request
+        from backend.db import connection
+        
+        bucket = f"test:{uuid.uuid4().hex}"
+        with app.app_context():
+            assert [record_rate_limited_request(bucket, 1000, 2) for _ in range(4)] == [True, True, False, False]
+            
+            # Rejected requests leave the count at the limit, as in memory mode
+            with connection.get_connection() as conn:
+                count = conn.execute(
+                    "SELECT request_count FROM rate_limits WHERE bucket = ?", (bucket,)
+                ).fetchone()[0]
+            assert count == 2
+            
+            # A new minute starts a fresh window
+            assert record_rate_limited_request(bucket, 1001, 2)
+    
+    def test_limiter_uses_request_connection_when_pool_exhausted(self, app):
+        """The count needs no second pool slot and is committed for other workers"""
+        import sqlite3
+        import time
+        from backend.services.api_service import record_rate_limited_request
+        from backend.db import connection
+        from backend.db.pool import PoolExhaustedError
+        
+        bucket = f"test:{uuid.uuid4().hex}"
+        with app.app_context():
+            # The request already holds its context connection...
+            with connection.get_connection():
+                pass
+            
+            # ...and every other slot is taken
+            held = []
+            try:
+                while True:
+                    held.append(connection.pool.acquire(timeout=0))
+            except PoolExhaustedError:
+                pass
+            
+            try:
+                started = time.monotonic()
+                assert record_rate_limited_request(bucket, 1000, 5)
+                assert time.monotonic() - started < connection.pool.timeout
+            finally:
+                for conn in held:
+                    connection.pool.release(conn)
+        
+        with sqlite3.connect(connection.db_path) as other:
+            count = other.execute(
+                "SELECT request_count FROM rate_limits WHERE bucket = ?", (bucket,)
+            ).fetchone()[0]
+        assert count == 1
+
+
+class TestClientFilesListing:
+    """GET /api/files conditional headers"""
+    
+    def test_malformed_upload_date_still_lists_files(self, app, client):
+        """A legacy upload_date drops Last-Modified but keeps the ETag and the listing"""
+        from backend.db import execute_query
+        from backend.services.client.processors import process_api_key_generation
+        
+        client_id = f"client_{uuid.uuid4().hex[:8]}"
+        now = datetime.now().isoformat()
+        with app.app_context():
+            execute_query('clients', 'insert_client', (client_id, 'test-host', 'Linux', '1.0', now, now))
+            api_key = process_api_key_generation(client_id)['api_key']
+            execute_query('files', 'insert_file', (
+                f"file_{uuid.uuid4().hex}", uuid.uuid4().hex, client_id, 'legacy.slp',
+                '/tmp/legacy.slp', 1024, '03/01/2023 10:00', None
+            ))
+        
+        response = client.get('/api/files', headers={'X-API-Key': api_key})
+        assert response.status_code == 200
+        assert response.headers.get('ETag')
+        assert 'Last-Modified' not in response.headers
+        
+        response = client.get('/api/files', headers={
+            'X-API-Key': api_key, 'If-None-Match': response.headers['ETag']
+        })
+        assert response.status_code == 304
@@ -89,3 +89,22 @@ class TestEdgeCaseHandling:
             except Exception as e:
                 # If it fails, that's acceptable for these edge cases
                 print(f"Expected edge case failure for {input_val}: {e}")
+
+class TestConnectionPoolExhaustion:
+    """Pool acquire must give up instead of blocking forever"""
+    
+    def test_acquire_times_out_when_exhausted(self, tmp_path):
+        from backend.db.pool import ConnectionPool, PoolExhaustedError
+        
+        pool = ConnectionPool(str(tmp_path / 'pool.db'), size=1, timeout=0.05)
+        conn = pool.acquire()
+        try:
+            with pytest.raises(PoolExhaustedError):
+                pool.acquire()
+        finally:
+            pool.release(conn)
+        
+        # The released connection is handed out again
+        assert pool.acquire() is conn
+        pool.release(conn)
+        pool.close_all()
@@ -0,0 +1,215 @@
+# tests/test_schema_triggers.py
+"""
+Denormalized tables kept current by triggers (player_games, player_summary,
+player_filter_options): ingest, duplicate ingest and upgrade backfills.
+"""
+import json
+import sqlite3
+import uuid
+import pytest
+
+# Schema as it was before the denormalized tables existed (user_version 0)
+BASELINE_SCHEMA = """
+CREATE TABLE clients (
+    client_id TEXT PRIMARY KEY, hostname TEXT, platform TEXT, version TEXT,
+    registration_date TEXT, last_active TEXT
+);
+CREATE TABLE games (
+    game_id TEXT PRIMARY KEY, client_id TEXT, start_time TEXT, last_frame INTEGER,
+    stage_id INTEGER, player_data TEXT, upload_date TEXT, game_type TEXT,
+    FOREIGN KEY (client_id) REFERENCES clients (client_id)
+);
+CREATE TABLE {api_keys_table} (
+    client_id TEXT PRIMARY KEY, api_key TEXT UNIQUE, created_at TEXT, expires_at TEXT,
+    FOREIGN KEY (client_id) REFERENCES clients (client_id)
+);
+CREATE TABLE files (
+    file_id TEXT PRIMARY KEY, file_hash TEXT UNIQUE NOT NULL, client_id TEXT NOT NULL,
+    original_filename TEXT NOT NULL, file_path TEXT NOT NULL, file_size INTEGER NOT NULL,
+    upload_date TEXT NOT NULL, metadata TEXT,
+    FOREIGN KEY (client_id) REFERENCES clients (client_id)
+);
+"""
+
+INSERT_GAME = """
+INSERT OR IGNORE INTO games (game_id, client_id, start_time, last_frame, stage_id, player_data, upload_date, game_type)
+VALUES (?, NULL, ?, 100, ?, ?, '2024-01-01T00:00:00', 'offline')
+"""
+
+
+def _players(winner, loser, winner_char='Fox', loser_char='Falco'):
+    """player_data for a two-player game."""
+    return [
+        {'player_tag': winner, 'character_name': winner_char, 'placement': 0, 'result': 'Win'},
+        {'player_tag': loser, 'character_name': loser_char, 'placement': 1, 'result': 'Loss'},
+    ]
+
+
+def _game_row(game_id, players, start_time='2024-01-01T12:00:00', stage_id=31):
+    return (game_id, start_time, stage_id, json.dumps(players))
+
+
+def _unique_tags():
+    suffix = uuid.uuid4().hex[:8]
+    return f"W{suffix}#1", f"L{suffix}#2"
+
+
+def _execute(app, sql, rows=()):
+    """Run one statement per row on the app's database and commit."""
+    from backend.db import connection
+    
+    with app.app_context(), connection.get_connection() as conn:
+        for row in rows:
+            conn.execute(sql, row)
+        conn.commit()
+
+
+def _fetch(app, sql, params=()):
+    from backend.db import connection
+    
+    with app.app_context(), connection.get_connection() as conn:
+        return [dict(row) for row in conn.execute(sql, params)]
+
+
+@pytest.fixture
+def upgraded_baseline_db(tmp_path, monkeypatch):
+    """
+    A baseline-shaped database holding three games, upgraded by init_database.
+    
+    Yields a sqlite3 connection to it; games are g1 (W beats L), g2 (L beats W)
+    and g3 (W beats L on another stage), for tags 'BASE#1' and 'BASE#2'.
+    """
+    import app as app_module
+    from backend.db.connection import DatabaseConnection
+    
+    db_path = str(tmp_path / 'baseline.db')
+    conn = sqlite3.connect(db_path)
+    conn.executescript(BASELINE_SCHEMA.format(api_keys_table=app_module._API_KEYS_TABLE))
+    conn.executemany(INSERT_GAME, [
+        _game_row('g1', _players('BASE#1', 'BASE#2'), '2024-01-01T12:00:00'),
+        _game_row('g2', _players('BASE#2', 'BASE#1', 'Marth', 'Sheik'), '2024-01-02T12:00:00'),
+        _game_row('g3', _players('BASE#1', 'BASE#2'), '2024-01-03T12:00:00', stage_id=2),
+    ])
+    conn.commit()
+    conn.close()
+    
+    monkeypatch.setattr(app_module, 'connection', DatabaseConnection(db_path))
+    app_module.init_database()
+    
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == app_module.SCHEMA_VERSION
+    yield conn
+    conn.close()
+
+class TestPlayerGamesTrigger:
+    """trg_games_player_games expands every inserted game into player_games"""
+    
+    def test_insert_populates_player_games(self, app):
+        winner, loser = _unique_tags()
+        game_id = f"trg_{uuid.uuid4().hex}"
+        _execute(app, INSERT_GAME, [_game_row(game_id, _players(winner, loser))])
+        
+        rows = _fetch(app, "SELECT * FROM player_games WHERE game_id = ? ORDER BY placement", (game_id,))
+        assert [(r['player_tag'], r['character_name'], r['opponent_tag'], r['opponent_char'], r['result'])
+                for r in rows] == [
+            (winner, 'Fox', loser, 'Falco', 'Win'),
+            (loser, 'Falco', winner, 'Fox', 'Loss'),
+        ]
+    
+    def test_duplicate_insert_not_double_counted(self, app):
+        winner, loser = _unique_tags()
+        row = _game_row(f"trg_{uuid.uuid4().hex}", _players(winner, loser))
+        _execute(app, INSERT_GAME, [row, row])
+        
+        assert _fetch(app, "SELECT COUNT(*) AS n FROM player_games WHERE player_tag = ?", (winner,))[0]['n'] == 1
+    
+    def test_upgrade_backfills_player_games(self, upgraded_baseline_db):
+        rows = upgraded_baseline_db.execute(
+            "SELECT game_id, player_tag, opponent_tag, result FROM player_games ORDER BY game_id, player_tag"
+        ).fetchall()
+        assert [tuple(r) for r in rows] == [
+            ('g1', 'BASE#1', 'BASE#2', 'Win'), ('g1', 'BASE#2', 'BASE#1', 'Loss'),
+            ('g2', 'BASE#1', 'BASE#2', 'Loss'), ('g2', 'BASE#2', 'BASE#1', 'Win'),
+            ('g3', 'BASE#1', 'BASE#2', 'Win'), ('g3', 'BASE#2', 'BASE#1', 'Loss'),
+        ]
+
+
+class TestPlayerSummaryTrigger:
+    """trg_player_games_summary keeps per-player totals, wins and last_game"""
+    
+    def test_insert_updates_summary(self, app):
+        winner, loser = _unique_tags()
+        _execute(app, INSERT_GAME, [
+            _game_row(f"trg_{uuid.uuid4().hex}", _players(winner, loser), '2024-02-01T12:00:00'),
+            _game_row(f"trg_{uuid.uuid4().hex}", _players(loser, winner), '2024-02-03T12:00:00'),
+            _game_row(f"trg_{uuid.uuid4().hex}", _players(winner, loser), '2024-02-02T12:00:00'),
+        ])
+        
+        summary = {r['player_tag']: r for r in _fetch(
+            app, "SELECT * FROM player_summary WHERE player_tag IN (?, ?)", (winner, loser))}
+        assert (summary[winner]['total_games'], summary[winner]['wins']) == (3, 2)
+        assert (summary[loser]['total_games'], summary[loser]['wins']) == (3, 1)
+        assert summary[winner]['last_game'] == '2024-02-03T12:00:00'
+    
+    def test_duplicate_insert_not_double_counted(self, app):
+        winner, loser = _unique_tags()
+        row = _game_row(f"trg_{uuid.uuid4().hex}", _players(winner, loser))
+        _execute(app, INSERT_GAME, [row, row])
+        
+        summary = _fetch(app, "SELECT total_games, wins FROM player_summary WHERE player_tag = ?", (winner,))
+        assert summary == [{'total_games': 1, 'wins': 1}]
+    
+    def test_upgrade_backfills_summary(self, upgraded_baseline_db):
+        rows = upgraded_baseline_db.execute(
+            "SELECT player_tag, total_games, wins, last_game FROM player_summary ORDER BY player_tag"
+        ).fetchall()
+        assert [tuple(r) for r in rows] == [
+            ('BASE#1', 3, 2, '2024-01-03T12:00:00'),
+            ('BASE#2', 3, 1, '2024-01-03T12:00:00'),
+        ]
+
+
+class TestPlayerFilterOptionsTrigger:
+    """trg_player_games_filter_options records each distinct dropdown value once"""
+    
+    @staticmethod
+    def _options(rows):
+        return sorted((r['option'], r['value']) for r in rows)
+    
+    def test_insert_populates_filter_options(self, app):
+        winner, loser = _unique_tags()
+        _execute(app, INSERT_GAME, [
+            _game_row(f"trg_{uuid.uuid4().hex}", _players(winner, loser), stage_id=31),
+            _game_row(f"trg_{uuid.uuid4().hex}", _players(winner, loser, loser_char='Unknown'), stage_id=0),
+        ])
+        
+        rows = _fetch(app, "SELECT option, value FROM player_filter_options WHERE player_tag = ?", (winner,))
+        assert self._options(rows) == [
+            ('characters', 'Fox'),
+            ('opponent_characters', 'Falco'),
+            ('opponents', loser),
+            ('stages', '31'),
+        ]
+    
+    def test_duplicate_insert_not_double_counted(self, app):
+        winner, loser = _unique_tags()
+        row = _game_row(f"trg_{uuid.uuid4().hex}", _players(winner, loser))
+        _execute(app, INSERT_GAME, [row, row, _game_row(f"trg_{uuid.uuid4().hex}", _players(winner, loser))])
+        
+        rows = _fetch(app, "SELECT option, value FROM player_filter_options WHERE player_tag = ?", (winner,))
+        assert len(rows) == len(set(self._options(rows))) == 4
+    
+    def test_upgrade_backfills_filter_options(self, upgraded_baseline_db):
+        rows = upgraded_baseline_db.execute(
+            "SELECT option, value FROM player_filter_options WHERE player_tag = 'BASE#1'"
+        ).fetchall()
+        assert self._options(rows) == [
+            ('characters', 'Fox'),
+            ('characters', 'Sheik'),
+            ('opponent_characters', 'Falco'),
+            ('opponent_characters', 'Marth'),
+            ('opponents', 'BASE#2'),
+            ('stages', '2'),
+            ('stages', '31'),
+        ]
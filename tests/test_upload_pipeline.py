@@ -8,6 +8,8 @@ and client registration flows.
 import pytest
 import tempfile
 import os
+import uuid
+from datetime import datetime
 
 class TestUploadPipelineIntegration:
     """Test complete upload workflows"""
@@ -133,4 +135,139 @@ class TestUploadValidation:
         
         # Test with empty string
         result = validate_api_key("")
-        assert result is None
\ No newline at end of file
+        assert result is None
+
+
+def _upload_client(app):
+    """Register a throwaway client row (games and files reference clients) and return its id."""
+    from backend.db import execute_query
+    
+    client_id = f"client_{uuid.uuid4().hex[:8]}"
+    now = datetime.now().isoformat()
+    with app.app_context():
+        execute_query('clients', 'insert_client', (client_id, 'test-host', 'Linux', '1.0', now, now))
+    return client_id
+
+
+def _game(game_id, **overrides):
+    """Minimal two-player game payload."""
+    game = {
+        'game_id': game_id,
+        'start_time': '2024-01-01T12:00:00',
+        'stage_id': 31,
+        'player_data': [
+            {'player_tag': 'BATCH#1', 'character_name': 'Fox', 'placement': 0},
+            {'player_tag': 'BATCH#2', 'character_name': 'Falco', 'placement': 1},
+        ]
+    }
+    game.update(overrides)
+    return game
+
+class TestBatchedGameIngest:
+    """Duplicate probing and the batched insert behind process_games_upload"""
+    
+    def test_duplicate_game_id_within_batch(self, app):
+        """A game_id repeated in one upload is stored once and counted as a duplicate"""
+        from backend.services.upload.processors import process_games_upload
+        from backend.db import execute_query
+        
+        client_id = _upload_client(app)
+        game_id = f"dup_{uuid.uuid4().hex}"
+        with app.app_context():
+            result = process_games_upload(client_id, [_game(game_id), _game(game_id)])
+            stored = execute_query('games', 'select_by_id', (game_id,))
+        
+        assert result['uploaded'] == 1
+        assert result['duplicates'] == 1
+        assert result['errors'] == 0
+        assert len(stored) == 1
+    
+    def test_reupload_of_existing_games(self, app):
+        """Ids already in the database are reported as duplicates, new ones still stored"""
+        from backend.services.upload.processors import process_games_upload
+        
+        client_id = _upload_client(app)
+        existing = [f"old_{uuid.uuid4().hex}" for _ in range(3)]
+        fresh = f"new_{uuid.uuid4().hex}"
+        with app.app_context():
+            assert process_games_upload(client_id, [_game(g) for g in existing])['uploaded'] == 3
+            result = process_games_upload(client_id, [_game(g) for g in existing + [fresh]])
+        
+        assert result['uploaded'] == 1
+        assert result['duplicates'] == 3
+        assert [g['game_id'] for g in result['processed_games']] == [fresh]
+    
+    def test_bad_row_falls_back_to_row_by_row(self, app):
+        """One unstorable game is reported on its own; the rest of the batch is committed"""
+        from backend.services.upload.processors import process_games_upload
+        from backend.db import execute_query
+        
+        client_id = _upload_client(app)
+        good = [f"good_{uuid.uuid4().hex}" for _ in range(2)]
+        bad = f"bad_{uuid.uuid4().hex}"
+        # A dict can't be bound as a SQL parameter, so executemany fails on this row
+        games = [_game(good[0]), _game(bad, last_frame={'not': 'a number'}), _game(good[1])]
+        with app.app_context():
+            result = process_games_upload(client_id, games)
+            stored = {game_id: execute_query('games', 'select_by_id', (game_id,)) for game_id in good + [bad]}
+        
+        assert result['uploaded'] == 2
+        assert result['errors'] == 1
+        statuses = {g['game_id']: g['status'] for g in result['processed_games']}
+        assert statuses == {good[0]: 'uploaded', bad: 'error', good[1]: 'uploaded'}
+        assert all(stored[game_id] for game_id in good)
+        assert not stored[bad]
+
+class TestBatchedFileIngest:
+    """Duplicate-hash probing and the batched metadata insert behind _process_files_data"""
+    
+    def test_duplicate_hash_within_batch(self, app):
+        """A hash repeated in one upload points at the first file's id"""
+        from backend.services.upload.processors import _process_files_data
+        
+        client_id = _upload_client(app)
+        file_hash = uuid.uuid4().hex
+        files = [{'filename': 'a.slp', 'hash': file_hash, 'content': b'abc'},
+                 {'filename': 'b.slp', 'hash': file_hash, 'content': b'abc'}]
+        with app.app_context():
+            result = _process_files_data(client_id, files)
+        
+        first, second = result['file_results']
+        assert (result['uploaded_count'], result['duplicate_count'], result['error_count']) == (1, 1, 0)
+        assert first['status'] == 'uploaded'
+        assert second == {'file_id': first['file_id'], 'status': 'duplicate', 'message': 'File already exists'}
+    
+    def test_reupload_of_existing_files(self, app):
+        """Hashes already stored are duplicates of the stored file; new ones are uploaded"""
+        from backend.services.upload.processors import _process_files_data
+        
+        client_id = _upload_client(app)
+        old_hash, new_hash = uuid.uuid4().hex, uuid.uuid4().hex
+        with app.app_context():
+            stored = _process_files_data(client_id, [{'filename': 'old.slp', 'hash': old_hash}])
+            result = _process_files_data(client_id, [{'filename': 'old.slp', 'hash': old_hash},
+                                                     {'filename': 'new.slp', 'hash': new_hash}])
+        
+        assert result['file_results'][0]['status'] == 'duplicate'
+        assert result['file_results'][0]['file_id'] == stored['file_results'][0]['file_id']
+        assert result['file_results'][1]['status'] == 'uploaded'
+    
+    def test_bad_row_falls_back_to_row_by_row(self, app):
+        """One file that violates a constraint is reported alone; the others are stored"""
+        from backend.services.upload.processors import _process_files_data
+        from backend.db import execute_query
+        
+        client_id = _upload_client(app)
+        hashes = [uuid.uuid4().hex for _ in range(3)]
+        # original_filename is NOT NULL, so the middle row fails the batched insert
+        files = [{'filename': 'a.slp', 'hash': hashes[0]},
+                 {'filename': None, 'hash': hashes[1]},
+                 {'filename': 'c.slp', 'hash': hashes[2]}]
+        with app.app_context():
+            result = _process_files_data(client_id, files)
+            stored = [execute_query('files', 'select_by_hash', (h,), fetch_one=True) for h in hashes]
+        
+        assert [r['status'] for r in result['file_results']] == ['uploaded', 'error', 'uploaded']
+        assert (result['uploaded_count'], result['error_count']) == (2, 1)
+        assert stored[0] and stored[2]
+        assert stored[1] is None
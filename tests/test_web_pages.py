@@ -32,4 +32,10 @@ class TestWebPages:
     def test_nonexistent_page_returns_404(self, client):
         """Non-existent pages should return 404"""
         response = client.get('/this-page-does-not-exist')
-        assert response.status_code == 404
\ No newline at end of file
+        assert response.status_code == 404
+    
+    def test_detailed_page_rejects_non_numeric_limit(self, client):
+        """A bad limit is reported as such, not as an invalid player code"""
+        response = client.get('/player/ANY-1/detailed?limit=abc')
+        assert response.status_code == 400
+        assert b'Invalid Limit' in response.data